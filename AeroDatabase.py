@@ -0,0 +1,204 @@
+import numpy as np
+from functools import lru_cache
+from numbers import Number
+from scipy.interpolate import RectBivariateSpline
+from pyomo.environ import Expr_if
+
+# Aerodynamic coefficients as surfaces over Mach and one flow angle (alpha or beta)
+#
+# A surface is either a polynomial with coefficients[i][j] multiplying angle**i * Mach**j, or a
+# tensor cubic spline through a Mach x angle table (see fitTable). The same surface serves the
+# axial force of both planes and the normal force and moment of either plane. It is evaluated in
+# Horner form, as a Pyomo expression for the NLP or on numpy arrays for the simulators
+
+# fits of the original aerodynamic model, rows the power of the angle and columns the power of Mach
+FITS = {'CX': ((-0.04657,    0.1301,    -0.01938,   -0.002438),
+               (-0.0001731,  0.0002995, -8.086e-05)),
+        'CN': ((0.001807,   -0.008166,   0.008475,  -0.00199),
+               (0.0004407,  -0.00123,    0.0009847)),
+        'CM': ((0.004021,   -0.01086,    0.008531,  -0.001788),
+               (-0.001558,   0.00374,   -0.0006538))}
+
+# Horner form of the polynomial with coefficients lowest power first, zero leading terms dropped,
+# the coefficients may themselves be expressions or arrays
+def horner(coefficients, x):
+
+    coefficients = list(coefficients)
+    while len(coefficients) > 1 and isinstance(coefficients[-1], Number) and coefficients[-1] == 0:
+        coefficients.pop()
+
+    result = coefficients[-1]
+    for c in reversed(coefficients[:-1]):
+        result = c + x * result
+
+    return result
+
+# True when every argument is a number or numpy array rather than a Pyomo component or expression
+def numeric(*args):
+
+    return all(isinstance(arg, (Number, np.ndarray)) for arg in args)
+
+# Array of the cell coefficients of a spline surface, converted once per surface
+@lru_cache(maxsize=None)
+def cellArray(cells):
+
+    return np.array(cells, dtype=float)
+
+# Cell of every value of x among the cells between the sorted boundaries, values outside the
+# table fall in the first or last cell
+def cellIndex(boundaries, x):
+
+    return np.clip(np.searchsorted(boundaries, x, side='right') - 1, 0, len(boundaries) - 2)
+
+# Pyomo expression choosing piece(k) for the cell k of x between the boundaries, a balanced tree
+# of Expr_if so locating a value takes about log2(cells) comparisons. Branches whose pieces are
+# all the same number collapse to that number
+def cellExpression(boundaries, x, piece, first=0, last=None):
+
+    last = len(boundaries) - 2 if last is None else last
+    if first == last:
+        return piece(first)
+    middle = (first + last + 1) // 2
+
+    below, above = cellExpression(boundaries, x, piece, first, middle - 1), cellExpression(boundaries, x, piece, middle, last)
+    if isinstance(below, Number) and isinstance(above, Number) and below == above:
+        return below
+
+    return Expr_if(IF=x < boundaries[middle], THEN=below, ELSE=above)
+
+class AeroDatabase():
+
+    def __init__(self, fits=None):
+
+        # coefficients are kept as tuples so the model cache can describe the database exactly
+        self.surfaces = {}
+        for name, coefficients in (fits if fits is not None else FITS).items():
+            self.surfaces[name] = tuple(tuple(float(c) for c in row) for row in coefficients)
+
+        return
+
+    # Replace surface name by the tensor cubic spline interpolating a table over the grids mach
+    # and angle, table[i][j] the coefficient at mach[i] and angle[j]
+    #
+    # The spline is twice continuously differentiable and a single bicubic polynomial between
+    # neighbouring knots, so each cell is stored as its Taylor coefficients cells[i][j][p][q] of
+    # (Mach - centre)**p * (angle - centre)**q about the cell centre and evaluated in Horner form.
+    # A grid of fewer than four points gets the highest degree it supports along it. Outside the
+    # table the edge cells are extended. Returns the largest deviation from the table
+    def fitTable(self, name, mach, angle, table):
+
+        mach, angle, table = np.asarray(mach, dtype=float), np.asarray(angle, dtype=float), np.asarray(table, dtype=float)
+        kx, ky = min(3, len(mach) - 1), min(3, len(angle) - 1)
+        spline = RectBivariateSpline(mach, angle, table, kx=kx, ky=ky, s=0)
+
+        machKnots, angleKnots = (np.unique(knots) for knots in spline.get_knots())
+        machCentres, machHalves = 0.5 * (machKnots[1:] + machKnots[:-1]), 0.5 * np.diff(machKnots)
+        angleCentres, angleHalves = 0.5 * (angleKnots[1:] + angleKnots[:-1]), 0.5 * np.diff(angleKnots)
+
+        # the polynomial of a cell is recovered exactly from the spline on a grid of points inside
+        # the cell, u and v their offsets from the centre relative to the half widths
+        u, v = np.linspace(-0.75, 0.75, kx + 1), np.linspace(-0.75, 0.75, ky + 1)
+        M, A = np.broadcast_arrays(machCentres[:, None, None, None] + machHalves[:, None, None, None] * u[:, None],
+                                   angleCentres[None, :, None, None] + angleHalves[None, :, None, None] * v)
+        values = spline.ev(M.ravel(), A.ravel()).reshape(M.shape)
+        scaled = np.einsum('ap,ijpq,bq->ijab', np.linalg.inv(np.vander(u, increasing=True)), values,
+                           np.linalg.inv(np.vander(v, increasing=True)))
+
+        cells = np.zeros((len(machCentres), len(angleCentres), 4, 4))
+        cells[:, :, :kx + 1, :ky + 1] = scaled / (machHalves[:, None, None, None]**np.arange(kx + 1)[:, None]
+                                                  * angleHalves[None, :, None, None]**np.arange(ky + 1))
+
+        # terms adding no more than roundoff anywhere in their cell are dropped, so a table of lower
+        # degree along a grid leaves no terms of that degree in the Pyomo expression
+        contribution = np.abs(cells) * (machHalves[:, None, None, None]**np.arange(4)[:, None]
+                                        * angleHalves[None, :, None, None]**np.arange(4))
+        cells[contribution <= 1e-12 * np.max(np.abs(table))] = 0.0
+
+        self.surfaces[name] = {'mach': tuple(machKnots.tolist()), 'angle': tuple(angleKnots.tolist()),
+                               'cells': tuple(tuple(tuple(tuple(row) for row in cell) for cell in column) for column in cells.tolist())}
+
+        return float(np.max(np.abs(self.coefficient(name, mach[:, None], angle[None, :]) - table)))
+
+    # True for a surface interpolating a table, false for a polynomial one
+    def isTable(self, name):
+
+        return isinstance(self.surfaces[name], dict)
+
+    # Coefficient name of a table surface at Mach and angle, the bicubic of their cell in Horner form
+    def tableCoefficient(self, name, Mach, angle):
+
+        surface = self.surfaces[name]
+        machKnots, angleKnots = surface['mach'], surface['angle']
+
+        if numeric(Mach, angle):
+            Mach, angle = np.broadcast_arrays(np.asarray(Mach, dtype=float), np.asarray(angle, dtype=float))
+            i, j = cellIndex(machKnots, Mach), cellIndex(angleKnots, angle)
+            cells = cellArray(surface['cells'])[i, j]
+            dMach = Mach - 0.5 * (np.take(machKnots, i) + np.take(machKnots, i + 1))
+            dAngle = angle - 0.5 * (np.take(angleKnots, j) + np.take(angleKnots, j + 1))
+            return horner([horner(np.moveaxis(cells[..., :, q], -1, 0), dMach) for q in range(4)], dAngle)
+
+        # every coefficient and centre is chosen among numbers, so Mach and angle only enter the
+        # comparisons and a single bicubic
+        cells = surface['cells']
+        coefficients = [[cellExpression(machKnots, Mach, lambda i: cellExpression(angleKnots, angle, lambda j: cells[i][j][p][q]))
+                         for q in range(4)] for p in range(4)]
+        dMach = Mach - cellExpression(machKnots, Mach, lambda i: 0.5 * (machKnots[i] + machKnots[i + 1]))
+        dAngle = angle - cellExpression(angleKnots, angle, lambda j: 0.5 * (angleKnots[j] + angleKnots[j + 1]))
+
+        return horner([horner([row[q] for row in coefficients], dMach) for q in range(4)], dAngle)
+
+    # Polynomials in Mach of every power of the angle of a polynomial surface, each in Horner
+    # form, zero leading ones dropped
+    def machTerms(self, name, Mach):
+
+        terms = [horner(row, Mach) for row in self.surfaces[name]]
+        while len(terms) > 1 and not any(self.surfaces[name][len(terms) - 1]):
+            terms.pop()
+
+        return terms
+
+    # Coefficient name at Mach and angle, on numpy arrays for numbers and arrays and a Pyomo
+    # expression otherwise
+    def coefficient(self, name, Mach, angle):
+
+        if self.isTable(name):
+            return self.tableCoefficient(name, Mach, angle)
+
+        if numeric(Mach, angle):
+            Mach, angle = np.asarray(Mach, dtype=float), np.asarray(angle, dtype=float)
+
+        return horner(self.machTerms(name, Mach), angle)
+
+    # Axial force coefficient summed over the pitch and yaw planes, sharing the Mach polynomials
+    # of a polynomial surface
+    def axial(self, Mach, alpha, beta):
+
+        if self.isTable('CX'):
+            return self.tableCoefficient('CX', Mach, alpha) + self.tableCoefficient('CX', Mach, beta)
+
+        if numeric(Mach, alpha, beta):
+            Mach, alpha, beta = np.asarray(Mach, dtype=float), np.asarray(alpha, dtype=float), np.asarray(beta, dtype=float)
+
+        terms = self.machTerms('CX', Mach)
+
+        result = 2 * terms[0]
+        if len(terms) > 1:
+            result = result + (alpha + beta) * terms[1]
+        for power, term in enumerate(terms[2:], 2):
+            result = result + ((alpha**power) + (beta**power)) * term
+
+        return result
+
+    # Normal force coefficient of the plane of angle
+    def normal(self, Mach, angle):
+
+        return self.coefficient('CN', Mach, angle)
+
+    # Pitching or yawing moment coefficient of the plane of angle
+    def moment(self, Mach, angle):
+
+        return self.coefficient('CM', Mach, angle)
+
+# database of the original fits, used wherever no other is given
+default = AeroDatabase()
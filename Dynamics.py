@@ -0,0 +1,108 @@
+import numpy as np
+
+import AeroDatabase as adb
+import Propulsion as prop
+import Parameters as param
+import Equations as eom
+import Atmospheric as atm
+
+# Numerical form of the MAV 6-DoF dynamics for simulation, everything in SI units
+#
+# States and controls may be floats or numpy arrays of any shape, so the same functions
+# evaluate a single point, a whole trajectory or a batch of trajectories at once
+
+# integrated states and the controls of a phase
+STATES   = ('x', 'y', 'z', 'u', 'v', 'w', 'p', 'q', 'r', 'phi', 'the', 'psi', 'mass')
+CONTROLS = ('kap', 'eps', 'mpdot', 'alpha', 'beta')
+
+# multipliers of the dispersed vehicle and atmosphere parameters, all 1 for the nominal vehicle
+DISPERSIONS = ('Isp', 'S', 'rho', 'CX', 'CN', 'CM')
+
+# unit quaternion of the attitude angles
+def quaternion(phi, the, psi):
+
+    q0 = (np.cos(psi / 2) * np.cos(the / 2) * np.cos(phi / 2)) + (np.sin(psi / 2) * np.sin(the / 2) * np.sin(phi / 2))
+    q1 = (np.cos(psi / 2) * np.cos(the / 2) * np.sin(phi / 2)) - (np.sin(psi / 2) * np.sin(the / 2) * np.cos(phi / 2))
+    q2 = (np.cos(psi / 2) * np.sin(the / 2) * np.cos(phi / 2)) + (np.sin(psi / 2) * np.cos(the / 2) * np.sin(phi / 2))
+    q3 = (np.sin(psi / 2) * np.cos(the / 2) * np.cos(phi / 2)) - (np.cos(psi / 2) * np.sin(the / 2) * np.sin(phi / 2))
+
+    return q0, q1, q2, q3
+
+# All rates and algebraic terms of the dynamics, named like the MAV phase variables
+#
+# dispersion optionally maps names of DISPERSIONS to multipliers of Propulsion.Isp,
+# Parameters.S, Atmospheric.rho and the axial, normal and moment coefficients, floats or
+# arrays broadcasting against the states, aero the AeroDatabase (the original fits by default)
+def rates(state, control, thrust=True, dispersion=None, aero=None):
+
+    x, y, z, u, v, w, p, q, r, phi, the, psi, mass = state
+    kap, eps, mpdot, alpha, beta = control
+    k = dict.fromkeys(DISPERSIONS, 1.0)
+    k.update(dispersion or {})
+    S = param.S * k['S']
+    aero = aero if aero is not None else adb.default
+
+    q0, q1, q2, q3 = quaternion(phi, the, psi)
+    Q = eom.quaternion
+    Q11, Q12, Q13 = Q.Q11(q0, q1, q2, q3), Q.Q12(q0, q1, q2, q3), Q.Q13(q0, q1, q2, q3)
+    Q21, Q22, Q23 = Q.Q21(q0, q1, q2, q3), Q.Q22(q0, q1, q2, q3), Q.Q23(q0, q1, q2, q3)
+    Q31, Q32, Q33 = Q.Q31(q0, q1, q2, q3), Q.Q32(q0, q1, q2, q3), Q.Q33(q0, q1, q2, q3)
+
+    # shared per-node terms
+    Vsq  = (u**2) + (v**2) + (w**2)
+    Mach = np.sqrt(Vsq / (atm.gamma * atm.R_const * atm.temperature(z)))
+    rho  = atm.rho(z) * k['rho']
+    g    = atm.gravity(z)
+    T    = mpdot * prop.Isp * k['Isp'] * 9.81 if thrust else 0 * mpdot
+
+    # body to inertial velocity
+    xdot = (u * Q11) + (v * Q21) + (w * Q31)
+    ydot = (u * Q12) + (v * Q22) + (w * Q32)
+    zdot = -((u * Q13) + (v * Q23) + (w * Q33))
+
+    # body acceleration
+    AX = 0.5 * rho * (u**2) * S * k['CX'] * aero.axial(Mach, alpha, beta)
+    AY = 0.5 * rho * (v**2) * S * k['CN'] * aero.normal(Mach, beta)
+    AZ = 0.5 * rho * (w**2) * S * k['CN'] * aero.normal(Mach, alpha)
+    FX = (T * np.cos(kap) * np.cos(eps)) - AX
+    FY = -(T * np.cos(kap) * np.sin(eps)) - AY
+    FZ = -(T * np.sin(kap)) - AZ
+
+    udot = (FX / mass) - (w * q) + (v * r) + (Q13 * g)
+    vdot = (FY / mass) - (u * r) + (w * p) + (Q23 * g)
+    wdot = (FZ / mass) - (v * p) + (u * q) + (Q33 * g)
+
+    # body angular acceleration
+    AL = 0.5 * rho * (u**2) * S * param.l * 10e-7
+    AM = 0.5 * rho * (v**2) * S * param.l * k['CM'] * aero.moment(Mach, alpha)
+    AN = 0.5 * rho * (w**2) * S * param.l * k['CM'] * aero.moment(Mach, beta)
+    MZ = (-T * np.sin(kap)) * param.d
+    MY = (-T * np.cos(kap) * np.sin(eps)) * param.d
+
+    pdot = ((q * r) * ((param.Iy - param.Iz) / param.Ix)) + AL
+    qdot = ((p * r) * ((param.Iz - param.Ix) / param.Iy)) - ((MZ + AM) / param.Iy)
+    rdot = ((p * q) * ((param.Ix - param.Iy) / param.Iz)) + ((MY + AN) / param.Iz)
+
+    # attitude angle rates from the body angular rates
+    thedot = (q * np.cos(phi)) - (r * np.sin(phi))
+    psidot = ((q * np.sin(phi)) + (r * np.cos(phi))) / np.cos(the)
+    phidot = p + (np.sin(the) * psidot)
+
+    # mass change rate
+    massdot = -mpdot
+
+    return {'xdot': xdot, 'ydot': ydot, 'zdot': zdot,
+            'udot': udot, 'vdot': vdot, 'wdot': wdot,
+            'pdot': pdot, 'qdot': qdot, 'rdot': rdot,
+            'phidot': phidot, 'thedot': thedot, 'psidot': psidot,
+            'massdot': massdot,
+            'q0': q0, 'q1': q1, 'q2': q2, 'q3': q3,
+            'Mach': Mach, 'rho': rho, 'qbar': 0.5 * rho * Vsq, 'thrust': T, 'g': g}
+
+# Time derivative of the states in STATES order
+def derivatives(state, control, thrust=True, dispersion=None, aero=None):
+
+    rate = rates(state, control, thrust, dispersion, aero)
+
+    # rates depending only on the controls stay scalar, spread them over the batch
+    return np.array(np.broadcast_arrays(*[rate[name + 'dot'] for name in STATES]))
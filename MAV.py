@@ -8,8 +8,9 @@ from pyomo.dae import *
 import numpy as np
 import matplotlib.pyplot as plt
 
-from Utilities.Phase_Variables import getPhaseVariables
-import Aerodynamics as aero
+from Utilities.Phase_Variables import PhaseVariables, phaseScaling
+from Phases import defaultPhases, discretize, LINKED_STATES
+import AeroDatabase as adb
 import Propulsion as prop 
 import Parameters as param
 import Equations as eom
@@ -17,17 +18,80 @@ import Atmospheric as atm
 
 m = ConcreteModel("MAV")
 
+# variables of every phase with their physical bounds, strings name bound Params of the model
+phaseVars = (('x',       'x_min',       'x_max'),
+             ('y',       'y_min',       'y_max'),
+             ('z',       'z_min',       'z_max'),
+             ('xdot',    'xdot_min',    'xdot_max'),
+             ('ydot',    'ydot_min',    'ydot_max'),
+             ('zdot',    'zdot_min',    'zdot_max'),
+             ('phi',     'phi_min',     'phi_max'),
+             ('the',     'the_min',     'the_max'),
+             ('psi',     'psi_min',     'psi_max'),
+             ('phidot',  None,          None),
+             ('thedot',  None,          None),
+             ('psidot',  None,          None),
+             ('u',       'u_min',       'u_max'),
+             ('v',       'v_min',       'v_max'),
+             ('w',       'w_min',       'w_max'),
+             ('udot',    None,          None),
+             ('vdot',    None,          None),
+             ('wdot',    None,          None),
+             ('p',       None,          None),
+             ('q',       None,          None),
+             ('r',       None,          None),
+             ('pdot',    None,          None),
+             ('qdot',    None,          None),
+             ('rdot',    None,          None),
+             ('q0',      -1,            1),
+             ('q1',      -1,            1),
+             ('q2',      -1,            1),
+             ('q3',      -1,            1),
+             ('mass',    'mass_min',    'mass_max'),
+             ('massdot', 'massdot_max', 0),
+             ('kap',     'kap_min',     'kap_max'),
+             ('eps',     'eps_min',     'eps_max'),
+             ('mpdot',   0,             'mpdot_max'),
+             ('alpha',   'alpha_min',   'alpha_max'),
+             ('beta',    'beta_min',    'beta_max'))
+
+# derivatives wrt normalised phase time and the state they differentiate
+phaseDerivatives = (('dx_dtau',    'x'),
+                    ('dy_dtau',    'y'),
+                    ('dz_dtau',    'z'),
+                    ('dphi_dtau',  'phi'),
+                    ('dthe_dtau',  'the'),
+                    ('dpsi_dtau',  'psi'),
+                    ('du_dtau',    'u'),
+                    ('dv_dtau',    'v'),
+                    ('dw_dtau',    'w'),
+                    ('dp_dtau',    'p'),
+                    ('dq_dtau',    'q'),
+                    ('dr_dtau',    'r'),
+                    ('dmass_dtau', 'mass'))
+
 class MAV():
     
     def __init__(self,
                  x0=None, y0=None, z0=None, u0=None, v0=None, w0=None, phi0=None, the0=None, psi0=None, p0=None, q0=None, r0=None, mass0=None, \
-                  xf=None, yf=None, zf=None, uf=None, vf=None, wf=None, phif=None, thef=None, psif=None, pf=None, qf=None, rf=None):
+                  xf=None, yf=None, zf=None, uf=None, vf=None, wf=None, phif=None, thef=None, psif=None, pf=None, qf=None, rf=None, kinematics='transpose', phases=None, aero=None):
     
         super().__init__()
         
         # model
         self.m               = ConcreteModel('MAV')
 
+        # body to inertial velocity: 'transpose' of the unit quaternion DCM or the original 'cofactor' inverse
+        if kinematics not in ('transpose', 'cofactor'):
+            raise ValueError("kinematics must be 'transpose' or 'cofactor', got %r" % (kinematics,))
+        self.kinematics      = kinematics
+
+        # aerodynamic coefficient surfaces, the original fits unless a database is given
+        self.aero            = aero if aero is not None else adb.default
+
+        # lazily scaled variables of every phase node, shared by all rules at that node
+        self._phaseVariables = {}
+
         # bounds
         self.m.x_max         = Param(initialize = 2000e3)
         self.m.y_max         = Param(initialize = 2000e3)
@@ -190,259 +254,35 @@ class MAV():
 
         self.m.tf_scale    = Param(initialize = 1)
 
-        #=============Phase 1===========================================
+        # objective weightings (mutable so a Pareto sweep re-solves without rebuilding)
+        self.m.W_Obj1      = Param(initialize = 1, mutable=True)
+        self.m.W_Obj2      = Param(initialize = 1, mutable=True)
 
-        # time
-        self.m.t1  = ContinuousSet(bounds=(0,1))
-        self.m.tf1 = Var(initialize=12, bounds=(10 / self.m.tf_scale , 80 / self.m.tf_scale ))
-
-        # inertial displacement state variables
-        self.m.x_1 = Var(self.m.t1, bounds=(self.m.x_min / self.m.x_scale, self.m.x_max / self.m.x_scale))
-        self.m.y_1 = Var(self.m.t1, bounds=(self.m.y_min / self.m.y_scale, self.m.y_max / self.m.y_scale))
-        self.m.z_1 = Var(self.m.t1, bounds=(self.m.z_min / self.m.z_scale, self.m.z_max / self.m.z_scale))
-
-        self.m.dx_dtau_1 = DerivativeVar(self.m.x_1, wrt=self.m.t1)
-        self.m.dy_dtau_1 = DerivativeVar(self.m.y_1, wrt=self.m.t1) 
-        self.m.dz_dtau_1 = DerivativeVar(self.m.z_1, wrt=self.m.t1) 
-
-        # inertial velocity state variables
-        self.m.xdot_1 = Var(self.m.t1, bounds=(self.m.xdot_min / self.m.x_scale / self.m.xdot_scale, self.m.xdot_max / self.m.x_scale / self.m.xdot_scale))
-        self.m.ydot_1 = Var(self.m.t1, bounds=(self.m.ydot_min / self.m.y_scale / self.m.ydot_scale, self.m.ydot_max / self.m.y_scale / self.m.ydot_scale))
-        self.m.zdot_1 = Var(self.m.t1, bounds=(self.m.zdot_min / self.m.z_scale / self.m.zdot_scale, self.m.zdot_max / self.m.z_scale / self.m.zdot_scale))
-                          
-        # body angular rates 
-        self.m.phi_1 = Var(self.m.t1, bounds=(self.m.phi_min / self.m.phi_scale, self.m.phi_max / self.m.phi_scale))
-        self.m.the_1 = Var(self.m.t1, bounds=(self.m.the_min / self.m.the_scale, self.m.the_max / self.m.the_scale))
-        self.m.psi_1 = Var(self.m.t1, bounds=(self.m.psi_min / self.m.psi_scale, self.m.psi_max / self.m.psi_scale))
-        
-        self.m.dphi_dtau_1 = DerivativeVar(self.m.phi_1, wrt=self.m.t1)
-        self.m.dthe_dtau_1 = DerivativeVar(self.m.the_1, wrt=self.m.t1)
-        self.m.dpsi_dtau_1 = DerivativeVar(self.m.psi_1, wrt=self.m.t1)
-
-        # attitude angles
-        self.m.phidot_1 = Var(self.m.t1)
-        self.m.thedot_1 = Var(self.m.t1)
-        self.m.psidot_1 = Var(self.m.t1)
-        
-        # body velocity state variables
-        self.m.u_1 = Var(self.m.t1, bounds=(self.m.u_min / self.m.u_scale, self.m.u_max / self.m.u_scale))
-        self.m.v_1 = Var(self.m.t1, bounds=(self.m.v_min / self.m.v_scale, self.m.v_max / self.m.v_scale))
-        self.m.w_1 = Var(self.m.t1, bounds=(self.m.w_min / self.m.w_scale, self.m.w_max / self.m.w_scale))
-
-        self.m.du_dtau_1 = DerivativeVar(self.m.u_1, wrt=self.m.t1)
-        self.m.dv_dtau_1 = DerivativeVar(self.m.v_1, wrt=self.m.t1)
-        self.m.dw_dtau_1 = DerivativeVar(self.m.w_1, wrt=self.m.t1)
-
-        # body acceleration state variables
-        self.m.udot_1 = Var(self.m.t1)
-        self.m.vdot_1 = Var(self.m.t1)
-        self.m.wdot_1 = Var(self.m.t1)
-
-        # attitude rate wrt to body axis state variables
-        self.m.p_1 = Var(self.m.t1)
-        self.m.q_1 = Var(self.m.t1)
-        self.m.r_1 = Var(self.m.t1)
-
-        self.m.dp_dtau_1 = DerivativeVar(self.m.p_1, wrt=self.m.t1)
-        self.m.dq_dtau_1 = DerivativeVar(self.m.q_1, wrt=self.m.t1)
-        self.m.dr_dtau_1 = DerivativeVar(self.m.r_1, wrt=self.m.t1)
-
-        # attitude acceleration wrt to body axis state variables
-        self.m.pdot_1 = Var(self.m.t1)
-        self.m.qdot_1 = Var(self.m.t1)
-        self.m.rdot_1 = Var(self.m.t1)
-
-        # quaternion representation state variables
-        self.m.q0_1 = Var(self.m.t1, bounds=(-1,1))
-        self.m.q1_1 = Var(self.m.t1, bounds=(-1,1))
-        self.m.q2_1 = Var(self.m.t1, bounds=(-1,1))
-        self.m.q3_1 = Var(self.m.t1, bounds=(-1,1))
-
-        # mass properties state variables
-        self.m.mass_1    = Var(self.m.t1, bounds=(self.m.mass_min / self.m.mass_scale, self.m.mass_max / self.m.mass_scale))
-        self.m.massdot_1 = Var(self.m.t1, bounds=(self.m.massdot_max/ self.m.mass_scale / self.m.massdot_scale, 0 / self.m.mass_scale / self.m.massdot_scale))
-        self.m.dmass_dtau_1 = DerivativeVar(self.m.mass_1, wrt=self.m.t1)
-
-        # thrust representation control parameters
-        self.m.kap_1    = Var(self.m.t1, initialize = self.m.kap_max / self.m.kap_scale, bounds=(self.m.kap_min / self.m.kap_scale, self.m.kap_max / self.m.kap_scale))
-        self.m.eps_1    = Var(self.m.t1, initialize = self.m.kap_max / self.m.kap_scale, bounds=(self.m.eps_min / self.m.eps_scale, self.m.eps_max / self.m.eps_scale))
-        self.m.mpdot_1  = Var(self.m.t1, bounds=(0 / self.m.mpdot_scale, self.m.mpdot_max / self.m.mpdot_scale))
-
-        # aerodynamic angles
-        self.m.alpha_1 = Var(self.m.t1, bounds=(self.m.alpha_min / self.m.alpha_scale, self.m.alpha_max / self.m.alpha_scale))
-        self.m.beta_1 = Var(self.m.t1, bounds=(self.m.beta_min / self.m.beta_scale, self.m.beta_max / self.m.beta_scale))
-
-        #=============Phase 2===========================================
-        
-        # time
-        self.m.t2  = ContinuousSet(bounds=(0,1))
-        self.m.tf2 = Var(initialize=500, bounds=(200 / self.m.tf_scale , 1000 / self.m.tf_scale ))
-
-        # inertial displacement state variables
-        self.m.x_2 = Var(self.m.t2, bounds=(self.m.x_min / self.m.x_scale, self.m.x_max / self.m.x_scale))
-        self.m.y_2 = Var(self.m.t2, bounds=(self.m.y_min / self.m.y_scale, self.m.y_max / self.m.y_scale))
-        self.m.z_2 = Var(self.m.t2, bounds=(self.m.z_min / self.m.z_scale, self.m.z_max / self.m.z_scale))
-
-        self.m.dx_dtau_2 = DerivativeVar(self.m.x_2, wrt=self.m.t2)
-        self.m.dy_dtau_2 = DerivativeVar(self.m.y_2, wrt=self.m.t2)
-        self.m.dz_dtau_2 = DerivativeVar(self.m.z_2, wrt=self.m.t2) 
-
-        # inertial velocity state variables
-        self.m.xdot_2 = Var(self.m.t2, bounds=(self.m.xdot_min / self.m.x_scale / self.m.xdot_scale, self.m.xdot_max / self.m.x_scale / self.m.xdot_scale))
-        self.m.ydot_2 = Var(self.m.t2, bounds=(self.m.ydot_min / self.m.y_scale / self.m.ydot_scale, self.m.ydot_max / self.m.y_scale / self.m.ydot_scale))
-        self.m.zdot_2 = Var(self.m.t2, bounds=(self.m.zdot_min / self.m.z_scale / self.m.zdot_scale, self.m.zdot_max / self.m.z_scale / self.m.zdot_scale))
-
-        # attitude wrt to inertial axis state variables 
-        self.m.phi_2 = Var(self.m.t2, bounds=(self.m.phi_min / self.m.phi_scale, self.m.phi_max / self.m.phi_scale))
-        self.m.the_2 = Var(self.m.t2, bounds=(self.m.the_min / self.m.the_scale, self.m.the_max / self.m.the_scale))
-        self.m.psi_2 = Var(self.m.t2, bounds=(self.m.psi_min / self.m.psi_scale, self.m.psi_max / self.m.psi_scale))
-        
-        self.m.dphi_dtau_2 = DerivativeVar(self.m.phi_2, wrt=self.m.t2)
-        self.m.dthe_dtau_2 = DerivativeVar(self.m.the_2, wrt=self.m.t2)
-        self.m.dpsi_dtau_2 = DerivativeVar(self.m.psi_2, wrt=self.m.t2)
-
-        # attitude angles
-        self.m.phidot_2 = Var(self.m.t2)
-        self.m.thedot_2 = Var(self.m.t2)
-        self.m.psidot_2 = Var(self.m.t2)
-        
-        # body velocity state variables
-        self.m.u_2 = Var(self.m.t2, bounds=(self.m.u_min / self.m.u_scale, self.m.u_max / self.m.u_scale))
-        self.m.v_2 = Var(self.m.t2, bounds=( self.m.v_min /  self.m.v_scale,  self.m.v_max  / self.m.v_scale))
-        self.m.w_2 = Var(self.m.t2, bounds=( self.m.w_min / self.m.w_scale,  self.m.w_max  / self.m.w_scale))
-
-        self.m.du_dtau_2 = DerivativeVar(self.m.u_2, wrt=self.m.t2)
-        self.m.dv_dtau_2 = DerivativeVar(self.m.v_2, wrt=self.m.t2)
-        self.m.dw_dtau_2 = DerivativeVar(self.m.w_2, wrt=self.m.t2)
-
-        # body acceleration state variables
-        self.m.udot_2 = Var(self.m.t2)
-        self.m.vdot_2 = Var(self.m.t2)
-        self.m.wdot_2 = Var(self.m.t2)
-
-        # attitude rate wrt to body axis state variables
-        self.m.p_2 = Var(self.m.t2)
-        self.m.q_2 = Var(self.m.t2)
-        self.m.r_2 = Var(self.m.t2)
-
-        self.m.dp_dtau_2 = DerivativeVar(self.m.p_2, wrt=self.m.t2)
-        self.m.dq_dtau_2 = DerivativeVar(self.m.q_2, wrt=self.m.t2)
-        self.m.dr_dtau_2 = DerivativeVar(self.m.r_2, wrt=self.m.t2)
-
-        # attitude acceleration wrt to body axis state variables
-        self.m.pdot_2 = Var(self.m.t2)
-        self.m.qdot_2 = Var(self.m.t2)
-        self.m.rdot_2 = Var(self.m.t2)
-
-        # quaternion representation 
-        self.m.q0_2 = Var(self.m.t2, bounds=(-1,1))
-        self.m.q1_2 = Var(self.m.t2, bounds=(-1,1))
-        self.m.q2_2 = Var(self.m.t2, bounds=(-1,1))
-        self.m.q3_2 = Var(self.m.t2, bounds=(-1,1))
-
-        # mass properties
-        self.m.mass_2    = Var(self.m.t2, bounds=(self.m.mass_min / self.m.mass_scale, self.m.mass_max / self.m.mass_scale))
-        self.m.massdot_2 = Var(self.m.t2, bounds=(self.m.massdot_max / self.m.mass_scale / self.m.massdot_scale, 0 / self.m.mass_scale / self.m.massdot_scale))
-        self.m.dmass_dtau_2 = DerivativeVar(self.m.mass_2, wrt=self.m.t2)
-
-        # thrust representation control parameters
-        self.m.kap_2    = Var(self.m.t2, initialize=0, bounds=(self.m.kap_min / self.m.kap_scale, self.m.kap_max / self.m.kap_scale))
-        self.m.eps_2    = Var(self.m.t2, initialize=0, bounds=(self.m.eps_min / self.m.eps_scale, self.m.eps_max / self.m.eps_scale))
-        self.m.mpdot_2  = Var(self.m.t2, initialize=0, bounds=(0 / self.m.mpdot_scale, self.m.mpdot_max / self.m.mpdot_scale))
-
-        # aerodynamic angles
-        self.m.alpha_2 = Var(self.m.t2, bounds=(self.m.alpha_min / self.m.alpha_scale, self.m.alpha_max / self.m.alpha_scale))
-        self.m.beta_2 = Var(self.m.t2, bounds=(self.m.beta_min / self.m.beta_scale, self.m.beta_max / self.m.beta_scale))
-
-        #=============Phase 3===========================================
-    
-        # time
-        self.m.t3  = ContinuousSet(bounds=(0,1))
-        self.m.tf3 = Var(bounds=(1 / self.m.tf_scale , 5 / self.m.tf_scale))
-
-        # inertial displacement state variables
-        self.m.x_3 = Var(self.m.t3, bounds=(self.m.x_min / self.m.x_scale, self.m.x_max / self.m.x_scale))
-        self.m.y_3 = Var(self.m.t3, bounds=(self.m.y_min / self.m.y_scale, self.m.y_max / self.m.y_scale))
-        self.m.z_3 = Var(self.m.t3, bounds=(self.m.z_min / self.m.z_scale, self.m.z_max / self.m.z_scale))
-
-        self.m.dx_dtau_3 = DerivativeVar(self.m.x_3, wrt=self.m.t3)
-        self.m.dy_dtau_3 = DerivativeVar(self.m.y_3, wrt=self.m.t3) 
-        self.m.dz_dtau_3 = DerivativeVar(self.m.z_3, wrt=self.m.t3) 
-
-        # inertial velocity state variables
-        self.m.xdot_3 = Var(self.m.t3, bounds=(self.m.xdot_min / self.m.x_scale / self.m.xdot_scale, self.m.xdot_max / self.m.x_scale / self.m.xdot_scale))
-        self.m.ydot_3 = Var(self.m.t3, bounds=(self.m.ydot_min / self.m.y_scale / self.m.ydot_scale, self.m.ydot_max / self.m.y_scale / self.m.ydot_scale))
-        self.m.zdot_3 = Var(self.m.t3, bounds=(self.m.zdot_min / self.m.z_scale / self.m.zdot_scale, self.m.zdot_max / self.m.z_scale / self.m.zdot_scale))
-                          
-        # attitude wrt to inertial axis state variables 
-        self.m.phi_3 = Var(self.m.t3, bounds=(self.m.phi_min / self.m.phi_scale, self.m.phi_max / self.m.phi_scale))
-        self.m.the_3 = Var(self.m.t3, bounds=(self.m.the_min / self.m.the_scale, self.m.the_max / self.m.the_scale))
-        self.m.psi_3 = Var(self.m.t3, bounds=(self.m.psi_min / self.m.psi_scale, self.m.psi_max / self.m.psi_scale))
-        
-        self.m.dphi_dtau_3 = DerivativeVar(self.m.phi_3, wrt=self.m.t3)
-        self.m.dthe_dtau_3 = DerivativeVar(self.m.the_3, wrt=self.m.t3)
-        self.m.dpsi_dtau_3 = DerivativeVar(self.m.psi_3, wrt=self.m.t3)
-
-        # attitude angles
-        self.m.phidot_3 = Var(self.m.t3)
-        self.m.thedot_3 = Var(self.m.t3)
-        self.m.psidot_3 = Var(self.m.t3)
-        
-        # body velocity state variables
-        self.m.u_3 = Var(self.m.t3, bounds=(self.m.u_min / self.m.u_scale, self.m.u_max / self.m.u_scale))
-        self.m.v_3 = Var(self.m.t3, bounds=(self.m.v_min / self.m.v_scale, self.m.v_max / self.m.v_scale))
-        self.m.w_3 = Var(self.m.t3, bounds=(self.m.w_min / self.m.w_scale, self.m.w_max / self.m.w_scale))
-
-        self.m.du_dtau_3 = DerivativeVar(self.m.u_3, wrt=self.m.t3)
-        self.m.dv_dtau_3 = DerivativeVar(self.m.v_3, wrt=self.m.t3)
-        self.m.dw_dtau_3 = DerivativeVar(self.m.w_3, wrt=self.m.t3)
-
-        # body acceleration state variables
-        self.m.udot_3 = Var(self.m.t3, bounds=(self.m.udot_min / self.m.u_scale / self.m.udot_scale, self.m.udot_max / self.m.u_scale / self.m.udot_scale))
-        self.m.vdot_3 = Var(self.m.t3, bounds=(self.m.vdot_min / self.m.v_scale / self.m.udot_scale, self.m.vdot_max / self.m.v_scale / self.m.vdot_scale))
-        self.m.wdot_3 = Var(self.m.t3, bounds=(self.m.wdot_min / self.m.w_scale / self.m.udot_scale, self.m.wdot_max / self.m.w_scale / self.m.wdot_scale))
-
-        # attitude rate wrt to body axis state variables
-        self.m.p_3 = Var(self.m.t3)
-        self.m.q_3 = Var(self.m.t3)
-        self.m.r_3 = Var(self.m.t3)
-
-        self.m.dp_dtau_3 = DerivativeVar(self.m.p_3, wrt=self.m.t3)
-        self.m.dq_dtau_3 = DerivativeVar(self.m.q_3, wrt=self.m.t3)
-        self.m.dr_dtau_3 = DerivativeVar(self.m.r_3, wrt=self.m.t3)
-
-        # attitude acceleration wrt to body axis state variables
-        self.m.pdot_3 = Var(self.m.t3)
-        self.m.qdot_3 = Var(self.m.t3)
-        self.m.rdot_3 = Var(self.m.t3)
-
-        # quaternion representation state variables
-        self.m.q0_3 = Var(self.m.t3, bounds=(-1,1))
-        self.m.q1_3 = Var(self.m.t3, bounds=(-1,1))
-        self.m.q2_3 = Var(self.m.t3, bounds=(-1,1))
-        self.m.q3_3 = Var(self.m.t3, bounds=(-1,1))
-
-        # mass properties state variables
-        self.m.mass_3    = Var(self.m.t3, bounds=(self.m.mass_min / self.m.mass_scale, self.m.mass_max / self.m.mass_scale))
-        self.m.massdot_3 = Var(self.m.t3, bounds=(self.m.massdot_max / self.m.mass_scale / self.m.massdot_scale, 0 / self.m.mass_scale / self.m.massdot_scale))
-        self.m.dmass_dtau_3 = DerivativeVar(self.m.mass_3, wrt=self.m.t3)
-
-        # thrust representation control parameters
-        self.m.kap_3    = Var(self.m.t3, bounds=(self.m.kap_min / self.m.kap_scale, self.m.kap_max / self.m.kap_scale))
-        self.m.eps_3    = Var(self.m.t3, bounds=(self.m.eps_min / self.m.eps_scale, self.m.eps_max / self.m.eps_scale))
-        self.m.mpdot_3  = Var(self.m.t3, bounds=(0 / self.m.mpdot_scale, self.m.mpdot_max / self.m.mpdot_scale))
-
-        # aerodynamic angles
-        self.m.alpha_3 = Var(self.m.t3, bounds=(self.m.alpha_min / self.m.alpha_scale, self.m.alpha_max / self.m.alpha_scale))
-        self.m.beta_3 = Var(self.m.t3, bounds=(self.m.beta_min / self.m.beta_scale, self.m.beta_max / self.m.beta_scale))
-
-        # discretize problem euler backward finite difference
-        discretizer = TransformationFactory('dae.finite_difference')
-        discretizer.apply_to(self.m, nfe=75, wrt=self.m.t1, scheme='BACKWARD')
-        discretizer = TransformationFactory('dae.finite_difference')
-        discretizer.apply_to(self.m, nfe=75, wrt=self.m.t2, scheme='BACKWARD')
-        discretizer = TransformationFactory('dae.finite_difference')
-        discretizer.apply_to(self.m, nfe=75, wrt=self.m.t3, scheme='BACKWARD')
+        # uncertain vehicle and atmosphere parameters (mutable so a dispersion campaign re-solves without rebuilding)
+        self.m.mass0       = Param(initialize = param.mass, mutable=True)
+        self.m.Isp         = Param(initialize = prop.Isp, mutable=True)
+        self.m.eff_cstr    = Param(initialize = prop.eff_cstr, mutable=True)
+        self.m.S_factor    = Param(initialize = 1, mutable=True)
+        self.m.rho_factor  = Param(initialize = 1, mutable=True)
+        self.m.CX_factor   = Param(initialize = 1, mutable=True)
+        self.m.CN_factor   = Param(initialize = 1, mutable=True)
+        self.m.CM_factor   = Param(initialize = 1, mutable=True)
+
+        # phases
+        self.phases = phases if phases is not None else defaultPhases()
+
+        # one block per phase, each with its own normalised time set, variables and discretization
+        self.m.phase = Block(range(1, len(self.phases) + 1), rule=self.phaseBlock)
+
+        for n, phase in enumerate(self.phases, 1):
+            discretize(self.m, self.m.phase[n].t, phase.scheme, phase.nfe, phase.ncp)
+
+        # shared per-node terms, dynamics and boundary conditions of every phase
+        for n, phase in enumerate(self.phases, 1):
+            self.phaseDynamics(self.m.phase[n], phase)
+
+        # continuity of the states between consecutive phases
+        self.m.linkage = Constraint(range(1, len(self.phases)), LINKED_STATES, rule=self.Q_linkage)
 
         # initial and final conditions
         self.x0 = x0
@@ -480,751 +320,455 @@ class MAV():
         self.rf = rf
         
         return
+
+    # Physical value of a phase description entry, strings name a Param of the model
+    def physical(self, entry):
+
+        if isinstance(entry, str):
+            return value(self.m.component(entry))
+
+        return entry
+
+    # Multipliers of Dynamics.DISPERSIONS standing for the current uncertain parameters, the
+    # characteristic velocity efficiency scales the specific impulse about its nominal value
+    def dispersion(self):
+
+        return {'Isp': value(self.m.Isp) / prop.Isp * value(self.m.eff_cstr) / prop.eff_cstr,
+                'S': value(self.m.S_factor),
+                'rho': value(self.m.rho_factor),
+                'CX': value(self.m.CX_factor),
+                'CN': value(self.m.CN_factor),
+                'CM': value(self.m.CM_factor)}
+
+    # Scaled value of a phase variable
+    def scaled(self, name, entry):
+
+        scaled = self.physical(entry)
+        if scaled is None:
+            return None
+
+        for scale in phaseScaling[name]:
+            scaled = scaled / value(self.m.component(scale))
+
+        return scaled
+
+    # Variables of a phase block
+    def phaseBlock(self, b, n):
+
+        phase = self.phases[n - 1]
+
+        # time
+        b.t  = ContinuousSet(bounds=(0,1), initialize=phase.mesh)
+        b.tf = Var(initialize=self.scaled('tf', phase.tf_init), bounds=(self.scaled('tf', phase.tf_bounds[0]), self.scaled('tf', phase.tf_bounds[1])))
+
+        # states, rates and controls
+        for name, lower, upper in phaseVars:
+            lower, upper = phase.bounds.get(name, (lower, upper))
+            b.add_component(name, Var(b.t, initialize=self.scaled(name, phase.initialize.get(name)), bounds=(self.scaled(name, lower), self.scaled(name, upper))))
+
+        # derivatives wrt normalised phase time
+        for name, state in phaseDerivatives:
+            b.add_component(name, DerivativeVar(b.component(state), wrt=b.t))
+
+        return
+
+    # Shared per-node terms, dynamics and boundary conditions of a discretized phase block
+    def phaseDynamics(self, b, phase):
+
+        b.Vsq    = Expression(b.t, rule=self.E_Vsq)
+        b.Mach   = Expression(b.t, rule=self.E_Mach)
+        b.rho    = Expression(b.t, rule=self.E_rho)
+        b.qbar   = Expression(b.t, rule=self.E_qbar)
+        if phase.thrust:
+            b.thrust = Expression(b.t, rule=self.E_thrust)
+        b.g      = Expression(b.t, rule=self.E_g)
+        b.CX     = Expression(b.t, rule=self.E_CX)
+        b.CY     = Expression(b.t, rule=self.E_CY)
+        b.CZ     = Expression(b.t, rule=self.E_CZ)
+        b.CM     = Expression(b.t, rule=self.E_CM)
+        b.CN     = Expression(b.t, rule=self.E_CN)
+        b.DCM    = Expression(b.t, [1, 2, 3], [1, 2, 3], rule=self.E_DCM)
+
+        for name in phase.dynamics:
+            b.add_component(name + '_Con', Constraint(b.t, rule=getattr(self, name)))
+
+        # without thrust only a small propellant flow is allowed
+        if not phase.thrust:
+            b.Q_mpdot_coast_Con = Constraint(b.t, rule=self.Q_mpdot_coast)
+
+        b.initial = Constraint(list(phase.initial), rule=self.Q_initial)
+        b.final   = Constraint(list(phase.final), rule=self.Q_final)
+
+        return
+
+    # Burn phases carry the thrust terms
+    def burning(self, b):
+
+        return self.phases[b.index() - 1].thrust
+
+    # the per-node accessors are only needed while building, keep them out of pickles
+    def __getstate__(self):
+
+        state = self.__dict__.copy()
+        state['_phaseVariables'] = {}
+
+        return state
+
+    # Suffixes carrying IPOPT bound and constraint multipliers between solves
+    def addWarmStartSuffixes(self):
+
+        self.m.ipopt_zL_out = Suffix(direction=Suffix.IMPORT)
+        self.m.ipopt_zU_out = Suffix(direction=Suffix.IMPORT)
+        self.m.ipopt_zL_in  = Suffix(direction=Suffix.EXPORT)
+        self.m.ipopt_zU_in  = Suffix(direction=Suffix.EXPORT)
+        self.m.dual         = Suffix(direction=Suffix.IMPORT_EXPORT)
+
+        return
     
+    def phaseVariables(self, b, t):
+
+        if (b.index(), t) not in self._phaseVariables:
+            self._phaseVariables[b.index(), t] = PhaseVariables(b, t)
+
+        return self._phaseVariables[b.index(), t]
+
+    # shared per-node terms
+    def E_Vsq(self, b, t): 
+
+        V = self.phaseVariables(b, t)
+        
+        return (V.u**2) + (V.v**2) + (V.w**2)
+
+    def E_Mach(self, b, t): 
+
+        V = self.phaseVariables(b, t)
+
+        a = (atm.gamma * atm.R_const * atm.temperature(V.z))
+        return ((V.Vsq / a)**0.5)
+
+    def E_rho(self, b, t): 
+
+        V = self.phaseVariables(b, t)
+
+        return atm.rho(V.z) * self.m.rho_factor
+
+    def E_qbar(self, b, t): 
+
+        V = self.phaseVariables(b, t)
+
+        return 0.5 * V.rho * V.Vsq
+
+    def E_thrust(self, b, t): 
+
+        V = self.phaseVariables(b, t)
+
+        return ((V.mpdot) * self.m.Isp * (self.m.eff_cstr / prop.eff_cstr) * 9.81)
+
+    def E_g(self, b, t): 
+
+        V = self.phaseVariables(b, t)
+
+        return atm.gravity(V.z)
+
+    # aerodynamic coefficients, named so a table surface is built once per node
+    def E_CX(self, b, t): 
+
+        V = self.phaseVariables(b, t)
+
+        return self.aero.axial(V.Mach, V.alpha, V.beta)
+
+    def E_CY(self, b, t): 
+
+        V = self.phaseVariables(b, t)
+
+        return self.aero.normal(V.Mach, V.beta)
+
+    def E_CZ(self, b, t): 
+
+        V = self.phaseVariables(b, t)
+
+        return self.aero.normal(V.Mach, V.alpha)
+
+    def E_CM(self, b, t): 
+
+        V = self.phaseVariables(b, t)
+
+        return self.aero.moment(V.Mach, V.alpha)
+
+    def E_CN(self, b, t): 
+
+        V = self.phaseVariables(b, t)
+
+        return self.aero.moment(V.Mach, V.beta)
+
+    def E_DCM(self, b, t, i, j): 
+
+        V = self.phaseVariables(b, t)
+
+        Q = ((eom.quaternion.Q11, eom.quaternion.Q12, eom.quaternion.Q13), \
+             (eom.quaternion.Q21, eom.quaternion.Q22, eom.quaternion.Q23), \
+             (eom.quaternion.Q31, eom.quaternion.Q32, eom.quaternion.Q33))
+        return Q[i - 1][j - 1](V.q0, V.q1, V.q2, V.q3)
+
     # mass change rates
-    def Q_massdot(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau)= getPhaseVariables(m, n, t)
+    def Q_massdot(self, b, t): 
+
+        V = self.phaseVariables(b, t)
                 
-        return (massdot) == -(mpdot)
+        return (V.massdot) == -(V.mpdot)
     
-    def Q_mass_dot_2(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau)  = getPhaseVariables(m, n, t)
+    def Q_mpdot_coast(self, b, t): 
+        V = self.phaseVariables(b, t)
         
-        return mpdot <= 0.01
+        return V.mpdot <= 0.01
     
-    def Q_Q_max(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau)  = getPhaseVariables(m, n, t)
+    def Q_Q_max(self, b, t): 
+        V = self.phaseVariables(b, t)
         
-        return (0.5 * atm.rho(z) * (u**2 + v**2 + w**2)) <= 2000
+        return V.qbar <= 2000
     
     # quaternions  
-    def Q_q0(self, m, n,t):
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
-
-        return  q0 == ((cos((psi) / 2) * cos((the) / 2) * cos((phi) / 2)) + (sin((psi) / 2) * sin((the) / 2) * sin((phi) / 2)))
-
-    def Q_q1(self, m, n, t):
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
-        return  q1 == (cos((psi) / 2) * cos((the) / 2) * sin((phi) / 2)) - (sin((psi) / 2) * sin((the) / 2) * cos((phi) / 2))
-
-    def Q_q2(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
-        return  q2 == (cos((psi) / 2) * sin((the) / 2) * cos((phi) / 2)) + (sin((psi) / 2) * cos((the) / 2) * sin((phi) / 2)) 
+    def Q_q0(self, b, t):
+
+        V = self.phaseVariables(b, t)
+
+        return  V.q0 == ((cos((V.psi) / 2) * cos((V.the) / 2) * cos((V.phi) / 2)) + (sin((V.psi) / 2) * sin((V.the) / 2) * sin((V.phi) / 2)))
+
+    def Q_q1(self, b, t):
+
+        V = self.phaseVariables(b, t)
+        return  V.q1 == (cos((V.psi) / 2) * cos((V.the) / 2) * sin((V.phi) / 2)) - (sin((V.psi) / 2) * sin((V.the) / 2) * cos((V.phi) / 2))
+
+    def Q_q2(self, b, t): 
+
+        V = self.phaseVariables(b, t)
+        return  V.q2 == (cos((V.psi) / 2) * sin((V.the) / 2) * cos((V.phi) / 2)) + (sin((V.psi) / 2) * cos((V.the) / 2) * sin((V.phi) / 2)) 
     
-    def Q_q3(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
-        return  q3 == (sin((psi) / 2) * cos((the) / 2) * cos((phi) / 2)) - (cos((psi) / 2) * sin((the) / 2) * sin((phi) / 2)) 
+    def Q_q3(self, b, t): 
+
+        V = self.phaseVariables(b, t)
+        return  V.q3 == (sin((V.psi) / 2) * cos((V.the) / 2) * cos((V.phi) / 2)) - (cos((V.psi) / 2) * sin((V.the) / 2) * sin((V.phi) / 2)) 
 
     # body velocity   
-    def Q_u(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_u(self, b, t): 
+
+        V = self.phaseVariables(b, t)
         
-        t11 = cos(the) * cos(psi)
-        t12 = cos(psi) * sin(the) * sin(phi) - sin(psi) * cos(phi)
-        t13 = cos(psi) * sin(the) * cos(phi) + sin(psi) * sin(phi)
-        return (xdot) * eom.inverse_quaternion.Q_prime(q0, q1, q2, q3) == (((u) * eom.inverse_quaternion.Q11_prime(q0, q1, q2, q3)) + ((v) * eom.inverse_quaternion.Q12_prime(q0, q1, q2, q3)) + ((w) * eom.inverse_quaternion.Q13_prime(q0, q1, q2, q3)))
-
-    def Q_v(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+        t11 = cos(V.the) * cos(V.psi)
+        t12 = cos(V.psi) * sin(V.the) * sin(V.phi) - sin(V.psi) * cos(V.phi)
+        t13 = cos(V.psi) * sin(V.the) * cos(V.phi) + sin(V.psi) * sin(V.phi)
+        if self.kinematics == 'cofactor':
+            return (V.xdot) * eom.inverse_quaternion.Q_prime(V.q0, V.q1, V.q2, V.q3) == (((V.u) * eom.inverse_quaternion.Q11_prime(V.q0, V.q1, V.q2, V.q3)) + ((V.v) * eom.inverse_quaternion.Q12_prime(V.q0, V.q1, V.q2, V.q3)) + ((V.w) * eom.inverse_quaternion.Q13_prime(V.q0, V.q1, V.q2, V.q3)))
+        return (V.xdot) == (((V.u) * V.Q11) + ((V.v) * V.Q21) + ((V.w) * V.Q31))
+
+    def Q_v(self, b, t): 
+        V = self.phaseVariables(b, t)
         
-        t21 = sin(psi) * cos(the)
-        t22 = sin(psi) * sin(the) * sin(phi) + cos(psi) * cos(phi)
-        t23 = sin(psi) * sin(the) * cos(phi) - cos(psi) * sin(phi)
-        return  (ydot) * eom.inverse_quaternion.Q_prime(q0, q1, q2, q3) == (((u) * eom.inverse_quaternion.Q21_prime(q0, q1, q2, q3)) + ((v) * eom.inverse_quaternion.Q22_prime(q0, q1, q2, q3)) + ((w) * eom.inverse_quaternion.Q23_prime(q0, q1, q2, q3)))
-
-    def Q_w(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+        t21 = sin(V.psi) * cos(V.the)
+        t22 = sin(V.psi) * sin(V.the) * sin(V.phi) + cos(V.psi) * cos(V.phi)
+        t23 = sin(V.psi) * sin(V.the) * cos(V.phi) - cos(V.psi) * sin(V.phi)
+        if self.kinematics == 'cofactor':
+            return  (V.ydot) * eom.inverse_quaternion.Q_prime(V.q0, V.q1, V.q2, V.q3) == (((V.u) * eom.inverse_quaternion.Q21_prime(V.q0, V.q1, V.q2, V.q3)) + ((V.v) * eom.inverse_quaternion.Q22_prime(V.q0, V.q1, V.q2, V.q3)) + ((V.w) * eom.inverse_quaternion.Q23_prime(V.q0, V.q1, V.q2, V.q3)))
+        return (V.ydot) == (((V.u) * V.Q12) + ((V.v) * V.Q22) + ((V.w) * V.Q32))
+
+    def Q_w(self, b, t): 
+
+        V = self.phaseVariables(b, t)
         
-        t31 = -sin(the)
-        t32 = cos(the) * sin(phi)
-        t33 = cos(the) * cos(phi)
-        return (-(zdot)) * eom.inverse_quaternion.Q_prime(q0, q1, q2, q3) == (((u) * eom.inverse_quaternion.Q31_prime(q0, q1, q2, q3)) + ((v) * eom.inverse_quaternion.Q32_prime(q0, q1, q2, q3)) + (w * eom.inverse_quaternion.Q33_prime(q0, q1, q2, q3)))
+        t31 = -sin(V.the)
+        t32 = cos(V.the) * sin(V.phi)
+        t33 = cos(V.the) * cos(V.phi)
+        if self.kinematics == 'cofactor':
+            return (-(V.zdot)) * eom.inverse_quaternion.Q_prime(V.q0, V.q1, V.q2, V.q3) == (((V.u) * eom.inverse_quaternion.Q31_prime(V.q0, V.q1, V.q2, V.q3)) + ((V.v) * eom.inverse_quaternion.Q32_prime(V.q0, V.q1, V.q2, V.q3)) + (V.w * eom.inverse_quaternion.Q33_prime(V.q0, V.q1, V.q2, V.q3)))
+        return (-(V.zdot)) == (((V.u) * V.Q13) + ((V.v) * V.Q23) + ((V.w) * V.Q33))
 
     # body acceleration
-    def Q_udot(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
-        
-        a = (atm.gamma * atm.R_const * atm.temperature(z))
-        Mach = ((((u**2) + (v**2) + (w**2)) / a)**0.5)
-        CX = (aero.forces.CX_alpha(Mach, alpha, beta)) + (aero.forces.CX_beta(Mach, alpha, beta))
-        AX = 0.5 * atm.rho(z) * (u ** 2)  * param.S * CX
-        FX = (((mpdot) * prop.Isp * 9.81) * cos(kap) * cos(eps)) - AX
-        return (udot) == (((FX / mass)) - ((w)  * (q)) + ((v) * (r)) + ((eom.quaternion.Q13(q0, q1, q2, q3)* atm.gravity(z))))
-
-    def Q_vdot(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
-    
-        a = (atm.gamma * atm.R_const * atm.temperature(z))
-        Mach = (((( (u)**2) + ((v)**2) + ((w)**2)) / a)**0.5)
-        CY = aero.forces.CN_beta(Mach, alpha, beta)
-        AY = 0.5 * atm.rho(z) * ((v) ** 2) * param.S * CY
-        FY = -(((mpdot) * prop.Isp * 9.81) * cos(kap) * sin(eps)) - AY
-        return (vdot) == ((( (FY) / mass)) - ((u) * (r)) + ((w) * (p)) + ((eom.quaternion.Q23(q0, q1, q2, q3) * atm.gravity(z))))
-    
-    def Q_wdot(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
-
-        a = (atm.gamma * atm.R_const * atm.temperature(z))
-        Mach = (((( (u)**2) + ((v)**2) + ((w)**2)) / a)**0.5)
-        CZ = aero.forces.CN_alpha(Mach, alpha, beta)
-        AZ = 0.5 * atm.rho(z) * ((w) ** 2) * param.S * CZ
-        FZ = -(((mpdot) * prop.Isp * 9.81) * sin(kap)) - AZ
-        return (wdot) == ((( (FZ) / mass)) - ((v) * (p)) + ((u) * (q)) + ((eom.quaternion.Q33(q0, q1, q2, q3) * atm.gravity(z))))
-
-    def Q_udot_2(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_udot(self, b, t): 
+
+        V = self.phaseVariables(b, t)
         
-        a = (atm.gamma * atm.R_const * atm.temperature(z))
-        Mach = ((((u**2) + (v**2) + (w**2)) / a)**0.5)
-        CX = (aero.forces.CX_alpha(Mach, alpha, beta)) + (aero.forces.CX_beta(Mach, alpha, beta))
-        AX = 0.5 * atm.rho(z) * (u ** 2)  * param.S * CX
+        AX = 0.5 * V.rho * (V.u ** 2)  * param.S * self.m.S_factor * self.m.CX_factor * V.CX
         FX = - AX
-        return (udot) == (((FX / mass)) - ((w)  * (q)) + ((v) * (r)) + ((eom.quaternion.Q13(q0, q1, q2, q3)* atm.gravity(z))))
+        if self.burning(b):
+            FX = (V.thrust * cos(V.kap) * cos(V.eps)) - AX
+        return (V.udot) == (((FX / V.mass)) - ((V.w)  * (V.q)) + ((V.v) * (V.r)) + ((V.Q13* V.g)))
+
+    def Q_vdot(self, b, t): 
+
+        V = self.phaseVariables(b, t)
     
-    def Q_vdot_2(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
-        
-        a = (atm.gamma * atm.R_const * atm.temperature(z))
-        Mach = (((( (u)**2) + ((v)**2) + ((w)**2)) / a)**0.5)
-        CY = aero.forces.CN_beta(Mach, alpha, beta)
-        AY = 0.5 * atm.rho(z) * ((v) ** 2) * param.S * CY
+        AY = 0.5 * V.rho * ((V.v) ** 2) * param.S * self.m.S_factor * self.m.CN_factor * V.CY
         FY = - AY
-        return (vdot) == ((( (FY) / mass)) - ((u) * (r)) + ((w) * (p)) + ((eom.quaternion.Q23(q0, q1, q2, q3) * atm.gravity(z))))
+        if self.burning(b):
+            FY = -(V.thrust * cos(V.kap) * sin(V.eps)) - AY
+        return (V.vdot) == ((( (FY) / V.mass)) - ((V.u) * (V.r)) + ((V.w) * (V.p)) + ((V.Q23 * V.g)))
     
-    def Q_wdot_2(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
-
-        a = (atm.gamma * atm.R_const * atm.temperature(z))
-        Mach = (((( (u)**2) + ((v)**2) + ((w)**2)) / a)**0.5)
-        CZ = aero.forces.CN_alpha(Mach, alpha, beta)
-        AZ = 0.5 * atm.rho(z) * ((w) ** 2) * param.S * CZ
+    def Q_wdot(self, b, t): 
+
+        V = self.phaseVariables(b, t)
+
+        AZ = 0.5 * V.rho * ((V.w) ** 2) * param.S * self.m.S_factor * self.m.CN_factor * V.CZ
         FZ = - AZ
-        return (wdot) == ((( (FZ) / mass)) - ((v) * (p)) + ((u) * (q)) + ((eom.quaternion.Q33(q0, q1, q2, q3) * atm.gravity(z))))
+        if self.burning(b):
+            FZ = -(V.thrust * sin(V.kap)) - AZ
+        return (V.wdot) == ((( (FZ) / V.mass)) - ((V.v) * (V.p)) + ((V.u) * (V.q)) + ((V.Q33 * V.g)))
 
     # body angular acceleration    
-    def Q_pdot(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_pdot(self, b, t): 
+
+        V = self.phaseVariables(b, t)
         
         CL = 10e-7
-        AL = 0.5 * atm.rho(z) * ((u) ** 2) * param.S * param.l * CL
-        return (pdot) == (((q) * (r) ) * ((param.Iy - param.Iz) / param.Ix)) + AL
-
-    def Q_qdot(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
-
-        MZ = (-((mpdot) * prop.Isp * 9.81) * sin(kap)) * param.d
-        a = (atm.gamma * atm.R_const * atm.temperature(z))
-        Mach = (((( (u)**2) + ((v)**2) + ((w)**2)) / a)**0.5)
-        CM = aero.moments.CM_alpha(Mach, alpha, beta)
-        AM = 0.5 * atm.rho(z) * ((v) ** 2) * param.S * param.l * CM
-        return (qdot) == ((((p) * (r)) * ((param.Iz - param.Ix) / param.Iy)) - ((MZ + AM) / param.Iy))
-    
-    def Q_rdot(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
-
-        MY = (-((mpdot) * prop.Isp * 9.81) * cos(kap) * sin(eps)) * param.d 
-        a = (atm.gamma * atm.R_const * atm.temperature(z))
-        Mach = (((( (u)**2) + ((v)**2) + ((w)**2)) / a)**0.5)  
-        CN = aero.moments.CM_beta(Mach, alpha, beta)
-        AN = 0.5 * atm.rho(z) * ((w) ** 2) * param.S * param.l * CN
-        return (rdot) == ((((p) * (q)) * ((param.Ix - param.Iy) / param.Iz)) + ((MY + AN) / param.Iz))
-
-
-    def Q_qdot_2(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
-
-        a = (atm.gamma * atm.R_const * atm.temperature(z))
-        Mach = (((( (u)**2) + ((v)**2) + ((w)**2)) / a)**0.5)
-        CM = aero.moments.CM_alpha(Mach, alpha, beta)
-        AM = 0.5 * atm.rho(z) * ((v) ** 2) * param.S * param.l * CM
-        return (qdot) == ((((p) * (r)) * ((param.Iz - param.Ix) / param.Iy)) - ((AM) / param.Iy))
-    
-    def Q_rdot_2(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
-
-        a = (atm.gamma * atm.R_const * atm.temperature(z))
-        Mach = (((( (u)**2) + ((v)**2) + ((w)**2)) / a)**0.5)  
-        CN = aero.moments.CM_beta(Mach, alpha, beta)
-        AN = 0.5 * atm.rho(z) * ((w) ** 2) * param.S * param.l * CN
-        return (rdot) == ((((p) * (q)) * ((param.Ix - param.Iy) / param.Iz)) + ((AN) / param.Iz))
+        AL = 0.5 * V.rho * ((V.u) ** 2) * param.S * self.m.S_factor * param.l * CL
+        return (V.pdot) == (((V.q) * (V.r) ) * ((param.Iy - param.Iz) / param.Ix)) + AL
+
+    def Q_qdot(self, b, t): 
+        V = self.phaseVariables(b, t)
+
+        AM = 0.5 * V.rho * ((V.v) ** 2) * param.S * self.m.S_factor * param.l * self.m.CM_factor * V.CM
+        if not self.burning(b):
+            return (V.qdot) == ((((V.p) * (V.r)) * ((param.Iz - param.Ix) / param.Iy)) - ((AM) / param.Iy))
+
+        MZ = (-V.thrust * sin(V.kap)) * param.d
+        return (V.qdot) == ((((V.p) * (V.r)) * ((param.Iz - param.Ix) / param.Iy)) - ((MZ + AM) / param.Iy))
     
+    def Q_rdot(self, b, t): 
+
+        V = self.phaseVariables(b, t)
+
+        AN = 0.5 * V.rho * ((V.w) ** 2) * param.S * self.m.S_factor * param.l * self.m.CM_factor * V.CN
+        if not self.burning(b):
+            return (V.rdot) == ((((V.p) * (V.q)) * ((param.Ix - param.Iy) / param.Iz)) + ((AN) / param.Iz))
+
+        MY = (-V.thrust * cos(V.kap) * sin(V.eps)) * param.d 
+        return (V.rdot) == ((((V.p) * (V.q)) * ((param.Ix - param.Iy) / param.Iz)) + ((MY + AN) / param.Iz))
+
     # body angular rates 
-    def Q_phidot(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_phidot(self, b, t): 
+
+        V = self.phaseVariables(b, t)
         
-        return p == phidot - (sin(the) * psidot)
+        return V.p == V.phidot - (sin(V.the) * V.psidot)
     
-    def Q_thedot(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_thedot(self, b, t): 
+
+        V = self.phaseVariables(b, t)
         
-        return q == (cos(phi) * thedot) + (sin(phi) * cos(the) * psidot)
+        return V.q == (cos(V.phi) * V.thedot) + (sin(V.phi) * cos(V.the) * V.psidot)
     
-    def Q_psidot(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_psidot(self, b, t): 
+
+        V = self.phaseVariables(b, t)
         
-        return r == (-sin(phi) * thedot) + (cos(phi) * cos(the) * psidot)
+        return V.r == (-sin(V.phi) * V.thedot) + (cos(V.phi) * cos(V.the) * V.psidot)
     
     # attitude angles
-    def Q_phi(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_phi(self, b, t): 
+
+        V = self.phaseVariables(b, t)
         
-        return tan(phi) * (q0**2 - q1**2 - q2**2 - q3**2) ==  (2 * (q2 * q3 + q0 * q1)) 
+        return tan(V.phi) * (V.q0**2 - V.q1**2 - V.q2**2 - V.q3**2) ==  (2 * (V.q2 * V.q3 + V.q0 * V.q1)) 
     
-    def Q_the(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_the(self, b, t): 
+
+        V = self.phaseVariables(b, t)
         
-        return sin(the) ==  (-2 * (q1 * q3 - q0 * q2))
+        return sin(V.the) ==  (-2 * (V.q1 * V.q3 - V.q0 * V.q2))
     
-    def Q_psi(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_psi(self, b, t): 
+
+        V = self.phaseVariables(b, t)
         
-        return tan(psi) * (q0**2 + q1**2 - q2**2 - q3**2) == ( (2 * (q1 * q2 + q0 * q3))  )
+        return tan(V.psi) * (V.q0**2 + V.q1**2 - V.q2**2 - V.q3**2) == ( (2 * (V.q1 * V.q2 + V.q0 * V.q3))  )
     
     # derivatives
-    def Q_dx_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_dx_dtau(self, b, t): 
+        V = self.phaseVariables(b, t)
         
-        return (dx_dtau) == (xdot) * tf
+        return (V.dx_dtau) == (V.xdot) * V.tf
     
-    def Q_dy_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_dy_dtau(self, b, t): 
+        V = self.phaseVariables(b, t)
         
-        return (dy_dtau) == (ydot) * tf
+        return (V.dy_dtau) == (V.ydot) * V.tf
     
-    def Q_dz_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
-        return (dz_dtau) == (zdot) * tf
+    def Q_dz_dtau(self, b, t): 
+        V = self.phaseVariables(b, t)
+        return (V.dz_dtau) == (V.zdot) * V.tf
     
-    def Q_du_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_du_dtau(self, b, t): 
+        V = self.phaseVariables(b, t)
         
-        return (du_dtau) == (udot) * tf
+        return (V.du_dtau) == (V.udot) * V.tf
     
-    def Q_dv_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_dv_dtau(self, b, t): 
+        V = self.phaseVariables(b, t)
         
-        return (dv_dtau) == (vdot) * tf
+        return (V.dv_dtau) == (V.vdot) * V.tf
     
-    def Q_dw_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_dw_dtau(self, b, t): 
+        V = self.phaseVariables(b, t)
         
-        return (dw_dtau) == (wdot) * tf
+        return (V.dw_dtau) == (V.wdot) * V.tf
     
-    def Q_dp_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_dp_dtau(self, b, t): 
+        V = self.phaseVariables(b, t)
         
-        return (dp_dtau) == (pdot) * tf
+        return (V.dp_dtau) == (V.pdot) * V.tf
     
-    def Q_dq_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_dq_dtau(self, b, t): 
+        V = self.phaseVariables(b, t)
         
-        return (dq_dtau) == (qdot) * tf
+        return (V.dq_dtau) == (V.qdot) * V.tf
     
-    def Q_dr_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_dr_dtau(self, b, t): 
+        V = self.phaseVariables(b, t)
         
-        return (dr_dtau) == (rdot) * tf
+        return (V.dr_dtau) == (V.rdot) * V.tf
     
     
-    def Q_dphi_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_dphi_dtau(self, b, t): 
+        V = self.phaseVariables(b, t)
         
-        return (dphi_dtau) == (phidot) * tf
+        return (V.dphi_dtau) == (V.phidot) * V.tf
     
-    def Q_dthe_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_dthe_dtau(self, b, t): 
+        V = self.phaseVariables(b, t)
         
-        return (dthe_dtau) == (thedot) * tf
+        return (V.dthe_dtau) == (V.thedot) * V.tf
     
-    def Q_dpsi_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau) = getPhaseVariables(m, n, t)
+    def Q_dpsi_dtau(self, b, t): 
+        V = self.phaseVariables(b, t)
         
-        return (dpsi_dtau) == (psidot) * tf
+        return (V.dpsi_dtau) == (V.psidot) * V.tf
     
-    def Q_dmass_dtau(self, m, n, t): 
-
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau)= getPhaseVariables(m, n, t)
+    def Q_dmass_dtau(self, b, t): 
+
+        V = self.phaseVariables(b, t)
                 
-        return (dmass_dtau) == (massdot) * tf
+        return (V.dmass_dtau) == (V.massdot) * V.tf
    
-    # Boundary conditions   
-    def BCs(self, m):
-    
-#================Initialize Phase==============================================
-        yield m.x_1[0]          == 0.01 / m.x_scale
-        yield m.y_1[0]          == 0.01 / m.y_scale   
-        yield m.z_1[0]          == 0 / m.z_scale   
-
-        yield m.u_1[0]          == 0.1 / m.u_scale
-        yield m.v_1[0]          == 0 / m.v_scale
-        yield m.w_1[0]          == 0 / m.w_scale
-        
-        yield m.the_1[0]        == (1.48) / m.the_scale 
+    # Boundary conditions of a phase
+    def Q_initial(self, b, name):
 
-        yield m.mass_1[0]       == 191 / m.mass_scale 
+        return b.component(name)[b.t.first()] == self.boundary(name, self.phases[b.index() - 1].initial[name])
 
-        # Boundary conditions 1-> 2
+    def Q_final(self, b, name):
 
-        yield m.x_1[1]         == m.x_2[0] 
-        yield m.y_1[1]         == m.y_2[0]  
-        yield m.z_1[1]         == m.z_2[0]
+        return b.component(name)[b.t.last()] == self.boundary(name, self.phases[b.index() - 1].final[name])
 
-        yield m.u_1[1]         == m.u_2[0]
-        yield m.v_1[1]         == m.v_2[0]
-        yield m.w_1[1]         == m.w_2[0]
+    # Scaled boundary value, a mutable Param stays in the constraint so it can change without a rebuild
+    def boundary(self, name, entry):
 
-        yield m.p_1[1]         == m.p_2[0]
-        yield m.q_1[1]         == m.q_2[0]
-        yield m.r_1[1]         == m.r_2[0]
+        if isinstance(entry, str) and self.m.component(entry).mutable:
+            target = self.m.component(entry)
+            for scale in phaseScaling[name]:
+                target = target / self.m.component(scale)
+            return target
 
-        yield m.phi_1[1]       == m.phi_2[0]
-        yield m.the_1[1]       == m.the_2[0]
-        yield m.psi_1[1]       == m.psi_2[0]
-        
-        yield m.mass_1[1]      == m.mass_2[0]
+        return self.scaled(name, entry)
 
-        # Boundary conditions 2-> 3
-        
-        yield m.x_2[1]         == m.x_3[0] 
-        yield m.y_2[1]         == m.y_3[0]  
-        yield m.z_2[1]         == m.z_3[0]
-            
-        yield m.u_2[1]         == m.u_3[0]
-        yield m.v_2[1]         == m.v_3[0]
-        yield m.w_2[1]         == m.w_3[0]
-
-        yield m.p_2[1]         == m.p_3[0]
-        yield m.q_2[1]         == m.q_3[0]
-        yield m.r_2[1]         == m.r_3[0]
-
-        yield m.phi_2[1]       == m.phi_3[0]
-        yield m.the_2[1]       == m.the_3[0]
-        yield m.psi_2[1]       == m.psi_3[0]
-        
-        yield m.mass_2[1]      == m.mass_3[0]
+    # Continuity of a state between phase n and n + 1
+    def Q_linkage(self, m, n, state):
 
-#================Finalize Phase==============================================
-        yield m.z_2[1]         == 400e3 /  self.m.z_scale
-        yield m.u_3[1]         == 3350 /  self.m.u_scale
+        return m.phase[n].component(state)[m.phase[n].t.last()] == m.phase[n + 1].component(state)[m.phase[n + 1].t.first()]
@@ -8,7 +8,8 @@ from pyomo.dae import *
 import numpy as np
 import matplotlib.pyplot as plt
 
-from Utilities.Phase_Variables_Single import getPhaseVariables
+from Utilities.Phase_Variables_Single import PhaseVariables
+from Phases import discretize
 import Aerodynamics as aero
 import Propulsion as prop 
 import Parameters as param
@@ -21,13 +22,22 @@ class MAV():
     
     def __init__(self,
                  x0=None, y0=None, z0=None, u0=None, v0=None, w0=None, phi0=None, the0=None, psi0=None, p0=None, q0=None, r0=None, \
-                  xf=None, yf=None, zf=None, uf=None, vf=None, wf=None, phif=None, thef=None, psif=None, pf=None, qf=None, rf=None):
+                  xf=None, yf=None, zf=None, uf=None, vf=None, wf=None, phif=None, thef=None, psif=None, pf=None, qf=None, rf=None, kinematics='transpose', \
+                  scheme='BACKWARD', nfe=200, ncp=3):
     
         super().__init__()
         
         # model
         self.m               = ConcreteModel('MAV')
 
+        # body to inertial velocity: 'transpose' of the unit quaternion DCM or the original 'cofactor' inverse
+        if kinematics not in ('transpose', 'cofactor'):
+            raise ValueError("kinematics must be 'transpose' or 'cofactor', got %r" % (kinematics,))
+        self.kinematics      = kinematics
+
+        # lazily scaled variables of every phase node, shared by all rules at that node
+        self._phaseVariables = {}
+
         # bounds
         self.m.x_max         = Param(initialize = 5000e3)
         self.m.y_max         = Param(initialize = 5000e3)
@@ -169,6 +179,10 @@ class MAV():
         self.m.beta_scale    = Param(initialize = 1)
 
         self.m.tf_scale    = Param(initialize = 1)
+
+        # objective weightings (mutable so a Pareto sweep re-solves without rebuilding)
+        self.m.W_Obj1      = Param(initialize = 1, mutable=True)
+        self.m.W_Obj2      = Param(initialize = 1, mutable=True)
         #=============Phase 1===========================================
 
         # time
@@ -262,9 +276,17 @@ class MAV():
         self.m.beta_1 = Var(self.m.t1, bounds=(self.m.beta_min / self.m.beta_scale, self.m.beta_max / self.m.beta_scale))
 
 
-        # discretize problem euler backward finite difference
-        discretizer = TransformationFactory('dae.finite_difference')
-        discretizer.apply_to(self.m, nfe=200, wrt=self.m.t1, scheme='BACKWARD')
+        # discretize problem, euler backward finite difference by default or collocation (see Phases.py)
+        discretize(self.m, self.m.t1, scheme, nfe, ncp)
+
+        # shared per-node terms referenced by all dynamics constraints
+        self.m.Vsq_1    = Expression([1], self.m.t1, rule=self.E_Vsq)
+        self.m.Mach_1   = Expression([1], self.m.t1, rule=self.E_Mach)
+        self.m.rho_1    = Expression([1], self.m.t1, rule=self.E_rho)
+        self.m.qbar_1   = Expression([1], self.m.t1, rule=self.E_qbar)
+        self.m.thrust_1 = Expression([1], self.m.t1, rule=self.E_thrust)
+        self.m.g_1      = Expression([1], self.m.t1, rule=self.E_g)
+        self.m.DCM_1    = Expression([1], self.m.t1, [1, 2, 3], [1, 2, 3], rule=self.E_DCM)
 
         # initial and final conditions
         self.x0 = x0
@@ -301,737 +323,333 @@ class MAV():
         
         return
     
+    # the per-node accessors are only needed while building, keep them out of pickles
+    def __getstate__(self):
+
+        state = self.__dict__.copy()
+        state['_phaseVariables'] = {}
+
+        return state
+
+    def phaseVariables(self, m, n, t):
+
+        if (n, t) not in self._phaseVariables:
+            self._phaseVariables[n, t] = PhaseVariables(m, n, t)
+
+        return self._phaseVariables[n, t]
+
+    # shared per-node terms
+    def E_Vsq(self, m, n, t): 
+
+        V = self.phaseVariables(m, n, t)
+        
+        return (V.u**2) + (V.v**2) + (V.w**2)
+
+    def E_Mach(self, m, n, t): 
+
+        V = self.phaseVariables(m, n, t)
+
+        a = (atm.gamma * atm.R_const * atm.temperature(V.z))
+        return ((V.Vsq / a)**0.5)
+
+    def E_rho(self, m, n, t): 
+
+        V = self.phaseVariables(m, n, t)
+
+        return atm.rho(V.z)
+
+    def E_qbar(self, m, n, t): 
+
+        V = self.phaseVariables(m, n, t)
+
+        return 0.5 * V.rho * V.Vsq
+
+    def E_thrust(self, m, n, t): 
+
+        V = self.phaseVariables(m, n, t)
+
+        return ((V.mpdot) * prop.Isp * 9.81)
+
+    def E_g(self, m, n, t): 
+
+        V = self.phaseVariables(m, n, t)
+
+        return atm.gravity(V.z)
+
+    def E_DCM(self, m, n, t, i, j): 
+
+        V = self.phaseVariables(m, n, t)
+
+        Q = ((eom.quaternion.Q11, eom.quaternion.Q12, eom.quaternion.Q13), \
+             (eom.quaternion.Q21, eom.quaternion.Q22, eom.quaternion.Q23), \
+             (eom.quaternion.Q31, eom.quaternion.Q32, eom.quaternion.Q33))
+        return Q[i - 1][j - 1](V.q0, V.q1, V.q2, V.q3)
+
     # mass change rates
     def Q_massdot(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot)= getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
                 
-        return (massdot) == -(mpdot)
+        return (V.massdot) == -(V.mpdot)
     
     def Q_mass_dot_2(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot)  = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         
-        return mpdot <= 0.005
+        return V.mpdot <= 0.005
     
     # quaternions  
     def Q_q0(self, m, n,t):
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
-
-        return  q0 == ((cos((psi) / 2) * cos((the) / 2) * cos((phi) / 2)) + (sin((psi) / 2) * sin((the) / 2) * sin((phi) / 2)))
+        V = self.phaseVariables(m, n, t)
+
+        return  V.q0 == ((cos((V.psi) / 2) * cos((V.the) / 2) * cos((V.phi) / 2)) + (sin((V.psi) / 2) * sin((V.the) / 2) * sin((V.phi) / 2)))
 
     def Q_q1(self, m, n, t):
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
-        return  q1 == (cos((psi) / 2) * cos((the) / 2) * sin((phi) / 2)) - (sin((psi) / 2) * sin((the) / 2) * cos((phi) / 2))
+        V = self.phaseVariables(m, n, t)
+        return  V.q1 == (cos((V.psi) / 2) * cos((V.the) / 2) * sin((V.phi) / 2)) - (sin((V.psi) / 2) * sin((V.the) / 2) * cos((V.phi) / 2))
 
     def Q_q2(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
-        return  q2 == (cos((psi) / 2) * sin((the) / 2) * cos((phi) / 2)) + (sin((psi) / 2) * cos((the) / 2) * sin((phi) / 2)) 
+        V = self.phaseVariables(m, n, t)
+        return  V.q2 == (cos((V.psi) / 2) * sin((V.the) / 2) * cos((V.phi) / 2)) + (sin((V.psi) / 2) * cos((V.the) / 2) * sin((V.phi) / 2)) 
     
     def Q_q3(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
-        return  q3 == (sin((psi) / 2) * cos((the) / 2) * cos((phi) / 2)) - (cos((psi) / 2) * sin((the) / 2) * sin((phi) / 2)) 
+        V = self.phaseVariables(m, n, t)
+        return  V.q3 == (sin((V.psi) / 2) * cos((V.the) / 2) * cos((V.phi) / 2)) - (cos((V.psi) / 2) * sin((V.the) / 2) * sin((V.phi) / 2)) 
 
     # body velocity   
     def Q_u(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         
-        t11 = cos(the) * cos(psi)
-        t12 = cos(psi) * sin(the) * sin(phi) - sin(psi) * cos(phi)
-        t13 = cos(psi) * sin(the) * cos(phi) + sin(psi) * sin(phi)
-        return (xdot) * eom.inverse_quaternion.Q_prime(q0, q1, q2, q3) == (((u) * eom.inverse_quaternion.Q11_prime(q0, q1, q2, q3)) + ((v) * eom.inverse_quaternion.Q12_prime(q0, q1, q2, q3)) + ((w) * eom.inverse_quaternion.Q13_prime(q0, q1, q2, q3))) 
+        t11 = cos(V.the) * cos(V.psi)
+        t12 = cos(V.psi) * sin(V.the) * sin(V.phi) - sin(V.psi) * cos(V.phi)
+        t13 = cos(V.psi) * sin(V.the) * cos(V.phi) + sin(V.psi) * sin(V.phi)
+        if self.kinematics == 'cofactor':
+            return (V.xdot) * eom.inverse_quaternion.Q_prime(V.q0, V.q1, V.q2, V.q3) == (((V.u) * eom.inverse_quaternion.Q11_prime(V.q0, V.q1, V.q2, V.q3)) + ((V.v) * eom.inverse_quaternion.Q12_prime(V.q0, V.q1, V.q2, V.q3)) + ((V.w) * eom.inverse_quaternion.Q13_prime(V.q0, V.q1, V.q2, V.q3))) 
+        return (V.xdot) == (((V.u) * V.Q11) + ((V.v) * V.Q21) + ((V.w) * V.Q31))
 
     def Q_v(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         
-        t21 = sin(psi) * cos(the)
-        t22 = sin(psi) * sin(the) * sin(phi) + cos(psi) * cos(phi)
-        t23 = sin(psi) * sin(the) * cos(phi) - cos(psi) * sin(phi)
-        return  (ydot) * eom.inverse_quaternion.Q_prime(q0, q1, q2, q3) == (((u) * eom.inverse_quaternion.Q21_prime(q0, q1, q2, q3)) + ((v) * eom.inverse_quaternion.Q22_prime(q0, q1, q2, q3)) + ((w) * eom.inverse_quaternion.Q23_prime(q0, q1, q2, q3)))
+        t21 = sin(V.psi) * cos(V.the)
+        t22 = sin(V.psi) * sin(V.the) * sin(V.phi) + cos(V.psi) * cos(V.phi)
+        t23 = sin(V.psi) * sin(V.the) * cos(V.phi) - cos(V.psi) * sin(V.phi)
+        if self.kinematics == 'cofactor':
+            return  (V.ydot) * eom.inverse_quaternion.Q_prime(V.q0, V.q1, V.q2, V.q3) == (((V.u) * eom.inverse_quaternion.Q21_prime(V.q0, V.q1, V.q2, V.q3)) + ((V.v) * eom.inverse_quaternion.Q22_prime(V.q0, V.q1, V.q2, V.q3)) + ((V.w) * eom.inverse_quaternion.Q23_prime(V.q0, V.q1, V.q2, V.q3)))
+        return (V.ydot) == (((V.u) * V.Q12) + ((V.v) * V.Q22) + ((V.w) * V.Q32))
 
     def Q_w(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         
-        t31 = -sin(the)
-        t32 = cos(the) * sin(phi)
-        t33 = cos(the) * cos(phi)
-        return (-(zdot)) * eom.inverse_quaternion.Q_prime(q0, q1, q2, q3) == (((u) * eom.inverse_quaternion.Q31_prime(q0, q1, q2, q3)) + ((v) * eom.inverse_quaternion.Q32_prime(q0, q1, q2, q3)) + (w * eom.inverse_quaternion.Q33_prime(q0, q1, q2, q3)))
+        t31 = -sin(V.the)
+        t32 = cos(V.the) * sin(V.phi)
+        t33 = cos(V.the) * cos(V.phi)
+        if self.kinematics == 'cofactor':
+            return (-(V.zdot)) * eom.inverse_quaternion.Q_prime(V.q0, V.q1, V.q2, V.q3) == (((V.u) * eom.inverse_quaternion.Q31_prime(V.q0, V.q1, V.q2, V.q3)) + ((V.v) * eom.inverse_quaternion.Q32_prime(V.q0, V.q1, V.q2, V.q3)) + (V.w * eom.inverse_quaternion.Q33_prime(V.q0, V.q1, V.q2, V.q3)))
+        return (-(V.zdot)) == (((V.u) * V.Q13) + ((V.v) * V.Q23) + ((V.w) * V.Q33))
 
     # body acceleration
     def Q_udot(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         
-        a = (atm.gamma * atm.R_const * atm.temperature(z))
-        Mach = ((((u**2) + (v**2) + (w**2)) / a)**0.5)
-        CX = (aero.forces.CX_alpha(Mach, alpha, beta)) + (aero.forces.CX_beta(Mach, alpha, beta))
-        AX = 0.5 * atm.rho(z) * (u ** 2)  * param.S * CX
-        FX = (((mpdot) * prop.Isp * 9.81) * cos(kap) * cos(eps)) - AX
-        return (udot) == (((FX / mass)) - ((w)  * (q)) + ((v) * (r)) + ((eom.quaternion.Q13(q0, q1, q2, q3)* atm.gravity(z))))
+        CX = (aero.forces.CX_alpha(V.Mach, V.alpha, V.beta)) + (aero.forces.CX_beta(V.Mach, V.alpha, V.beta))
+        AX = 0.5 * V.rho * (V.u ** 2)  * param.S * CX
+        FX = (V.thrust * cos(V.kap) * cos(V.eps)) - AX
+        return (V.udot) == (((FX / V.mass)) - ((V.w)  * (V.q)) + ((V.v) * (V.r)) + ((V.Q13* V.g)))
 
     def Q_vdot(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
     
-        a = (atm.gamma * atm.R_const * atm.temperature(z))
-        Mach = (((( (u)**2) + ((v)**2) + ((w)**2)) / a)**0.5)
-        CY = aero.forces.CN_beta(Mach, alpha, beta)
-        AY = 0.5 * atm.rho(z) * ((v) ** 2) * param.S * CY
-        FY = -(((mpdot) * prop.Isp * 9.81) * cos(kap) * sin(eps)) - AY
-        return (vdot) == ((( (FY) / mass)) - ((u) * (r)) + ((w) * (p)) + ((eom.quaternion.Q23(q0, q1, q2, q3) * atm.gravity(z))))
+        CY = aero.forces.CN_beta(V.Mach, V.alpha, V.beta)
+        AY = 0.5 * V.rho * ((V.v) ** 2) * param.S * CY
+        FY = -(V.thrust * cos(V.kap) * sin(V.eps)) - AY
+        return (V.vdot) == ((( (FY) / V.mass)) - ((V.u) * (V.r)) + ((V.w) * (V.p)) + ((V.Q23 * V.g)))
     
     def Q_wdot(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
-
-        a = (atm.gamma * atm.R_const * atm.temperature(z))
-        Mach = (((( (u)**2) + ((v)**2) + ((w)**2)) / a)**0.5)
-        CZ = aero.forces.CN_alpha(Mach, alpha, beta)
-        AZ = 0.5 * atm.rho(z) * ((w) ** 2) * param.S * CZ
-        FZ = -(((mpdot) * prop.Isp * 9.81) * sin(kap)) - AZ
-        return (wdot) == ((( (FZ) / mass)) - ((v) * (p)) + ((u) * (q)) + ((eom.quaternion.Q33(q0, q1, q2, q3) * atm.gravity(z))))
+        V = self.phaseVariables(m, n, t)
+
+        CZ = aero.forces.CN_alpha(V.Mach, V.alpha, V.beta)
+        AZ = 0.5 * V.rho * ((V.w) ** 2) * param.S * CZ
+        FZ = -(V.thrust * sin(V.kap)) - AZ
+        return (V.wdot) == ((( (FZ) / V.mass)) - ((V.v) * (V.p)) + ((V.u) * (V.q)) + ((V.Q33 * V.g)))
 
     #quaternion rate 
     def Q_q0dot(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         k = 0.0005
-        error = 1 - ((q0**2) + (q1**2) + (q2**2) + (q3**2))
-        return (q0dot) - ((0.5 * ((0 * (q0)) - ((p) * (q1)) - ((q) * (q2)) - ((r) * (q3))))) <= 1e-6
+        error = 1 - ((V.q0**2) + (V.q1**2) + (V.q2**2) + (V.q3**2))
+        return (V.q0dot) - ((0.5 * ((0 * (V.q0)) - ((V.p) * (V.q1)) - ((V.q) * (V.q2)) - ((V.r) * (V.q3))))) <= 1e-6
 
     def Q_q1dot(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         k = 0.005
-        error = 1 - ((q0**2) + (q1**2) + (q2**2) + (q3**2))
-        return (q1dot) == ((0.5 * (((p) * (q0)) + (0 * (q1)) + ((r) * (q2)) - ((q) * (q3))))  + k*error*q1)
+        error = 1 - ((V.q0**2) + (V.q1**2) + (V.q2**2) + (V.q3**2))
+        return (V.q1dot) == ((0.5 * (((V.p) * (V.q0)) + (0 * (V.q1)) + ((V.r) * (V.q2)) - ((V.q) * (V.q3))))  + k*error*V.q1)
     
     def Q_q2dot(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         k = 0.0005
-        error = 1 - ((q0**2) + (q1**2) + (q2**2) + (q3**2))
-        return (q2dot) == ((0.5 * (((q) * (q0)) - ((r) * (q1)) + (0 * (q2)) + ((p) * (q3))))  + k*error*q2)
+        error = 1 - ((V.q0**2) + (V.q1**2) + (V.q2**2) + (V.q3**2))
+        return (V.q2dot) == ((0.5 * (((V.q) * (V.q0)) - ((V.r) * (V.q1)) + (0 * (V.q2)) + ((V.p) * (V.q3))))  + k*error*V.q2)
     
     def Q_q3dot(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         k = 0.0005
-        error = 1 - ((q0**2) + (q1**2) + (q2**2) + (q3**2))
-        return (q3dot) == ((0.5 * (((r) * (q0)) + ((q) * (q1)) - ((p) * (q2)) + (0 * (q3)))) + k*error*q3)
+        error = 1 - ((V.q0**2) + (V.q1**2) + (V.q2**2) + (V.q3**2))
+        return (V.q3dot) == ((0.5 * (((V.r) * (V.q0)) + ((V.q) * (V.q1)) - ((V.p) * (V.q2)) + (0 * (V.q3)))) + k*error*V.q3)
 
     # body angular acceleration    
     def Q_pdot(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         
         CL = 10e-7
-        AL = 0.5 * atm.rho(z) * ((u) ** 2) * param.S * param.l * CL
-        return (pdot) == (((q) * (r) ) * ((param.Iy - param.Iz) / param.Ix)) + AL
+        AL = 0.5 * V.rho * ((V.u) ** 2) * param.S * param.l * CL
+        return (V.pdot) == (((V.q) * (V.r) ) * ((param.Iy - param.Iz) / param.Ix)) + AL
 
     def Q_qdot(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
-
-        MZ = (-((mpdot) * prop.Isp * 9.81) * sin(kap)) * param.d
-        a = (atm.gamma * atm.R_const * atm.temperature(z))
-        Mach = (((( (u)**2) + ((v)**2) + ((w)**2)) / a)**0.5)
-        CM = aero.moments.CM_alpha(Mach, alpha, beta)
-        AM = 0.5 * atm.rho(z) * ((v) ** 2) * param.S * param.l * CM
-        return (qdot) == ((((p) * (r)) * ((param.Iz - param.Ix) / param.Iy)) - ((MZ + AM) / param.Iy))
+        V = self.phaseVariables(m, n, t)
+
+        MZ = (-V.thrust * sin(V.kap)) * param.d
+        CM = aero.moments.CM_alpha(V.Mach, V.alpha, V.beta)
+        AM = 0.5 * V.rho * ((V.v) ** 2) * param.S * param.l * CM
+        return (V.qdot) == ((((V.p) * (V.r)) * ((param.Iz - param.Ix) / param.Iy)) - ((MZ + AM) / param.Iy))
     
     def Q_rdot(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
-
-        MY = (-((mpdot) * prop.Isp * 9.81) * cos(kap) * sin(eps)) * param.d 
-        a = (atm.gamma * atm.R_const * atm.temperature(z))
-        Mach = (((( (u)**2) + ((v)**2) + ((w)**2)) / a)**0.5)  
-        CN = aero.moments.CM_beta(Mach, alpha, beta)
-        AN = 0.5 * atm.rho(z) * ((w) ** 2) * param.S * param.l * CN
-        return (rdot) == ((((p) * (q)) * ((param.Ix - param.Iy) / param.Iz)) + ((MY + AN) / param.Iz))
+        V = self.phaseVariables(m, n, t)
+
+        MY = (-V.thrust * cos(V.kap) * sin(V.eps)) * param.d 
+        CN = aero.moments.CM_beta(V.Mach, V.alpha, V.beta)
+        AN = 0.5 * V.rho * ((V.w) ** 2) * param.S * param.l * CN
+        return (V.rdot) == ((((V.p) * (V.q)) * ((param.Ix - param.Iy) / param.Iz)) + ((MY + AN) / param.Iz))
     
     # body angular rates 
     def Q_phidot(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
-        return p == phidot - (sin(the) * psidot)
+        V = self.phaseVariables(m, n, t)
+        return V.p == V.phidot - (sin(V.the) * V.psidot)
     
     def Q_thedot(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
-        return q == (cos(phi) * thedot) + (sin(phi) * cos(the) * psidot)
+        V = self.phaseVariables(m, n, t)
+        return V.q == (cos(V.phi) * V.thedot) + (sin(V.phi) * cos(V.the) * V.psidot)
     
     def Q_psidot(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
-        return r == (-sin(phi) * thedot) + (cos(phi) * cos(the) * psidot)
+        V = self.phaseVariables(m, n, t)
+        return V.r == (-sin(V.phi) * V.thedot) + (cos(V.phi) * cos(V.the) * V.psidot)
     
     # attitude angles
     def Q_phi(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
-        return tan(phi) * (q0**2 - q1**2 - q2**2 - q3**2) ==  (2 * (q2 * q3 + q0 * q1)) 
+        V = self.phaseVariables(m, n, t)
+        return tan(V.phi) * (V.q0**2 - V.q1**2 - V.q2**2 - V.q3**2) ==  (2 * (V.q2 * V.q3 + V.q0 * V.q1)) 
     
     def Q_the(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
-        return sin(the) ==  (-2 * (q1 * q3 - q0 * q2))
+        V = self.phaseVariables(m, n, t)
+        return sin(V.the) ==  (-2 * (V.q1 * V.q3 - V.q0 * V.q2))
     
     def Q_psi(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
-        return tan(psi) * (q0**2 + q1**2 - q2**2 - q3**2) == ( (2 * (q1 * q2 + q0 * q3))  )
+        V = self.phaseVariables(m, n, t)
+        return tan(V.psi) * (V.q0**2 + V.q1**2 - V.q2**2 - V.q3**2) == ( (2 * (V.q1 * V.q2 + V.q0 * V.q3))  )
     
     # derivatives
     def Q_dx_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         
-        return (dx_dtau) == (xdot) * tf
+        return (V.dx_dtau) == (V.xdot) * V.tf
     
     def Q_dy_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         
-        return (dy_dtau) == (ydot) * tf
+        return (V.dy_dtau) == (V.ydot) * V.tf
     
     def Q_dz_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
-        return (dz_dtau) == (zdot) * tf
+        V = self.phaseVariables(m, n, t)
+        return (V.dz_dtau) == (V.zdot) * V.tf
     
     def Q_du_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         
-        return (du_dtau) == (udot) * tf
+        return (V.du_dtau) == (V.udot) * V.tf
     
     def Q_dv_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         
-        return (dv_dtau) == (vdot) * tf
+        return (V.dv_dtau) == (V.vdot) * V.tf
     
     def Q_dw_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
-        return (dw_dtau) == (wdot) * tf
+        V = self.phaseVariables(m, n, t)
+        return (V.dw_dtau) == (V.wdot) * V.tf
     
     def Q_dp_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         
-        return (dp_dtau) == (pdot) * tf
+        return (V.dp_dtau) == (V.pdot) * V.tf
     
     def Q_dq_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         
-        return (dq_dtau) == (qdot) * tf
+        return (V.dq_dtau) == (V.qdot) * V.tf
     
     def Q_dr_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
-        return (dr_dtau) == (rdot) * tf
+        V = self.phaseVariables(m, n, t)
+        return (V.dr_dtau) == (V.rdot) * V.tf
     
     def Q_dq0_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         
-        return (dq0_dtau) == (q0dot) * tf
+        return (V.dq0_dtau) == (V.q0dot) * V.tf
     
     def Q_dq1_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         
-        return (dq1_dtau) == (q1dot) * tf
+        return (V.dq1_dtau) == (V.q1dot) * V.tf
     
     def Q_dq2_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         
-        return (dq2_dtau) == (q2dot) * tf
+        return (V.dq2_dtau) == (V.q2dot) * V.tf
     
     def Q_dq3_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         
-        return (dq3_dtau) == (q3dot) * tf
+        return (V.dq3_dtau) == (V.q3dot) * V.tf
     
     def Q_dphi_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         
-        return (dphi_dtau) == (phidot) * tf
+        return (V.dphi_dtau) == (V.phidot) * V.tf
     
     def Q_dthe_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         
-        return (dthe_dtau) == (thedot) * tf
+        return (V.dthe_dtau) == (V.thedot) * V.tf
     
     def Q_dpsi_dtau(self, m, n, t): 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot) = getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
         
-        return (dpsi_dtau) == (psidot) * tf
+        return (V.dpsi_dtau) == (V.psidot) * V.tf
     
     def Q_dmass_dtau(self, m, n, t): 
 
-        (tf, x, y, z, xdot, ydot, zdot, \
-            u, v, w, udot, vdot, wdot, \
-            p, q, r, pdot, qdot, rdot, \
-            q0, q1, q2, q3, \
-            phi, the, psi, \
-            mass, massdot, mpdot, kap, eps, \
-            du_dtau, dv_dtau, dw_dtau, dx_dtau, dy_dtau, dz_dtau, \
-            dp_dtau, dq_dtau, dr_dtau,\
-            alpha, beta, \
-            dphi_dtau, dthe_dtau, dpsi_dtau, phidot, psidot, thedot, \
-            dmass_dtau, \
-            dq0_dtau, dq1_dtau, dq2_dtau, dq3_dtau, q0dot, q1dot, q2dot, q3dot)= getPhaseVariables(m, n, t)
+        V = self.phaseVariables(m, n, t)
                 
-        return (dmass_dtau) == (massdot) * tf
+        return (V.dmass_dtau) == (V.massdot) * V.tf
    
     # Boundary conditions   
     def BCs(self, m):
@@ -0,0 +1,98 @@
+from pyomo.environ import TransformationFactory
+
+# Declarative description of the trajectory phases built by MAV
+#
+# Physical values are given in SI units; a string names a Param of the model
+# (e.g. 'kap_max'), so a phase can refer to the shared bounds instead of repeating them
+
+# rules making up the 6-DoF dynamics of a phase
+SIX_DOF = ('Q_dmass_dtau',
+           'Q_dx_dtau', 'Q_dy_dtau', 'Q_dz_dtau',
+           'Q_du_dtau', 'Q_dv_dtau', 'Q_dw_dtau',
+           'Q_dp_dtau', 'Q_dq_dtau', 'Q_dr_dtau',
+           'Q_dphi_dtau', 'Q_dthe_dtau', 'Q_dpsi_dtau',
+           'Q_massdot',
+           'Q_q0', 'Q_q1', 'Q_q2', 'Q_q3',
+           'Q_pdot', 'Q_qdot', 'Q_rdot',
+           'Q_udot', 'Q_vdot', 'Q_wdot',
+           'Q_phidot', 'Q_thedot', 'Q_psidot',
+           'Q_u', 'Q_v', 'Q_w')
+
+# transcription schemes of pyomo.dae
+FINITE_DIFFERENCE = ('BACKWARD', 'CENTRAL', 'FORWARD')
+COLLOCATION       = ('LAGRANGE-RADAU', 'LAGRANGE-LEGENDRE')
+
+# states that are continuous from the end of one phase to the start of the next
+LINKED_STATES = ('x', 'y', 'z', 'u', 'v', 'w', 'p', 'q', 'r', 'phi', 'the', 'psi', 'mass')
+
+class Phase():
+
+    def __init__(self, name, thrust=True, scheme='BACKWARD', nfe=75, ncp=3, mesh=None, tf_init=None, tf_bounds=(None, None), dynamics=SIX_DOF,
+                 bounds=None, initialize=None, initial=None, final=None):
+
+        self.name       = name
+
+        # burn phases carry the thrust terms, coast phases only keep a small propellant flow
+        self.thrust     = thrust
+
+        # transcription: finite difference or collocation scheme, finite elements and collocation points per element
+        if scheme not in FINITE_DIFFERENCE + COLLOCATION:
+            raise ValueError("scheme must be one of %s, got %r" % (', '.join(FINITE_DIFFERENCE + COLLOCATION), scheme))
+        self.scheme     = scheme
+        self.nfe        = nfe
+        self.ncp        = ncp
+
+        # finite element boundaries in normalised phase time, a uniform grid of nfe elements if not given
+        self.mesh       = sorted(mesh) if mesh is not None else None
+        if self.mesh is not None:
+            self.nfe    = len(self.mesh) - 1
+
+        # phase duration
+        self.tf_init    = tf_init
+        self.tf_bounds  = tf_bounds
+
+        # constraint rules of MAV applied at every node
+        self.dynamics   = dynamics
+
+        # extra or overridden variable bounds {variable: (min, max)}
+        self.bounds     = bounds or {}
+
+        # initial guesses {variable: value}
+        self.initialize = initialize or {}
+
+        # boundary conditions at the start and end of the phase {variable: value}
+        self.initial    = initial or {}
+        self.final      = final or {}
+
+        return
+
+# Discretize the continuous set wrt of model m, ncp is only used by the collocation schemes
+def discretize(m, wrt, scheme='BACKWARD', nfe=75, ncp=3):
+
+    if scheme in FINITE_DIFFERENCE:
+        TransformationFactory('dae.finite_difference').apply_to(m, wrt=wrt, nfe=nfe, scheme=scheme)
+    elif scheme in COLLOCATION:
+        TransformationFactory('dae.collocation').apply_to(m, wrt=wrt, nfe=nfe, ncp=ncp, scheme=scheme)
+    else:
+        raise ValueError("scheme must be one of %s, got %r" % (', '.join(FINITE_DIFFERENCE + COLLOCATION), scheme))
+
+    return
+
+# Launch, unpowered coast up to the target altitude and circularisation burn, all on the same transcription
+def defaultPhases(scheme='BACKWARD', nfe=75, ncp=3):
+
+    transcription = dict(scheme=scheme, nfe=nfe, ncp=ncp)
+
+    launch = Phase('launch', thrust=True, **transcription, tf_init=12, tf_bounds=(10, 80),
+                   initialize={'kap': 'kap_max', 'eps': 'kap_max'},
+                   initial={'x': 0.01, 'y': 0.01, 'z': 0, 'u': 0.1, 'v': 0, 'w': 0, 'the': 1.48, 'mass': 'mass0'})
+
+    coast = Phase('coast', thrust=False, **transcription, tf_init=500, tf_bounds=(200, 1000),
+                  initialize={'kap': 0, 'eps': 0, 'mpdot': 0},
+                  final={'z': 400e3})
+
+    burn = Phase('burn', thrust=True, **transcription, tf_bounds=(1, 5),
+                 bounds={'udot': ('udot_min', 'udot_max'), 'vdot': ('vdot_min', 'vdot_max'), 'wdot': ('wdot_min', 'wdot_max')},
+                 final={'u': 3350})
+
+    return [launch, coast, burn]
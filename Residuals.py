@@ -0,0 +1,279 @@
+import numpy as np
+from pyomo.environ import value
+
+import AeroDatabase as adb
+import Propulsion as prop
+import Parameters as param
+import Equations as eom
+import Atmospheric as atm
+import Dynamics as dyn
+from MAV import phaseVars, phaseDerivatives
+from Phases import LINKED_STATES
+from Utilities.Phase_Variables import phaseScaling
+from pyomo.dae.plugins.colloc import calc_cp, calc_adot, calc_afinal
+
+# NumPy twin of the MAV constraints, evaluating every rule at every node of a phase in one call
+#
+# A phase is a dict of physical arrays over its nodes named like the MAV variables and
+# derivatives ('tf' a scalar), e.g. from phaseArrays. Equality rules give lhs - rhs in the same
+# units as the Pyomo constraint body, inequality rules how far they are violated (0 if met)
+
+# Physical values of every variable of phase block b at its nodes
+def phaseArrays(mav, b):
+
+    V = {'tf': value(b.tf) * value(mav.m.tf_scale)}
+    for name in [name for name, _, _ in phaseVars] + [name for name, _ in phaseDerivatives]:
+        scale = np.prod([value(mav.m.component(scale)) for scale in phaseScaling[name]])
+        V[name] = np.array([data.value for data in b.component(name).values()], dtype=float) * scale
+
+    return V
+
+# Shared per-node terms of MAV.phaseDynamics, dispersion and aero as in Dynamics.rates
+def phaseTerms(V, thrust=True, dispersion=None, aero=None):
+
+    k = dict.fromkeys(dyn.DISPERSIONS, 1.0)
+    k.update(dispersion or {})
+    aero = aero if aero is not None else adb.default
+
+    T = {'S': param.S * k['S']}
+    T['Vsq']    = (V['u']**2) + (V['v']**2) + (V['w']**2)
+    T['Mach']   = (T['Vsq'] / (atm.gamma * atm.R_const * atm.temperature(V['z'])))**0.5
+    T['rho']    = atm.rho(V['z']) * k['rho']
+    T['qbar']   = 0.5 * T['rho'] * T['Vsq']
+    T['thrust'] = V['mpdot'] * prop.Isp * k['Isp'] * 9.81 if thrust else 0 * V['mpdot']
+    T['g']      = atm.gravity(V['z'])
+
+    # dispersed aerodynamic coefficients, named as in the MAV rules
+    T['CX'] = k['CX'] * aero.axial(T['Mach'], V['alpha'], V['beta'])
+    T['CY'] = k['CN'] * aero.normal(T['Mach'], V['beta'])
+    T['CZ'] = k['CN'] * aero.normal(T['Mach'], V['alpha'])
+    T['CM'] = k['CM'] * aero.moment(T['Mach'], V['alpha'])
+    T['CN'] = k['CM'] * aero.moment(T['Mach'], V['beta'])
+
+    q = (V['q0'], V['q1'], V['q2'], V['q3'])
+    for i in (1, 2, 3):
+        for j in (1, 2, 3):
+            T[f'Q{i}{j}'] = getattr(eom.quaternion, f'Q{i}{j}')(*q)
+
+    return T
+
+# mass change rates
+def Q_massdot(V, T, thrust, kinematics):
+
+    return V['massdot'] + V['mpdot']
+
+def Q_mpdot_coast(V, T, thrust, kinematics):
+
+    return np.maximum(V['mpdot'] - 0.01, 0)
+
+def Q_Q_max(V, T, thrust, kinematics):
+
+    return np.maximum(T['qbar'] - 2000, 0)
+
+# quaternions
+def Q_q0(V, T, thrust, kinematics):
+
+    return V['q0'] - ((np.cos(V['psi'] / 2) * np.cos(V['the'] / 2) * np.cos(V['phi'] / 2)) + (np.sin(V['psi'] / 2) * np.sin(V['the'] / 2) * np.sin(V['phi'] / 2)))
+
+def Q_q1(V, T, thrust, kinematics):
+
+    return V['q1'] - ((np.cos(V['psi'] / 2) * np.cos(V['the'] / 2) * np.sin(V['phi'] / 2)) - (np.sin(V['psi'] / 2) * np.sin(V['the'] / 2) * np.cos(V['phi'] / 2)))
+
+def Q_q2(V, T, thrust, kinematics):
+
+    return V['q2'] - ((np.cos(V['psi'] / 2) * np.sin(V['the'] / 2) * np.cos(V['phi'] / 2)) + (np.sin(V['psi'] / 2) * np.cos(V['the'] / 2) * np.sin(V['phi'] / 2)))
+
+def Q_q3(V, T, thrust, kinematics):
+
+    return V['q3'] - ((np.sin(V['psi'] / 2) * np.cos(V['the'] / 2) * np.cos(V['phi'] / 2)) - (np.cos(V['psi'] / 2) * np.sin(V['the'] / 2) * np.sin(V['phi'] / 2)))
+
+# body velocity, row i of the body to inertial transformation
+def bodyToInertial(V, T, i, kinematics):
+
+    if kinematics == 'cofactor':
+        q = (V['q0'], V['q1'], V['q2'], V['q3'])
+        Q = eom.inverse_quaternion
+        return tuple(getattr(Q, f'Q{i}{j}_prime')(*q) for j in (1, 2, 3)), Q.Q_prime(*q)
+
+    return tuple(T[f'Q{j}{i}'] for j in (1, 2, 3)), 1
+
+def Q_u(V, T, thrust, kinematics):
+
+    (a, b, c), scale = bodyToInertial(V, T, 1, kinematics)
+    return V['xdot'] * scale - ((V['u'] * a) + (V['v'] * b) + (V['w'] * c))
+
+def Q_v(V, T, thrust, kinematics):
+
+    (a, b, c), scale = bodyToInertial(V, T, 2, kinematics)
+    return V['ydot'] * scale - ((V['u'] * a) + (V['v'] * b) + (V['w'] * c))
+
+def Q_w(V, T, thrust, kinematics):
+
+    (a, b, c), scale = bodyToInertial(V, T, 3, kinematics)
+    return -V['zdot'] * scale - ((V['u'] * a) + (V['v'] * b) + (V['w'] * c))
+
+# body acceleration
+def Q_udot(V, T, thrust, kinematics):
+
+    AX = 0.5 * T['rho'] * (V['u']**2) * T['S'] * T['CX']
+    FX = (T['thrust'] * np.cos(V['kap']) * np.cos(V['eps'])) - AX if thrust else -AX
+    return V['udot'] - ((FX / V['mass']) - (V['w'] * V['q']) + (V['v'] * V['r']) + (T['Q13'] * T['g']))
+
+def Q_vdot(V, T, thrust, kinematics):
+
+    AY = 0.5 * T['rho'] * (V['v']**2) * T['S'] * T['CY']
+    FY = -(T['thrust'] * np.cos(V['kap']) * np.sin(V['eps'])) - AY if thrust else -AY
+    return V['vdot'] - ((FY / V['mass']) - (V['u'] * V['r']) + (V['w'] * V['p']) + (T['Q23'] * T['g']))
+
+def Q_wdot(V, T, thrust, kinematics):
+
+    AZ = 0.5 * T['rho'] * (V['w']**2) * T['S'] * T['CZ']
+    FZ = -(T['thrust'] * np.sin(V['kap'])) - AZ if thrust else -AZ
+    return V['wdot'] - ((FZ / V['mass']) - (V['v'] * V['p']) + (V['u'] * V['q']) + (T['Q33'] * T['g']))
+
+# body angular acceleration
+def Q_pdot(V, T, thrust, kinematics):
+
+    AL = 0.5 * T['rho'] * (V['u']**2) * T['S'] * param.l * 10e-7
+    return V['pdot'] - (((V['q'] * V['r']) * ((param.Iy - param.Iz) / param.Ix)) + AL)
+
+def Q_qdot(V, T, thrust, kinematics):
+
+    AM = 0.5 * T['rho'] * (V['v']**2) * T['S'] * param.l * T['CM']
+    MZ = (-T['thrust'] * np.sin(V['kap'])) * param.d if thrust else 0
+    return V['qdot'] - (((V['p'] * V['r']) * ((param.Iz - param.Ix) / param.Iy)) - ((MZ + AM) / param.Iy))
+
+def Q_rdot(V, T, thrust, kinematics):
+
+    AN = 0.5 * T['rho'] * (V['w']**2) * T['S'] * param.l * T['CN']
+    MY = (-T['thrust'] * np.cos(V['kap']) * np.sin(V['eps'])) * param.d if thrust else 0
+    return V['rdot'] - (((V['p'] * V['q']) * ((param.Ix - param.Iy) / param.Iz)) + ((MY + AN) / param.Iz))
+
+# body angular rates
+def Q_phidot(V, T, thrust, kinematics):
+
+    return V['p'] - (V['phidot'] - (np.sin(V['the']) * V['psidot']))
+
+def Q_thedot(V, T, thrust, kinematics):
+
+    return V['q'] - ((np.cos(V['phi']) * V['thedot']) + (np.sin(V['phi']) * np.cos(V['the']) * V['psidot']))
+
+def Q_psidot(V, T, thrust, kinematics):
+
+    return V['r'] - ((-np.sin(V['phi']) * V['thedot']) + (np.cos(V['phi']) * np.cos(V['the']) * V['psidot']))
+
+# attitude angles
+def Q_phi(V, T, thrust, kinematics):
+
+    return np.tan(V['phi']) * (V['q0']**2 - V['q1']**2 - V['q2']**2 - V['q3']**2) - (2 * (V['q2'] * V['q3'] + V['q0'] * V['q1']))
+
+def Q_the(V, T, thrust, kinematics):
+
+    return np.sin(V['the']) - (-2 * (V['q1'] * V['q3'] - V['q0'] * V['q2']))
+
+def Q_psi(V, T, thrust, kinematics):
+
+    return np.tan(V['psi']) * (V['q0']**2 + V['q1']**2 - V['q2']**2 - V['q3']**2) - (2 * (V['q1'] * V['q2'] + V['q0'] * V['q3']))
+
+# derivatives wrt normalised time, the rate of the state stretched by the phase duration
+def derivativeRule(derivative, rate):
+
+    def rule(V, T, thrust, kinematics):
+        return V[derivative] - V[rate] * V['tf']
+
+    return rule
+
+RULES = {name: rule for name, rule in globals().items() if name.startswith('Q_')}
+for derivative, state in phaseDerivatives:
+    RULES['Q_' + derivative] = derivativeRule(derivative, state + 'dot')
+
+# Collocation points of an element on [0, 1] (element start first), the weights of the state
+# at those points in the derivative at each collocation point, and for Legendre the weights of
+# the element end value, as pyomo.dae computes them
+def collocationWeights(scheme, ncp):
+
+    if scheme == 'LAGRANGE-RADAU':
+        tau = [0.0] + calc_cp(1, 0, ncp - 1) + [1.0]
+        afinal = None
+    else:
+        tau = [0.0] + calc_cp(0, 0, ncp)
+        afinal = np.array(calc_afinal(tau))
+
+    # adot[j][i] weighs node j in the derivative at node i
+    D = np.array(calc_adot(tau, 1)).T[1:]
+
+    return np.array(tau), D, afinal
+
+# Residuals of the pyomo.dae discretization equations of a phase, named like the Pyomo
+# constraints, each at the nodes Pyomo writes the equation for
+def transcriptionResiduals(V, t, scheme='BACKWARD', ncp=3):
+
+    t = np.asarray(t, dtype=float)
+    R = {}
+
+    for derivative, state in phaseDerivatives:
+        x, dx = V[state], V[derivative]
+
+        if scheme == 'BACKWARD':
+            R[derivative + '_disc_eq'] = dx[1:] - np.diff(x) / np.diff(t)
+        elif scheme == 'FORWARD':
+            R[derivative + '_disc_eq'] = dx[:-1] - np.diff(x) / np.diff(t)
+        elif scheme == 'CENTRAL':
+            R[derivative + '_disc_eq'] = dx[1:-1] - (x[2:] - x[:-2]) / (t[2:] - t[:-2])
+
+        else:
+            # element k spans nodes k * width to k * width + ncp, Legendre elements also end in a
+            # node outside the collocation points that continuity ties to the interpolant
+            width = ncp if scheme == 'LAGRANGE-RADAU' else ncp + 1
+            _, D, afinal = collocationWeights(scheme, ncp)
+            starts = np.arange(0, len(t) - 1, width)
+            nodes = starts[:, None] + np.arange(ncp + 1)[None, :]
+            h = t[starts + width] - t[starts]
+
+            R[derivative + '_disc_eq'] = (dx[nodes[:, 1:]] - np.einsum('ij,kj->ki', D, x[nodes]) / h[:, None]).ravel()
+            if afinal is not None:
+                R[state + '_t_cont_eq'] = x[starts + width] - x[nodes] @ afinal
+
+    return R
+
+# Residuals of every rule of phase (a Phases.Phase) and of its discretization
+def phaseResiduals(V, phase, t, kinematics='transpose', dispersion=None, aero=None):
+
+    T = phaseTerms(V, phase.thrust, dispersion, aero)
+    R = {name + '_Con': RULES[name](V, T, phase.thrust, kinematics) for name in phase.dynamics}
+    if not phase.thrust:
+        R['Q_mpdot_coast_Con'] = Q_mpdot_coast(V, T, phase.thrust, kinematics)
+    R.update(transcriptionResiduals(V, t, phase.scheme, phase.ncp))
+
+    return R
+
+# Residuals of every constraint of the MAV model at its current values, per phase block index,
+# boundary conditions of a phase under 'initial'/'final' and the phase linkage under 'linkage'
+def residuals(mav):
+
+    result = {}
+    arrays = {}
+    for n, phase in enumerate(mav.phases, 1):
+        b = mav.m.phase[n]
+        V = arrays[n] = phaseArrays(mav, b)
+        R = phaseResiduals(V, phase, list(b.t), mav.kinematics, mav.dispersion(), mav.aero)
+        R['initial'] = np.array([V[name][0] - mav.physical(setting) for name, setting in phase.initial.items()])
+        R['final'] = np.array([V[name][-1] - mav.physical(setting) for name, setting in phase.final.items()])
+        result[n] = R
+
+    result['linkage'] = np.array([[arrays[n][state][-1] - arrays[n + 1][state][0] for state in LINKED_STATES]
+                                  for n in range(1, len(mav.phases))])
+
+    return result
+
+# Largest absolute residual of every constraint in a residuals() result
+def maxResiduals(result):
+
+    flat = {}
+    for key, R in result.items():
+        if isinstance(R, dict):
+            flat.update({f'phase[{key}].{name}': float(np.max(np.abs(r))) if np.size(r) else 0.0 for name, r in R.items()})
+        else:
+            flat[key] = float(np.max(np.abs(R))) if np.size(R) else 0.0
+
+    return flat
@@ -0,0 +1,58 @@
+import numpy as np
+
+# Mask of the rows of objectives (one column per maximised objective) no other row dominates
+def nondominated(objectives):
+
+    objectives = np.asarray(objectives, dtype=float)
+    better = (objectives[:, None, :] >= objectives[None, :, :]).all(axis=2)
+    strictly = (objectives[:, None, :] > objectives[None, :, :]).any(axis=2)
+
+    return ~(better & strictly).any(axis=0)
+
+# Area dominated by a set of two-objective points (both maximised) above the reference point
+def hypervolume(objectives, reference):
+
+    objectives = np.asarray(objectives, dtype=float).reshape(-1, 2)
+    objectives = objectives[(objectives >= reference).all(axis=1)]
+    if not len(objectives):
+        return 0.0
+
+    # sweep the non-dominated points by decreasing first objective, each adds a strip above the last
+    objectives = objectives[nondominated(objectives)]
+    objectives = objectives[np.argsort(-objectives[:, 0])]
+    heights = np.diff(np.concatenate([[reference[1]], objectives[:, 1]]))
+
+    return float(np.sum((objectives[:, 0] - reference[0]) * heights))
+
+# Store the solved points of a Pareto sweep
+class ParetoFront():
+
+    def __init__(self):
+
+        self.points = []
+
+        return
+
+    def add(self, point):
+
+        # keep the points in weighting order whatever order they were solved in
+        self.points.append(point)
+        self.points.sort(key=lambda point: point['index'])
+
+        return point
+
+    def values(self, key):
+
+        return [point[key] for point in self.points]
+
+    def archive(self, keys=('final_mass', 'final_downrange')):
+
+        # converged points that no other converged point beats in every objective
+        points = [point for point in self.points if point.get('termination', 'optimal') == 'optimal']
+        objectives = np.array([[point[key] for key in keys] for point in points], dtype=float).reshape(-1, len(keys))
+
+        return [point for point, keep in zip(points, nondominated(objectives)) if keep]
+
+    def hypervolume(self, reference, keys=('final_mass', 'final_downrange')):
+
+        return hypervolume([[point[key] for key in keys] for point in self.archive(keys)], reference)
@@ -0,0 +1,46 @@
+from pyomo.environ import SolverFactory
+
+# IPOPT through the persistent APPSI interface, with the call signature of SolverFactory('ipopt')
+#
+# The model is handed to the APPSI writer once and kept in memory, later solves of the same
+# model only push changed mutable Params and variable values/bounds before IPOPT is started
+class PersistentIpopt():
+
+    def __init__(self, fixed_structure=True):
+
+        self.solver = SolverFactory('appsi_ipopt')
+
+        # same options dict as the legacy interface, e.g. solver.options['tol'] = 1e-6
+        self.options = self.solver.options
+
+        # sweeps only change Params and the starting point, skip looking for new components
+        if fixed_structure:
+            config = self.solver.update_config
+            config.check_for_new_or_removed_constraints = False
+            config.check_for_new_or_removed_vars = False
+            config.check_for_new_or_removed_params = False
+            config.check_for_new_objective = False
+            config.update_constraints = False
+            config.update_named_expressions = False
+            config.update_objective = False
+
+        return
+
+    def available(self, exception_flag=False):
+
+        try:
+            return bool(self.solver.available(exception_flag=exception_flag))
+        except Exception:
+            if exception_flag:
+                raise
+            return False
+
+    def solve(self, model, tee=False, keepfiles=False, logfile=None, **kwds):
+
+        # APPSI has no logfile argument, IPOPT writes the same log itself
+        if logfile is not None:
+            self.options['output_file'] = logfile
+        else:
+            self.options.pop('output_file', None)
+
+        return self.solver.solve(model, tee=tee, keepfiles=keepfiles, **kwds)
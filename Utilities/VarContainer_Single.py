@@ -11,7 +11,7 @@ class VarContainer():
 
 
         # time
-        self.t1 = m.t1 
+        self.t1 = list(m.t1)
 
         self.time1 = np.dot(m.t1,m.tf1() * m.tf_scale)
 
@@ -0,0 +1,63 @@
+import os
+import numpy as np
+from pyomo.environ import Var
+from pyomo.dae import ContinuousSet
+
+from Utilities.loadOptimizationVariables import loadProfiles
+
+# Solved cases kept on disk as one compressed .npz snapshot each
+#
+# A snapshot holds every time grid and one array per variable, keyed by component name, so any
+# later model (another nfe or scheme, another process) can be warm started from it in one pass
+class WarmStartStore():
+
+    def __init__(self, directory='warm_starts'):
+
+        self.directory = os.path.abspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+        return
+
+    def path(self, key):
+
+        return os.path.join(self.directory, f'{key}.npz')
+
+    def __contains__(self, key):
+
+        return os.path.exists(self.path(key))
+
+    def keys(self):
+
+        return sorted(name[:-len('.npz')] for name in os.listdir(self.directory) if name.endswith('.npz'))
+
+    def save(self, key, mav):
+
+        arrays = {}
+        for grid in mav.m.component_objects(ContinuousSet, active=True):
+            arrays['grid.' + grid.name] = np.array(list(grid), dtype=float)
+        for myVar in mav.m.component_objects(Var, active=True):
+            arrays['var.' + myVar.name] = np.array([data.value for data in myVar.values()], dtype=float)
+
+        # write to a private file first so a reader never sees a partial snapshot
+        temp = f'{self.path(key)}.{os.getpid()}.tmp'
+        with open(temp, 'wb') as snapshot:
+            np.savez_compressed(snapshot, **arrays)
+        os.replace(temp, self.path(key))
+
+        return self.path(key)
+
+    def load(self, key, mav):
+
+        grids = {}
+        profiles = {}
+        with np.load(self.path(key)) as snapshot:
+            for name in snapshot.files:
+                kind, _, component = name.partition('.')
+                if kind == 'grid':
+                    grids[component] = snapshot[name]
+                else:
+                    profiles[component] = snapshot[name]
+
+        loadProfiles(mav, grids, profiles)
+
+        return
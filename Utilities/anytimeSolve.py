@@ -0,0 +1,145 @@
+import re
+import time
+import numpy as np
+from pyomo.environ import Var, Constraint, value, maximize
+from pyomo.opt import SolverResults, SolverStatus, TerminationCondition
+
+from Utilities.saveOptimizationDuals import saveOptimizationDuals
+from Utilities.loadOptimizationDuals import loadOptimizationDuals
+from Utilities.guardedSolve import guardedSolve
+
+# Terminations of a chunk after which IPOPT can be restarted where it stopped
+CONTINUE = (TerminationCondition.maxIterations, TerminationCondition.maxTimeLimit)
+CONVERGED = (TerminationCondition.optimal, TerminationCondition.locallyOptimal)
+
+# iteration line of an IPOPT log, restoration iterations (number ending in r) left out, lg(mu) is
+# the fifth column
+ITERATION = re.compile(r'^\s*\d+\s+\S+\s+\S+\s+\S+\s+(-?\d+\.\d+)\s')
+
+# Barrier parameter of the last regular iteration in the IPOPT log logfile, None without one
+def barrierParameter(logfile):
+
+    lg_mu = None
+    try:
+        with open(logfile) as log:
+            for line in log:
+                match = ITERATION.match(line)
+                if match:
+                    lg_mu = float(match.group(1))
+    except OSError:
+        return None
+
+    return 10**lg_mu if lg_mu is not None else None
+
+# Largest violation of any active constraint at the current point, inf where it cannot be evaluated
+def infeasibility(mav):
+
+    worst = 0.0
+    for con in mav.m.component_data_objects(Constraint, active=True):
+        body = value(con.body, exception=False)
+        if body is None or not np.isfinite(body):
+            return np.inf
+        if con.has_lb():
+            worst = max(worst, value(con.lower) - body)
+        if con.has_ub():
+            worst = max(worst, body - value(con.upper))
+
+    return worst
+
+# Solve with a wall-clock budget, returning the best iterate seen when time runs out
+#
+# IPOPT runs in chunks of at most chunk iterations, each restarted from the primal and dual
+# point the last one stopped at (solverFunction(warm_start=...) as createSolver) with the barrier
+# parameter it had reached, read from the chunk's log in logfile, and limited to the wall time
+# left of the budget. After every chunk the iterate is checked: a feasible point (infeasibility
+# <= feas_tol) beats an infeasible one, feasible points are ranked by objective and infeasible
+# ones by infeasibility. The run ends when IPOPT converges, the budget is spent, IPOPT fails (its
+# point is not loaded, the best earlier one is kept) or the infeasibility stalls (not below
+# stall_ratio of its value stall_chunks chunks earlier).
+#
+# The best iterate is left in the model. Returns results as a solver would (feasible when the
+# best point is feasible but not converged, the reason in results.solver.message) and a report
+# with the elapsed time, the best point and the per-chunk history
+def anytimeSolve(mav, solverFunction, budget, chunk=50, feas_tol=1e-6, stall_chunks=3, stall_ratio=0.9, tee=False,
+                 logfile='anytime_ipopt.log'):
+
+    started = time.monotonic()
+    deadline = started + budget
+    if mav.m.component('dual') is None:
+        mav.addWarmStartSuffixes()
+    sense = 1 if mav.m.objective.sense == maximize else -1
+
+    best = None
+    myDuals = None
+    mu = None
+    history = []
+    reason = 'budget'
+    termination = TerminationCondition.maxTimeLimit
+
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+
+        # a restart goes on from the barrier parameter the last chunk reached, not from the
+        # mu_init of a warm start from a converged point
+        solver = solverFunction(warm_start=myDuals is not None)
+        solver.options['max_iter'] = chunk
+        solver.options['max_wall_time'] = remaining
+        if myDuals is not None:
+            loadOptimizationDuals(mav, myDuals)
+            if mu is not None:
+                solver.options['mu_init'] = mu
+
+        results = guardedSolve(solver, mav.m, tee=tee, logfile=logfile)
+        termination = results.solver.termination_condition
+        if termination not in CONVERGED + CONTINUE:
+            reason = 'failed'
+            break
+        myDuals = saveOptimizationDuals(mav)
+        mu = barrierParameter(logfile)
+
+        # rank the iterate, (feasible, objective or -infeasibility), larger is better
+        violation = infeasibility(mav)
+        feasible = violation <= feas_tol
+        objective = value(mav.m.objective, exception=False)
+        rank = (True, sense * objective) if feasible and objective is not None else (False, -violation)
+        history.append({'chunk': len(history), 'termination': str(termination), 'infeasibility': violation,
+                        'objective': objective, 'time': time.monotonic() - started})
+
+        if best is None or rank > best['rank']:
+            best = {'rank': rank, 'feasible': feasible, 'infeasibility': violation, 'objective': objective,
+                    'chunk': len(history) - 1, 'termination': termination,
+                    'values': [(data, data.value) for data in mav.m.component_data_objects(Var, active=True)],
+                    'duals': myDuals}
+
+        if termination in CONVERGED:
+            reason = 'converged'
+            break
+        if not feasible and len(history) > stall_chunks and violation > stall_ratio * history[-1 - stall_chunks]['infeasibility']:
+            reason = 'stalled'
+            break
+
+    elapsed = time.monotonic() - started
+
+    outcome = SolverResults()
+    outcome.solver.status = SolverStatus.ok if best is not None and best['feasible'] else SolverStatus.aborted
+    outcome.solver.termination_condition = termination
+    outcome.solver.message = reason
+    outcome.solver.wallclock_time = elapsed
+
+    # put the best iterate back, the last chunk need not have produced it
+    if best is not None:
+        for data, setting in best['values']:
+            data.set_value(setting, skip_validation=True)
+        if best['termination'] in CONVERGED:
+            outcome.solver.termination_condition = best['termination']
+        elif best['feasible']:
+            outcome.solver.termination_condition = TerminationCondition.feasible
+    print(f"Anytime solve {reason} after {elapsed:.1f} s of {budget} s, {len(history)} chunks")
+
+    report = {'reason': reason, 'elapsed': elapsed, 'history': history}
+    if best is not None:
+        report.update({key: best[key] for key in ('feasible', 'infeasibility', 'objective', 'chunk')})
+
+    return outcome, report
@@ -0,0 +1,124 @@
+import numpy as np
+from pyomo.environ import value
+
+from Utilities.ParetoFront import ParetoFront, nondominated, hypervolume
+from Utilities.WarmStartStore import WarmStartStore
+from Utilities.guardedSolve import guardedSolve
+
+# Solve mav at its current weights for range >= range_min, starting from snapshot start if given,
+# a solve IPOPT fails is recorded with its error status and the sweep goes on
+def solveSubproblem(mav, solver, store, key, range_min, start=None):
+
+    if start is not None:
+        store.load(start, mav)
+    mav.m.range_min.set_value(range_min)
+
+    results = guardedSolve(solver, mav.m, tee=True)
+    store.save(key, mav)
+
+    return {'key': key, 'range_min': range_min,
+            'mass_objective': value(mav.m.mass), 'range_objective': value(mav.m.range),
+            'status': str(results.solver.status),
+            'termination': str(results.solver.termination_condition)}
+
+# Turning angle of a polyline at each of its points, 0 at both ends and where it runs straight
+def bends(points):
+
+    steps = np.diff(points, axis=0)
+    lengths = np.linalg.norm(steps, axis=1)
+    lengths[lengths == 0] = 1
+    cosines = np.sum(steps[:-1] * steps[1:], axis=1) / (lengths[:-1] * lengths[1:])
+
+    return np.concatenate([[0], np.arccos(np.clip(cosines, -1, 1)), [0]])
+
+# Pareto front of final mass against range from the two anchors and epsilon-constraint solves
+#
+# The anchors maximise mass and range alone (weights (1, 0) and (0, 1) of the weighted-product
+# objective), every other point maximises mass subject to range >= range_min. On the front
+# normalised by the anchors, the next bound goes in the middle of the gap between neighbouring
+# non-dominated points with the largest length weighted by the bend at its ends, so solves go to
+# wide gaps and to the knee. The sweep stops once a point adds less than hv_tol to the normalised
+# hypervolume, no gap is wider than spacing or npoints are solved.
+# Each subproblem starts from the snapshot of the neighbour above its bound, the nearest solved
+# point that is already feasible for it. Without both anchors converged the front cannot be
+# normalised, the sweep then stops after the anchors
+def epsilonConstraintFront(mav, solver, extractFunction, npoints=15, spacing=0.02, hv_tol=1e-3, store=None):
+
+    store = store if store is not None else WarmStartStore()
+    solved = []
+
+    # anchors, range_min at 0 leaves the bound inactive
+    for n, (W_Obj1, W_Obj2) in enumerate([(1, 0), (0, 1)]):
+        mav.m.W_Obj1.set_value(W_Obj1)
+        mav.m.W_Obj2.set_value(W_Obj2)
+        point = solveSubproblem(mav, solver, store, f'epsilon_{n}', 0)
+        point.update({'W_Obj1': W_Obj1, 'W_Obj2': W_Obj2})
+        point.update(extractFunction(mav))
+        solved.append(point)
+
+    mav.m.W_Obj1.set_value(1)
+    mav.m.W_Obj2.set_value(0)
+
+    failed = [point['key'] for point in solved if point['termination'] != 'optimal']
+    if failed:
+        print(f"Epsilon-constraint anchor {', '.join(failed)} did not converge, no front points are solved")
+
+    # the anchors span the front, mass at its best on the left and range on the right
+    lower = np.array([solved[1]['mass_objective'], solved[0]['range_objective']])
+    upper = np.array([solved[0]['mass_objective'], solved[1]['range_objective']])
+    scale = np.where(upper - lower > 0, upper - lower, 1)
+
+    def normalised(points):
+        return (np.array([[point['mass_objective'], point['range_objective']] for point in points]).reshape(-1, 2) - lower) / scale
+
+    # a gap between two neighbours is only bisected once, a failed solve leaves it open
+    tried = set()
+    area = hypervolume(normalised([point for point in solved if point['termination'] == 'optimal']), np.zeros(2))
+    for point in solved:
+        point['hypervolume'] = area
+
+    while not failed and len(solved) < npoints:
+
+        # non-dominated archive of the converged points, ordered along the front
+        converged = [point for point in solved if point['termination'] == 'optimal']
+        front = [point for point, keep in zip(converged, nondominated(normalised(converged))) if keep]
+        front.sort(key=lambda point: point['range_objective'])
+
+        objectives = normalised(front)
+        gaps = np.linalg.norm(np.diff(objectives, axis=0), axis=1)
+        angle = bends(objectives) if len(front) > 1 else np.zeros(len(front))
+        score = gaps * (1 + (angle[:-1] + angle[1:]) / np.pi)
+        score[[(left['key'], right['key']) in tried for left, right in zip(front[:-1], front[1:])]] = 0
+        score[gaps <= spacing] = 0
+
+        if not len(score) or score.max() <= 0:
+            break
+
+        widest = int(np.argmax(score))
+        left, right = front[widest], front[widest + 1]
+        tried.add((left['key'], right['key']))
+
+        range_min = 0.5 * (left['range_objective'] + right['range_objective'])
+        point = solveSubproblem(mav, solver, store, f'epsilon_{len(solved)}', range_min, start=right['key'])
+        point.update({'W_Obj1': 1, 'W_Obj2': 0})
+        point.update(extractFunction(mav))
+        solved.append(point)
+
+        # hypervolume gained by the new point, a converged point adding next to nothing ends the sweep
+        converged = [point for point in solved if point['termination'] == 'optimal']
+        gain = hypervolume(normalised(converged), np.zeros(2)) - area
+        area += gain
+        point['hypervolume'] = area
+        print(f"Epsilon-constraint point range >= {range_min:.6g}: {point['termination']}, hypervolume {area:.6g} (+{gain:.3g})")
+
+        if point['termination'] == 'optimal' and gain < hv_tol:
+            break
+
+    # number the points along the front, from the mass anchor to the range anchor
+    paretoFront = ParetoFront()
+    for index, point in enumerate(sorted(solved, key=lambda point: point['range_objective'])):
+        point['index'] = index
+        point['snapshot'] = store.path(point['key'])
+        paretoFront.add(point)
+
+    return paretoFront
@@ -0,0 +1,41 @@
+import copy
+from pyomo.opt import TerminationCondition
+
+from Phases import defaultPhases
+from Utilities.saveOptimizationVariables import saveOptimizationVariables
+from Utilities.loadOptimizationVariables import loadOptimizationVariables
+from Utilities.guardedSolve import guardedSolve
+
+# Solve on a chain of grids from coarse to fine, every grid starts from the interpolated
+# solution of the previous one so the production grid is reached from a near-converged point.
+# A stage that does not converge is not carried forward, the next grid starts from the last
+# converged stage or from its own initial guess
+#
+# buildFunction(phases=..., **buildArgs) builds the model, nfes are the elements per phase of each stage
+def gridSequence(buildFunction, solverFunction, nfes=(15, 30, 75), phases=None, buildArgs=None):
+
+    phases = phases if phases is not None else defaultPhases()
+    solver = solverFunction()
+    myPyomoVars = None
+    history = []
+
+    for nfe in nfes:
+
+        staged = []
+        for phase in phases:
+            phase = copy.copy(phase)
+            phase.nfe, phase.mesh = nfe, None
+            staged.append(phase)
+
+        mav = buildFunction(**dict(buildArgs or {}, phases=staged))
+        if myPyomoVars is not None:
+            loadOptimizationVariables(mav, myPyomoVars)
+
+        results = guardedSolve(solver, mav.m, tee=True)
+        print(f"Grid sequence nfe={nfe}: {results.solver.termination_condition}")
+
+        history.append({'nfe': nfe, 'termination': str(results.solver.termination_condition)})
+        if results.solver.termination_condition == TerminationCondition.optimal:
+            _, myPyomoVars = saveOptimizationVariables(mav)
+
+    return mav, history
@@ -0,0 +1,34 @@
+from pyomo.environ import SolverStatus, TerminationCondition
+from pyomo.opt import SolverResults
+from pyomo.common.errors import ApplicationError
+
+from Utilities.PersistentIpopt import PersistentIpopt
+
+# statuses whose solution is loaded into the model
+LOADABLE = (SolverStatus.ok, SolverStatus.warning)
+
+# Solve model without letting a failed solve raise
+#
+# The legacy interface loads the solution by default and raises on an error status, so it
+# solves with load_solutions=False and only loads ok and warning solutions. APPSI returns no
+# solution to load afterwards and raises itself when it has none, so it is solved as usual and
+# its errors caught. A solve that raises returns results with an error status and the message,
+# the model keeps the values it had
+def guardedSolve(solver, model, **kwds):
+
+    try:
+        if isinstance(solver, PersistentIpopt):
+            return solver.solve(model, **kwds)
+
+        results = solver.solve(model, load_solutions=False, **kwds)
+        if results.solver.status in LOADABLE and len(results.solution):
+            model.solutions.load_from(results)
+        return results
+
+    except (ApplicationError, RuntimeError, ValueError) as error:
+        results = SolverResults()
+        results.solver.status = SolverStatus.error
+        results.solver.termination_condition = TerminationCondition.error
+        results.solver.message = str(error)
+        print(f"Solve failed: {error}")
+        return results
@@ -0,0 +1,219 @@
+import numpy as np
+from scipy.integrate import solve_ivp
+from pyomo.environ import Var, value
+from pyomo.dae import DerivativeVar
+
+import Dynamics as dyn
+
+# Flight path angle in the pitch plane, the body pitch at which the velocity has no w component
+def flightPath(t, state):
+
+    return state[dyn.STATES.index('the')] - np.arctan2(state[dyn.STATES.index('w')], state[dyn.STATES.index('u')])
+
+# Pitch reference of a gravity turn: kick the pitch down from the_start over t_kick, then
+# follow the flight path so gravity turns the trajectory over at small w
+def pitchKick(the_start, kick=0.3, t_kick=3):
+
+    def reference(t, state):
+        if t < t_kick:
+            return the_start - kick * t / t_kick
+        return flightPath(t, state)
+
+    return reference
+
+# Gimbal law tracking a pitch reference with a PD loop on the pitch error and pitch rate,
+# at a constant propellant flow
+def gimbalLaw(reference, mpdot, kap_max, gain=0.5, damping=0.8):
+
+    def law(t, state):
+        error = state[dyn.STATES.index('the')] - reference(t, state)
+        kap = np.clip(gain * error + damping * state[dyn.STATES.index('q')], -kap_max, kap_max)
+        return np.array([kap, 0, mpdot, 0, 0])
+
+    return law
+
+# Law shifting the pitch gimbal angle of law by kap (clipped to its bounds) and replacing
+# its propellant flow by mpdot
+def biasedLaw(law, kap, mpdot, kap_bounds):
+
+    def biased(t, state):
+        control = np.array(law(t, state), dtype=float)
+        control[0] = np.clip(control[0] + kap, *kap_bounds)
+        control[2] = mpdot
+        return control
+
+    return biased
+
+# Unpowered flight with the gimbal centred
+def coast(t, state):
+
+    return np.zeros(len(dyn.CONTROLS))
+
+# Coast phases end where the climb stops
+def apoapsis(t, state):
+
+    return dyn.rates(state, coast(t, state), thrust=False)['zdot']
+
+apoapsis.terminal = True
+apoapsis.direction = -1
+
+# Powered phases end once the mass is down to mass_min
+def burnout(mass_min):
+
+    def event(t, state):
+        return state[dyn.STATES.index('mass')] - mass_min
+
+    event.terminal = True
+    event.direction = -1
+
+    return event
+
+# Any phase ends when the vehicle falls a metre below the launch altitude
+def impact(t, state):
+
+    return state[dyn.STATES.index('z')] + 1
+
+impact.terminal = True
+impact.direction = -1
+
+# Lowest physical mass the bounds of phase block b allow
+def lowestMass(mav, b):
+
+    bounds = [data.lb for data in b.mass.values() if data.lb is not None]
+
+    return min(bounds) * value(mav.m.mass_scale) if bounds else 0.0
+
+# Gravity turn launch, coast to apoapsis and a final burn along the flight path, one law per phase of mav
+def defaultSchedule(mav):
+
+    kap_max = value(mav.m.kap_max)
+    mpdot_max = value(mav.m.mpdot_max)
+
+    laws = []
+    for n, phase in enumerate(mav.phases):
+        if not phase.thrust:
+            laws.append(coast)
+        elif n == 0:
+            laws.append(gimbalLaw(pitchKick(mav.physical(phase.initial.get('the', np.pi / 2))), mpdot_max, kap_max))
+        else:
+            laws.append(gimbalLaw(flightPath, mpdot_max, kap_max))
+
+    return laws
+
+# Physical duration of phase n, the midpoint of its bounds if tf has no initial value
+def phaseDuration(mav, n):
+
+    tf = mav.m.phase[n].tf
+    if tf.value is not None:
+        return value(tf * mav.m.tf_scale)
+
+    return 0.5 * (tf.lb + tf.ub) * value(mav.m.tf_scale)
+
+# Integrate the 6-DoF equations through every phase under the control laws, returns per
+# phase the physical value of every phase variable at the nodes of its time set
+def forwardSimulate(mav, laws=None):
+
+    laws = laws if laws is not None else defaultSchedule(mav)
+    dispersion = mav.dispersion()
+
+    # the first phase starts from its initial conditions, every later one where the last ended
+    first = mav.phases[0].initial
+    state = np.array([mav.physical(first.get(name, 0)) for name in dyn.STATES], dtype=float)
+
+    profiles = []
+    landed = False
+    for n, (phase, law) in enumerate(zip(mav.phases, laws), 1):
+        b = mav.m.phase[n]
+        duration = phaseDuration(mav, n)
+        longest = b.tf.ub * value(mav.m.tf_scale)
+        t = np.array(list(b.t)) * duration
+
+        # nothing is left to fly after an impact, later phases hold the state it ended in
+        if landed:
+            states = np.repeat(state[:, None], len(t), axis=1)
+
+        else:
+            # coasts run at most their longest duration and stop at apoapsis, burns stop when the
+            # propellant is spent and any phase on impact, a diverging guess is reported and cut
+            # short rather than raised
+            events = [burnout(lowestMass(mav, b)) if phase.thrust else apoapsis, impact]
+            with np.errstate(all='ignore'):
+                sol = solve_ivp(lambda t, s: dyn.derivatives(s, law(t, s), phase.thrust, dispersion, mav.aero), (0, duration if phase.thrust else longest), state,
+                                method='LSODA', dense_output=True, events=events, rtol=1e-6, atol=1e-9)
+            if not sol.success:
+                print(f"Forward simulation of phase {phase.name} stopped: {sol.message}")
+            if not phase.thrust and len(sol.t_events[0]):
+                duration = float(np.clip(sol.t_events[0][0], b.tf.lb * value(mav.m.tf_scale), longest))
+                t = np.array(list(b.t)) * duration
+            landed = len(sol.t_events[1]) > 0
+
+            # hold the last finite state when the integration ends early
+            finite = np.isfinite(sol.y).all(axis=0)
+            last = len(finite) - 1 if finite.all() else max(np.argmin(finite) - 1, 0)
+            held = t >= sol.t[last]
+            states = sol.sol(np.minimum(t, sol.t[last]))
+            states[:, held] = sol.y[:, [last]]
+
+        controls = np.array([law(ti, s) for ti, s in zip(t, states.T)]).T
+
+        profile = dict(zip(dyn.STATES, states))
+        profile.update(zip(dyn.CONTROLS, controls))
+        profile.update(dyn.rates(states, controls, phase.thrust, dispersion, mav.aero))
+        profile['tf'] = duration
+
+        profiles.append(profile)
+        state = states[:, -1]
+
+    return profiles
+
+# Write a physical profile onto variable myVar of phase block b, clipped into its bounds,
+# and return the physical values it now holds
+def writeProfile(mav, b, myVar, physical):
+
+    name = myVar.local_name
+    scaled = np.broadcast_to(mav.scaled(name, np.asarray(physical, dtype=float)), (len(b.t),))
+
+    for data, x in zip(myVar.values(), scaled.tolist()):
+        lower = data.lb if data.lb is not None else -np.inf
+        upper = data.ub if data.ub is not None else np.inf
+        data.set_value(min(max(x, lower), upper))
+
+    return np.array([data.value for data in myVar.values()]) / mav.scaled(name, 1.0)
+
+# Write simulated profiles onto the phase variables
+#
+# States and controls are clipped into their bounds first and every rate is evaluated again
+# from the clipped values, so the algebraic equations hold wherever the rates stay inside
+# their bounds and mostly the discretized dynamics carry what the clipping changed
+def writeProfiles(mav, profiles):
+
+    for b, phase, profile in zip(mav.m.phase.values(), mav.phases, profiles):
+        b.tf.set_value(mav.scaled('tf', profile['tf']))
+        tf = value(b.tf * mav.m.tf_scale)
+
+        states = [writeProfile(mav, b, b.component(name), profile[name]) for name in dyn.STATES]
+        controls = [writeProfile(mav, b, b.component(name), profile[name]) for name in dyn.CONTROLS]
+        rate = dyn.rates(states, controls, phase.thrust, mav.dispersion(), mav.aero)
+
+        # algebraic variables first, the derivatives then follow the rates they were clipped to
+        derivatives = []
+        for myVar in b.component_objects(Var, descend_into=False):
+            name = myVar.local_name
+            if isinstance(myVar, DerivativeVar):
+                derivatives.append(myVar)
+            elif name in rate:
+                rate[name] = writeProfile(mav, b, myVar, rate[name])
+
+        # derivatives wrt normalised time are the rates stretched by the phase duration
+        for myVar in derivatives:
+            writeProfile(mav, b, myVar, rate[myVar.get_state_var().local_name + 'dot'] * tf)
+
+    return
+
+# Initial guess of every phase variable from a forward simulation of the 6-DoF equations
+def initialGuess(mav, laws=None):
+
+    profiles = forwardSimulate(mav, laws)
+    writeProfiles(mav, profiles)
+
+    return profiles
@@ -0,0 +1,19 @@
+from pyomo.environ import *
+from pyomo.dae import *
+
+
+# For warm start, feed the multipliers of a previous solve back to IPOPT
+def loadOptimizationDuals(mav, myDuals):
+
+    for mySuffixOut, mySuffixIn, ctype in [('ipopt_zL_out', 'ipopt_zL_in', Var),
+                                           ('ipopt_zU_out', 'ipopt_zU_in', Var),
+                                           ('dual', 'dual', Constraint)]:
+        values = myDuals.get(mySuffixOut, {})
+        suffix = mav.m.component(mySuffixIn)
+        if suffix is None:
+            continue
+        for component in mav.m.component_data_objects(ctype, active=True):
+            if component.name in values:
+                suffix[component] = values[component.name]
+
+    return
@@ -2,14 +2,60 @@ from pyomo.environ import *
 from pyomo.dae import *
 import numpy as np
 
-# For warm start
-def loadOptimizationVariables(mav, myPyomoVars):
+# Linear interpolation of every row of values from grid t onto grid tau in one step
+def interpolateProfiles(t, values, tau):
+
+    t = np.asarray(t, dtype=float)
+    tau = np.clip(np.asarray(tau, dtype=float), t[0], t[-1])
+
+    # left node and weight of each new point are shared by all rows
+    k = np.clip(np.searchsorted(t, tau, side='right') - 1, 0, len(t) - 2)
+    weight = (tau - t[k]) / (t[k + 1] - t[k])
+
+    return values[:, k] * (1 - weight) + values[:, k + 1] * weight
 
+# Set the variables of mav from stored profiles in one pass
+#
+# grids maps a continuous set name to its points, profiles a variable name to its values on
+# that grid (or to a single value), variables missing from profiles are left untouched
+def loadProfiles(mav, grids, profiles):
+
+    # group the time indexed variables by their continuous set, one interpolation per phase
+    indexed = {}
     for myVar in mav.m.component_objects(Var, active=True):
-        print("Initializing Variable: ", myVar)
+        if myVar.name not in profiles:
+            continue
         if len(myVar) == 1:
-            myVar.set_value(myPyomoVars[myVar.name]())
+            myVar.set_value(float(np.asarray(profiles[myVar.name]).ravel()[0]))
         else:
-            myVar.set_values(dict(zip(list(myVar.index_set()), np.interp(myVar.index_set(), list(myPyomoVars[myVar.index_set().getname()]), myPyomoVars[myVar.name][:]()))))
+            indexed.setdefault(myVar.index_set().name, []).append(myVar)
+
+    for setName, myVars in indexed.items():
+        print("Initializing %d variables on %s" % (len(myVars), setName))
+
+        # components indexed by a continuous set iterate their data in time order
+        tau = list(myVars[0].index_set())
+        values = np.array([profiles[myVar.name] for myVar in myVars], dtype=float)
+        if np.isnan(values).any():
+            raise ValueError("warm start profile on %s has uninitialized values" % setName)
+
+        for myVar, row in zip(myVars, interpolateProfiles(grids[setName], values, tau)):
+            for data, x in zip(myVar.values(), row.tolist()):
+                data.set_value(x)
+
+    return
+
+# For warm start
+def loadOptimizationVariables(mav, myPyomoVars):
+
+    grids = {}
+    profiles = {}
+    for name, component in myPyomoVars.items():
+        if isinstance(component, ContinuousSet):
+            grids[name] = list(component)
+        else:
+            profiles[name] = [data.value for data in component.values()]
+
+    loadProfiles(mav, grids, profiles)
 
     return
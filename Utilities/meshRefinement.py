@@ -0,0 +1,168 @@
+import copy
+import numpy as np
+from numpy.polynomial import polynomial
+from pyomo.environ import Var, value
+from pyomo.opt import TerminationCondition
+from pyomo.dae import DerivativeVar
+
+import Dynamics as dyn
+from Phases import COLLOCATION
+from Residuals import phaseArrays, collocationWeights
+from Utilities.saveOptimizationVariables import saveOptimizationVariables
+from Utilities.loadOptimizationVariables import loadOptimizationVariables
+from Utilities.guardedSolve import guardedSolve
+
+# Local defect of the dynamics on every finite element of a solved finite difference phase block
+#
+# The change of each state between neighbouring nodes is compared with the trapezoidal
+# integral of its derivative, for backward Euler this is the local truncation error
+def elementDefects(b):
+
+    t = np.array(list(b.t))
+    h = np.diff(t)
+
+    defect = np.zeros(len(t) - 1)
+    # the discretization turns the DerivativeVars into plain Var components
+    for dv in b.component_objects(Var, descend_into=False):
+        if not isinstance(dv, DerivativeVar):
+            continue
+        state = dv.get_state_var()
+        X = np.array([value(state[i]) for i in b.t])
+        F = np.array([value(dv[i]) for i in b.t])
+
+        interval = np.abs(X[1:] - X[:-1] - 0.5 * h * (F[1:] + F[:-1])) / (1 + np.max(np.abs(X)))
+        defect = np.maximum(defect, interval)
+
+    # collocation points belong to the element they lie in
+    mesh = np.array(b.t.get_finite_elements())
+    element = np.searchsorted(mesh, 0.5 * (t[1:] + t[:-1])) - 1
+
+    defects = np.zeros(len(mesh) - 1)
+    np.maximum.at(defects, element, defect)
+
+    return mesh, defects
+
+# Values and derivatives at points of the Lagrange polynomials through nodes, [point, node]
+def lagrangeBasis(nodes, points):
+
+    coefficients = np.linalg.inv(np.vander(nodes, increasing=True))
+    values = np.vander(points, len(nodes), increasing=True) @ coefficients
+    slopes = np.vander(points, len(nodes) - 1, increasing=True) @ polynomial.polyder(coefficients)
+
+    return values, slopes
+
+# Local error of the dynamics on every finite element of a solved collocation phase block
+#
+# The collocation equations hold at the collocation points by construction, so the states and
+# controls are interpolated by the collocation polynomials of each element to Gauss points
+# between them. There the derivative of the state polynomial is compared with the dynamics of
+# mav evaluated on the interpolated point, and the difference integrated over the element, with
+# the same scaling as elementDefects, is its error
+def collocationDefects(mav, b, phase, npoints=None):
+
+    V = phaseArrays(mav, b)
+    t = np.array(list(b.t))
+
+    # element k spans nodes k * width to k * width + ncp, as in Residuals.transcriptionResiduals
+    width = phase.ncp if phase.scheme == 'LAGRANGE-RADAU' else phase.ncp + 1
+    tau, _, _ = collocationWeights(phase.scheme, phase.ncp)
+    starts = np.arange(0, len(t) - 1, width)
+    nodes = starts[:, None] + np.arange(phase.ncp + 1)[None, :]
+    h = (t[starts + width] - t[starts]) * V['tf']
+
+    points, weights = np.polynomial.legendre.leggauss(npoints if npoints is not None else phase.ncp + 2)
+    points, weights = 0.5 * (points + 1), 0.5 * weights
+    values, slopes = lagrangeBasis(tau, points)
+
+    # [name, element, point]
+    states = np.array([V[name][nodes] @ values.T for name in dyn.STATES])
+    controls = np.array([V[name][nodes] @ values.T for name in dyn.CONTROLS])
+    slope = np.array([V[name][nodes] @ slopes.T for name in dyn.STATES]) / h[None, :, None]
+
+    with np.errstate(all='ignore'):
+        rate = dyn.derivatives(states.reshape(len(dyn.STATES), -1), controls.reshape(len(dyn.CONTROLS), -1),
+                               phase.thrust, mav.dispersion(), mav.aero).reshape(states.shape)
+
+    size = 1 + np.max(np.abs(np.array([V[name] for name in dyn.STATES])), axis=1)
+    error = h[None, :] * (np.abs(slope - rate) @ weights) / size[:, None]
+
+    return np.array(b.t.get_finite_elements()), np.max(np.nan_to_num(error, nan=np.inf), axis=0)
+
+# Refined copy of a phase, elements above tol are split or the collocation order is raised
+#
+# An error spread over most of the phase is smooth and better served by a higher order,
+# an error confined to a few elements (a burn start, a cutoff) by smaller elements there
+def refinePhase(phase, mesh, defects, tol=1e-4, split=2, max_ncp=6, p_fraction=0.5):
+
+    failing = defects > tol
+    if not failing.any():
+        return phase
+
+    refined = copy.copy(phase)
+
+    if phase.scheme in COLLOCATION and phase.ncp < max_ncp and failing.mean() > p_fraction:
+        refined.ncp = phase.ncp + 1
+        refined.mesh = mesh.tolist()
+    else:
+        points = [mesh[:-1]]
+        for k in range(1, split):
+            points.append(mesh[:-1][failing] + k * np.diff(mesh)[failing] / split)
+        refined.mesh = sorted(np.round(np.concatenate(points + [mesh[-1:]]), 9).tolist())
+
+    refined.nfe = len(refined.mesh) - 1
+
+    return refined
+
+# Solve, estimate the defects and refine the phases until every element meets tol
+#
+# buildFunction(phases=..., **buildArgs) builds the model, each refined model is warm
+# started from the previous solution interpolated onto its grid. Finite difference phases are
+# checked with elementDefects, collocation phases with collocationDefects. Only a converged
+# solution is refined and warm starts the next model, a solve that does not converge ends the
+# refinement and the last converged model and its phases are returned (the first model if none
+# converged), the failure recorded in the history
+def refineMesh(buildFunction, solverFunction, phases, tol=1e-4, max_iter=5, split=2, max_ncp=6, buildArgs=None):
+
+    solver = solverFunction()
+    myPyomoVars = None
+    history = []
+    converged = None
+
+    for iteration in range(max_iter):
+
+        mav = buildFunction(**dict(buildArgs or {}, phases=phases))
+        if myPyomoVars is not None:
+            loadOptimizationVariables(mav, myPyomoVars)
+
+        results = guardedSolve(solver, mav.m, tee=True)
+        termination = results.solver.termination_condition
+
+        if termination != TerminationCondition.optimal:
+            history.append({'iteration': iteration, 'phases': phases, 'termination': str(termination)})
+            print(f"Mesh iteration {iteration}: {termination}, refinement stopped")
+            if converged is not None:
+                mav, phases = converged
+            break
+        converged = (mav, phases)
+
+        refined = []
+        for b, phase in zip(mav.m.phase.values(), phases):
+            if phase.scheme in COLLOCATION:
+                mesh, defects = collocationDefects(mav, b, phase)
+            else:
+                mesh, defects = elementDefects(b)
+            refined.append(refinePhase(phase, mesh, defects, tol, split, max_ncp))
+
+            print(f"Mesh iteration {iteration} phase {phase.name}: nfe={phase.nfe} ncp={phase.ncp} "
+                  f"max defect={defects.max():.2e} failing={int((defects > tol).sum())}")
+
+        history.append({'iteration': iteration, 'phases': phases, 'termination': str(termination)})
+
+        # the phases returned are always those mav was built on
+        if all(new is old for new, old in zip(refined, phases)) or iteration == max_iter - 1:
+            break
+
+        _, myPyomoVars = saveOptimizationVariables(mav)
+        phases = refined
+
+    return mav, phases, history
@@ -0,0 +1,86 @@
+import os
+import sys
+import glob
+import types
+import pickle
+import hashlib
+import weakref
+import pyomo.version
+
+# Stand-in for rules that cannot be pickled, a constructed model never calls them again
+def _uncachedRule(name):
+
+    def rule(*args, **kwds):
+        raise RuntimeError(f"rule {name} was not stored in the model cache, rebuild the model to reconstruct it")
+
+    return rule
+
+class _ModelPickler(pickle.Pickler):
+
+    def reducer_override(self, obj):
+
+        # pyomo.dae links states to their DerivativeVar through weak references
+        if type(obj) is weakref.ReferenceType:
+            return weakref.ref, (obj(),)
+
+        # the discretization leaves local lambdas behind as constraint rules
+        if isinstance(obj, types.FunctionType) and ('<locals>' in obj.__qualname__ or obj.__name__ == '<lambda>'):
+            return _uncachedRule, (obj.__qualname__,)
+
+        return NotImplemented
+
+# Stable text form of the build arguments, descriptor objects are described by their attributes
+def _describe(obj):
+
+    if isinstance(obj, dict):
+        return '{' + ', '.join(f'{key!r}: {_describe(obj[key])}' for key in sorted(obj)) + '}'
+    if isinstance(obj, (list, tuple)):
+        return '[' + ', '.join(_describe(item) for item in obj) + ']'
+    if hasattr(obj, '__dict__') and not isinstance(obj, type):
+        return type(obj).__name__ + _describe(vars(obj))
+
+    return repr(obj)
+
+# Hash of everything that defines the built model: the build arguments and the source of the
+# project (bounds, scales, nfe and the discretization scheme all live there) plus the Pyomo version
+def modelKey(buildFunction, buildArgs=None):
+
+    digest = hashlib.sha256()
+    digest.update(f'{buildFunction.__module__}.{buildFunction.__qualname__}'.encode())
+    digest.update(_describe(buildArgs or {}).encode())
+    digest.update(f'{pyomo.version.version} {sys.version_info[:2]}'.encode())
+
+    root = os.path.dirname(os.path.abspath(sys.modules[buildFunction.__module__].__file__))
+    for path in sorted(glob.glob(os.path.join(root, '**', '*.py'), recursive=True)):
+        digest.update(os.path.relpath(path, root).encode())
+        with open(path, 'rb') as source:
+            digest.update(source.read())
+
+    return digest.hexdigest()
+
+def cachePath(buildFunction, buildArgs=None, cachedir='model_cache'):
+
+    return os.path.join(os.path.abspath(cachedir), f'{buildFunction.__name__}_{modelKey(buildFunction, buildArgs)}.pkl')
+
+# Load the built and discretized model from the cache, building and storing it on a miss
+def cachedBuild(buildFunction, buildArgs=None, cachedir='model_cache'):
+
+    path = cachePath(buildFunction, buildArgs, cachedir)
+
+    if os.path.exists(path):
+        try:
+            with open(path, 'rb') as cache:
+                return pickle.load(cache)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            print(f"Discarding unreadable model cache {path}")
+
+    mav = buildFunction(**(buildArgs or {}))
+
+    # write to a private file first so concurrent workers never read a partial cache
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp = f'{path}.{os.getpid()}.tmp'
+    with open(temp, 'wb') as cache:
+        _ModelPickler(cache, protocol=pickle.HIGHEST_PROTOCOL).dump(mav)
+    os.replace(temp, path)
+
+    return mav
@@ -0,0 +1,95 @@
+import numpy as np
+
+import Dynamics as dyn
+from Residuals import phaseArrays
+from Utilities.repropagate import collocatedControls
+
+# relative 1-sigma of the initial mass and of the multipliers in Dynamics.DISPERSIONS
+SIGMAS = {'mass': 0.005, 'Isp': 0.01, 'S': 0.02, 'rho': 0.1, 'CX': 0.1, 'CN': 0.1, 'CM': 0.1}
+
+# percentiles reported for every insertion condition
+PERCENTILES = (1, 5, 50, 95, 99)
+
+# Gaussian multipliers around 1 for the initial mass and every dispersion, one array of
+# nsamples per name, sigmas overrides entries of SIGMAS
+def sampleDispersions(nsamples, sigmas=None, seed=None):
+
+    sigmas = {**SIGMAS, **(sigmas or {})}
+    rng = np.random.default_rng(seed)
+
+    return {name: rng.normal(1.0, sigmas[name], nsamples) for name in ('mass',) + dyn.DISPERSIONS}
+
+# Mean, standard deviation, extremes and PERCENTILES of a sample
+def summarize(values):
+
+    values = np.asarray(values, dtype=float)
+    summary = {'mean': np.mean(values), 'std': np.std(values), 'min': np.min(values), 'max': np.max(values)}
+    summary.update({f'p{level}': percentile for level, percentile in zip(PERCENTILES, np.percentile(values, PERCENTILES))})
+
+    return summary
+
+# Insertion conditions of a batch of final states of shape [N, len(STATES)]
+def insertion(states):
+
+    x, y, z, u, v, w, p, q, r, phi, the, psi, mass = states.T
+    speed = np.sqrt(u**2 + v**2 + w**2)
+    zdot = dyn.rates(states.T, np.zeros((len(dyn.CONTROLS), 1)), thrust=False)['zdot']
+
+    return {'altitude': z, 'speed': speed, 'u': u,
+            'flight_path': np.arcsin(np.clip(zdot / speed, -1, 1)),
+            'mass': mass, 'downrange': np.sqrt(x**2 + y**2)}
+
+# Classic fourth order Runge-Kutta step of the whole batch
+def rk4Step(f, t, states, h):
+
+    k1 = f(t, states)
+    k2 = f(t + h / 2, states + h / 2 * k1)
+    k3 = f(t + h / 2, states + h / 2 * k2)
+    k4 = f(t + h, states + h * k3)
+
+    return states + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+# Fly nsamples copies of the vehicle, dispersed about the uncertain parameters mav holds,
+# through the collocated open-loop controls of mav
+#
+# All copies are propagated at once as one [N, len(STATES)] array by fixed step RK4, substeps
+# steps per interval of the phase grid, switching phase at the collocated durations. Copies
+# start from the collocated initial state with the initial mass scaled by their sample, a
+# diverging copy becomes nan and is counted in failed rather than in the statistics.
+# Returns the samples, the insertion conditions of every copy and their statistics
+def monteCarlo(mav, nsamples=10000, sigmas=None, substeps=4, seed=0):
+
+    samples = sampleDispersions(nsamples, sigmas, seed)
+    nominal = mav.dispersion()
+    dispersion = {name: nominal[name] * samples[name] for name in dyn.DISPERSIONS}
+
+    states = None
+    for n, phase in enumerate(mav.phases, 1):
+        V = phaseArrays(mav, mav.m.phase[n])
+        t = np.array(list(mav.m.phase[n].t)) * V['tf']
+        if states is None:
+            states = np.tile([V[name][0] for name in dyn.STATES], (nsamples, 1))
+            states[:, dyn.STATES.index('mass')] *= samples['mass']
+
+        law = collocatedControls(V, t)
+
+        def f(time, batch):
+            return dyn.derivatives(batch.T, law(time, None), phase.thrust, dispersion, mav.aero).T
+
+        with np.errstate(all='ignore'):
+            for start, end in zip(t[:-1], t[1:]):
+                h = (end - start) / substeps
+                for step in range(substeps):
+                    states = rk4Step(f, start + step * h, states, h)
+
+    with np.errstate(all='ignore'):
+        final = insertion(states)
+    finite = np.isfinite(states).all(axis=1)
+
+    statistics = {name: summarize(values[finite]) for name, values in final.items() if finite.any()}
+
+    print(f"Monte Carlo: {finite.sum()} of {nsamples} copies reached insertion")
+    for name, stats in statistics.items():
+        print(f"  {name:12s} mean {stats['mean']:.6g}  std {stats['std']:.4g}  p1 {stats['p1']:.6g}  p99 {stats['p99']:.6g}")
+
+    return {'samples': samples, 'final': final, 'failed': int(nsamples - finite.sum()), 'statistics': statistics}
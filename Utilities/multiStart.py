@@ -0,0 +1,177 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from scipy.stats import qmc
+from pyomo.environ import value
+from pyomo.opt import SolverResults, SolverStatus, TerminationCondition
+
+from Utilities.WarmStartStore import WarmStartStore
+from Utilities.modelCache import cachedBuild
+from Utilities.paretoSweep import workerModel, enterWorkdir
+from Utilities.guardedSolve import guardedSolve
+from Utilities.initialGuess import forwardSimulate, writeProfiles, defaultSchedule, biasedLaw, lowestMass
+
+# Latin-hypercube samples of the starting point, one dict per start keyed by (phase, name)
+#
+# Every powered phase gets its duration anywhere inside its bounds, a propellant flow in the
+# fraction flow of its maximum and gimbal angles up to bias of the gimbal limits. The flow of a
+# phase is capped so its sampled duration cannot burn more than the propellant between the
+# launch mass and the lowest mass of the phase. Coast durations are not sampled, the forward
+# simulation ends a coast at apoapsis, so they follow from the sampled launch
+def sampleStarts(mav, nstarts, flow=(0.75, 1), bias=0.25, seed=None):
+
+    kap = (value(mav.m.kap_min), value(mav.m.kap_max))
+    eps = (value(mav.m.eps_min), value(mav.m.eps_max))
+    mpdot_max = value(mav.m.mpdot_max)
+
+    ranges = []
+    for n, phase in enumerate(mav.phases, 1):
+        if not phase.thrust:
+            continue
+        tf = mav.m.phase[n].tf
+        if tf.lb is not None and tf.ub is not None:
+            ranges.append(((n, 'tf'), tf.lb, tf.ub))
+        ranges.append(((n, 'mpdot'), flow[0] * mpdot_max, flow[1] * mpdot_max))
+        ranges.append(((n, 'kap'), bias * kap[0], bias * kap[1]))
+        ranges.append(((n, 'eps'), bias * eps[0], bias * eps[1]))
+
+    keys = [key for key, _, _ in ranges]
+    lower = np.array([lower for _, lower, _ in ranges])
+    upper = np.array([upper for _, _, upper in ranges])
+    samples = lower + qmc.LatinHypercube(d=len(ranges), seed=seed).random(nstarts) * (upper - lower)
+
+    starts = [dict(zip(keys, sample.tolist())) for sample in samples]
+
+    mass0 = mav.physical(mav.phases[0].initial.get('mass', 'mass_max'))
+    for start in starts:
+        for n, phase in enumerate(mav.phases, 1):
+            b = mav.m.phase[n]
+            if (n, 'tf') in start:
+                burn = start[(n, 'tf')] * value(mav.m.tf_scale)
+                start[(n, 'mpdot')] = min(start[(n, 'mpdot')], (mass0 - lowestMass(mav, b)) / burn)
+
+    return starts
+
+# Set the sampled burn durations and simulate the default schedule with the sampled pitch bias
+# and flow, the sampled yaw gimbal angle only goes into the starting eps profile since the pitch
+# plane laws cannot hold a yawing vehicle
+def applyStart(mav, start):
+
+    for (n, name), setting in start.items():
+        if name == 'tf':
+            mav.m.phase[n].tf.set_value(setting)
+
+    kap = (value(mav.m.kap_min), value(mav.m.kap_max))
+
+    laws = defaultSchedule(mav)
+    for n, phase in enumerate(mav.phases, 1):
+        if phase.thrust:
+            laws[n - 1] = biasedLaw(laws[n - 1], start[(n, 'kap')], start[(n, 'mpdot')], kap)
+
+    profiles = forwardSimulate(mav, laws)
+    for n, phase in enumerate(mav.phases, 1):
+        if phase.thrust:
+            profiles[n - 1]['eps'] = np.full(len(mav.m.phase[n].t), start[(n, 'eps')])
+    writeProfiles(mav, profiles)
+
+    return profiles
+
+# Values telling two local optima apart: the phase durations, final mass and range
+def signature(mav):
+
+    return [value(b.tf) for b in mav.m.phase.values()] + [value(mav.m.mass), value(mav.m.range)]
+
+# Solve one start inside a worker process, a failed solve is returned as a point with its error
+# status
+def solveStart(buildFunction, solverFunction, extractFunction, index, start, params, workdir, buildArgs=None, cachedir=None):
+
+    workdir = enterWorkdir(workdir)
+    mav, solver = workerModel(buildFunction, solverFunction, buildArgs, cachedir)
+
+    for name, setting in (params or {}).items():
+        mav.m.component(name).set_value(setting)
+    applyStart(mav, start)
+
+    results = guardedSolve(solver, mav.m, tee=False, keepfiles=True, logfile=os.path.join(workdir, 'ipopt.log'))
+
+    point = {'index': index, 'start': start, 'workdir': workdir,
+             'status': str(results.solver.status),
+             'termination': str(results.solver.termination_condition),
+             'objective': value(mav.m.objective),
+             'signature': signature(mav)}
+    point['snapshot'] = WarmStartStore(workdir).save('solution', mav)
+    if extractFunction is not None:
+        point.update(extractFunction(mav))
+
+    return point
+
+# Converged points best first, a point whose signature matches a better one within rtol is the
+# same local optimum found again and only counted in the hits of the first
+def distinctOptima(points, rtol=1e-3):
+
+    optima = []
+    for point in sorted((point for point in points if point['termination'] == 'optimal'), key=lambda point: -point['objective']):
+        found = np.array(point['signature'])
+        for optimum in optima:
+            known = np.array(optimum['signature'])
+            if np.all(np.abs(found - known) <= rtol * np.maximum(np.abs(known), 1e-12)):
+                optimum['hits'] += 1
+                break
+        else:
+            point['hits'] = 1
+            optima.append(point)
+
+    return optima
+
+# Multi-start search: solve Latin-hypercube starting points with IPOPT across a process pool and
+# return the best keep distinct local optima, best first
+#
+# params sets mutable Params of the model (e.g. the objective weights) before every solve. A start
+# whose worker raised is reported and left out rather than stopping the search
+def multiStart(buildFunction, solverFunction, extractFunction=None, nstarts=16, keep=5, params=None, max_workers=None,
+               workdir='multistart_runs', buildArgs=None, cachedir=None, seed=0, rtol=1e-3):
+
+    workdir = os.path.abspath(workdir)
+
+    # the parent only needs the model for the sample bounds, and warms the cache for the workers
+    if cachedir is not None:
+        cachedir = os.path.abspath(cachedir)
+        mav = cachedBuild(buildFunction, buildArgs, cachedir)
+    else:
+        mav = buildFunction(**(buildArgs or {}))
+    starts = sampleStarts(mav, nstarts, seed=seed)
+
+    points = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(solveStart, buildFunction, solverFunction, extractFunction, index, start, params,
+                                   os.path.join(workdir, f'start_{index}'), buildArgs, cachedir): index
+                   for index, start in enumerate(starts)}
+
+        for future in as_completed(futures):
+            try:
+                point = future.result()
+            except Exception as error:
+                print(f"Start {futures[future]} failed: {error!r}")
+                continue
+            points.append(point)
+            print(f"Start {point['index']}: {point['termination']}, objective {point['objective']:.6g}")
+
+    optima = distinctOptima(points, rtol)
+    print(f"Multi-start: {len(optima)} distinct local optima from {len(points)} starts")
+
+    return optima[:keep]
+
+# Load the best optimum of a multi-start into mav, returns results as a solver would
+def loadBest(optima, mav):
+
+    results = SolverResults()
+    results.solver.status = SolverStatus.error
+    results.solver.termination_condition = TerminationCondition.error
+
+    if optima:
+        WarmStartStore(os.path.dirname(optima[0]['snapshot'])).load('solution', mav)
+        results.solver.status = SolverStatus.ok
+        results.solver.termination_condition = TerminationCondition.optimal
+        results.solver.message = f"start {optima[0]['index']}"
+
+    return results
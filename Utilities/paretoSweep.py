@@ -0,0 +1,83 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pyomo.common.tempfiles import TempfileManager
+
+from Utilities.ParetoFront import ParetoFront
+from Utilities.modelCache import cachedBuild, cachePath
+from Utilities.WarmStartStore import WarmStartStore
+from Utilities.guardedSolve import guardedSolve
+
+# Models built by this worker process, reused for every weighting it is handed
+_workerModels = {}
+
+# Model and solver of this worker process, built (or loaded from the cache) on first use
+def workerModel(buildFunction, solverFunction, buildArgs=None, cachedir=None):
+
+    key = (buildFunction.__module__, buildFunction.__name__)
+    if key not in _workerModels:
+        if cachedir is not None:
+            mav = cachedBuild(buildFunction, buildArgs, cachedir)
+        else:
+            mav = buildFunction(**(buildArgs or {}))
+        _workerModels[key] = (mav, solverFunction())
+
+    return _workerModels[key]
+
+# Give the calling worker its own IPOPT working directory
+def enterWorkdir(workdir):
+
+    workdir = os.path.abspath(workdir)
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    TempfileManager.tempdir = workdir
+
+    return workdir
+
+# Solve a single weighting inside a worker process, a failed solve is returned as a point with
+# its error status
+def solvePoint(buildFunction, solverFunction, extractFunction, index, W_Obj1, W_Obj2, workdir, buildArgs=None, cachedir=None):
+
+    # every point gets its own IPOPT working directory and log file
+    workdir = enterWorkdir(workdir)
+    mav, solver = workerModel(buildFunction, solverFunction, buildArgs, cachedir)
+
+    mav.m.W_Obj1.set_value(W_Obj1)
+    mav.m.W_Obj2.set_value(W_Obj2)
+
+    results = guardedSolve(solver, mav.m, tee=False, keepfiles=True, logfile=os.path.join(workdir, 'ipopt.log'))
+
+    point = {'index': index, 'W_Obj1': W_Obj1, 'W_Obj2': W_Obj2, 'workdir': workdir,
+             'status': str(results.solver.status),
+             'termination': str(results.solver.termination_condition)}
+    point['snapshot'] = WarmStartStore(workdir).save('solution', mav)
+    point.update(extractFunction(mav))
+
+    return point
+
+# Spread the weight pairs of a Pareto sweep over a process pool, a point whose worker raised is
+# reported and left out of the front rather than stopping the sweep
+def paretoSweep(buildFunction, solverFunction, extractFunction, W_Obj1, W_Obj2, max_workers=None, workdir='pareto_runs', buildArgs=None, cachedir=None):
+
+    front = ParetoFront()
+    workdir = os.path.abspath(workdir)
+
+    # build the model template once here so the workers only load it
+    if cachedir is not None:
+        cachedir = os.path.abspath(cachedir)
+        if not os.path.exists(cachePath(buildFunction, buildArgs, cachedir)):
+            cachedBuild(buildFunction, buildArgs, cachedir)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(solvePoint, buildFunction, solverFunction, extractFunction, index, w1, w2,
+                                   os.path.join(workdir, f'point_{index}'), buildArgs, cachedir): index
+                   for index, (w1, w2) in enumerate(zip(W_Obj1, W_Obj2))}
+
+        for future in as_completed(futures):
+            try:
+                point = front.add(future.result())
+            except Exception as error:
+                print(f"Pareto point {futures[future]} failed: {error!r}")
+                continue
+            print(f"Pareto point {point['index']} (W_Obj1={point['W_Obj1']}, W_Obj2={point['W_Obj2']}): {point['termination']}")
+
+    return front
@@ -0,0 +1,142 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pyomo.environ import value
+from pyomo.opt import TerminationCondition
+
+from Utilities.WarmStartStore import WarmStartStore
+from Utilities.modelCache import cachedBuild
+from Utilities.paretoSweep import workerModel, enterWorkdir
+from Utilities.guardedSolve import guardedSolve
+from Utilities.saveOptimizationDuals import saveOptimizationDuals
+from Utilities.loadOptimizationDuals import loadOptimizationDuals
+from Utilities.monteCarlo import summarize
+
+# relative 1-sigma of the uncertain mutable Params of the MAV model
+SIGMAS = {'Isp': 0.01, 'eff_cstr': 0.01, 'mass0': 0.005, 'rho_factor': 0.1, 'CX_factor': 0.1, 'CN_factor': 0.1, 'CM_factor': 0.1}
+
+# Gaussian samples of the uncertain Params around the values mav holds, one dict per sample
+def sampleParameters(mav, nsamples, sigmas=None, seed=None):
+
+    sigmas = sigmas if sigmas is not None else SIGMAS
+    rng = np.random.default_rng(seed)
+    nominal = {name: value(mav.m.component(name)) for name in sigmas}
+    draws = {name: nominal[name] * rng.normal(1.0, sigma, nsamples) for name, sigma in sigmas.items()}
+
+    return [{name: float(draws[name][index]) for name in sigmas} for index in range(nsamples)]
+
+# Solve the nominal case once, every sample is warm started from its primal and dual point.
+# Returns the snapshot, the multipliers and the termination, no snapshot if it did not converge
+def solveNominal(mav, solverFunction, params, workdir):
+
+    if mav.m.component('dual') is None:
+        mav.addWarmStartSuffixes()
+    for name, setting in (params or {}).items():
+        mav.m.component(name).set_value(setting)
+
+    results = guardedSolve(solverFunction(), mav.m, tee=False, keepfiles=True, logfile=os.path.join(workdir, 'ipopt_nominal.log'))
+    termination = results.solver.termination_condition
+    if termination != TerminationCondition.optimal:
+        print(f"Nominal: {termination}, the campaign is not run")
+        return None, None, str(termination)
+    print(f"Nominal: {termination}, objective {value(mav.m.objective):.6g}")
+
+    return WarmStartStore(workdir).save('nominal', mav), saveOptimizationDuals(mav), str(termination)
+
+# Options solverFunction(warm_start=True) sets on top of the cold ones, e.g. the bound pushes
+def warmStartOptions(solverFunction):
+
+    cold = solverFunction().options
+    warm = solverFunction(warm_start=True).options
+
+    return {option: setting for option, setting in warm.items() if cold.get(option) != setting}
+
+# Re-solve one sample inside a worker process
+#
+# The worker keeps its model and solver between samples, only the mutable Params change and the
+# warm start options are set on the solver, so a persistent solver keeps its model. Every sample
+# restarts from the nominal solution rather than from the last sample the worker solved, a
+# failed solve is returned as a point with its error status
+def solveSample(buildFunction, solverFunction, extractFunction, index, sample, params, nominal, duals, warm, workdir,
+                buildArgs=None, cachedir=None, keys=('final_mass', 'final_downrange')):
+
+    workdir = enterWorkdir(workdir)
+    mav, solver = workerModel(buildFunction, solverFunction, buildArgs, cachedir)
+    if mav.m.component('dual') is None:
+        mav.addWarmStartSuffixes()
+
+    for name, setting in {**(params or {}), **sample}.items():
+        mav.m.component(name).set_value(setting)
+    WarmStartStore(os.path.dirname(nominal)).load(os.path.basename(nominal)[:-len('.npz')], mav)
+    loadOptimizationDuals(mav, duals or {})
+
+    for option, setting in (warm if duals else {}).items():
+        solver.options[option] = setting
+
+    results = guardedSolve(solver, mav.m, tee=False, keepfiles=True, logfile=os.path.join(workdir, 'ipopt.log'))
+
+    point = {'index': index, 'sample': sample,
+             'status': str(results.solver.status),
+             'termination': str(results.solver.termination_condition),
+             'objective': value(mav.m.objective)}
+    outcome = extractFunction(mav)
+    point.update({key: outcome[key] for key in keys})
+
+    return point
+
+# Monte Carlo re-optimization: sample the uncertain Params and re-solve the full NLP for every
+# sample across a process pool, returns the points and the statistics of keys over the
+# converged samples
+#
+# params sets other mutable Params (e.g. the objective weights) for the nominal and every sample.
+# nominal names a WarmStartStore snapshot of an already solved nominal case and duals its
+# multipliers, without them the nominal case is solved here first and the campaign returned empty
+# with its termination in 'nominal' if it does not converge. A sample whose worker raised is
+# reported and left out rather than stopping the campaign
+def reoptimizationCampaign(buildFunction, solverFunction, extractFunction, nsamples=100, sigmas=None, params=None,
+                           nominal=None, duals=None, max_workers=None, workdir='campaign_runs', buildArgs=None,
+                           cachedir=None, seed=0, keys=('final_mass', 'final_downrange')):
+
+    workdir = os.path.abspath(workdir)
+    os.makedirs(workdir, exist_ok=True)
+
+    # the parent model gives the nominal Params and warms the cache for the workers
+    if cachedir is not None:
+        cachedir = os.path.abspath(cachedir)
+        mav = cachedBuild(buildFunction, buildArgs, cachedir)
+    else:
+        mav = buildFunction(**(buildArgs or {}))
+    samples = sampleParameters(mav, nsamples, sigmas, seed)
+
+    status = 'given'
+    if nominal is None:
+        nominal, duals, status = solveNominal(mav, solverFunction, params, workdir)
+        if nominal is None:
+            return {'points': [], 'converged': 0, 'statistics': {}, 'nominal': status}
+    nominal = os.path.abspath(nominal)
+    warm = warmStartOptions(solverFunction)
+
+    points = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(solveSample, buildFunction, solverFunction, extractFunction, index, sample, params,
+                                   nominal, duals, warm, os.path.join(workdir, f'sample_{index}'), buildArgs, cachedir, keys): index
+                   for index, sample in enumerate(samples)}
+
+        for future in as_completed(futures):
+            try:
+                point = future.result()
+            except Exception as error:
+                print(f"Sample {futures[future]} failed: {error!r}")
+                continue
+            points.append(point)
+            print(f"Sample {point['index']}: {point['termination']}, objective {point['objective']:.6g}")
+
+    points.sort(key=lambda point: point['index'])
+    converged = [point for point in points if point['termination'] == 'optimal']
+    statistics = {key: summarize([point[key] for point in converged]) for key in keys if converged}
+
+    print(f"Campaign: {len(converged)} of {nsamples} samples converged")
+    for key, summary in statistics.items():
+        print(f"  {key:16s} mean {summary['mean']:.6g}  std {summary['std']:.4g}  p5 {summary['p5']:.6g}  p95 {summary['p95']:.6g}")
+
+    return {'points': points, 'converged': len(converged), 'statistics': statistics, 'nominal': status}
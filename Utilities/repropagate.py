@@ -0,0 +1,69 @@
+import numpy as np
+from scipy.integrate import solve_ivp
+
+import Dynamics as dyn
+from Residuals import phaseArrays
+
+# Final quantities compared between the collocated and the replayed trajectory
+def finalValues(states):
+
+    return {'altitude': states['z'][-1],
+            'u': states['u'][-1],
+            'mass': states['mass'][-1],
+            'downrange': np.sqrt(states['x'][-1]**2 + states['y'][-1]**2)}
+
+# Control law replaying the collocated controls of a phase, linear between its nodes t
+def collocatedControls(V, t):
+
+    controls = np.array([V[name] for name in dyn.CONTROLS])
+
+    def law(time, state):
+        return np.array([np.interp(time, t, control) for control in controls])
+
+    return law
+
+# Replay the collocated controls through an adaptive high order integrator of the 6-DoF equations
+#
+# Only the initial state of the first phase is taken from the solution, every later phase
+# starts from the replayed state at the end of the last one, so the phase switches fall at the
+# collocated tf1, tf1 + tf2, ... and the error of the transcription accumulates as it would in
+# flight. With restart every phase starts from its collocated initial state instead, which
+# keeps the drift of each phase to its own grid.
+# Returns the drift of the final altitude, u, mass and downrange (replayed minus collocated) and
+# per phase the replayed states at the nodes and the largest drift of each state
+def repropagate(mav, method='DOP853', rtol=1e-10, atol=1e-8, restart=False):
+
+    state = None
+    offset = 0.0
+    dispersion = mav.dispersion()
+    phases = []
+    for n, phase in enumerate(mav.phases, 1):
+        b = mav.m.phase[n]
+        V = phaseArrays(mav, b)
+        t = np.array(list(b.t)) * V['tf']
+        if state is None or restart:
+            state = np.array([V[name][0] for name in dyn.STATES])
+
+        law = collocatedControls(V, t)
+        with np.errstate(all='ignore'):
+            sol = solve_ivp(lambda time, s: dyn.derivatives(s, law(time, s), phase.thrust, dispersion, mav.aero), (t[0], t[-1]), state,
+                            method=method, t_eval=t, rtol=rtol, atol=atol)
+        if not sol.success:
+            print(f"Re-propagation of phase {phase.name} stopped: {sol.message}")
+
+        # nodes the integration did not reach are left out of the drift
+        states = np.full((len(dyn.STATES), len(t)), np.nan)
+        states[:, :sol.y.shape[1]] = sol.y
+        replayed = dict(zip(dyn.STATES, states))
+
+        phases.append({'name': phase.name, 't': t + offset, 'success': sol.success, 'states': replayed,
+                       'drift': {name: float(np.nanmax(np.abs(replayed[name] - V[name]), initial=0)) for name in dyn.STATES}})
+        state = states[:, -1]
+        offset += t[-1]
+
+    collocated = finalValues(V)
+    final = finalValues(phases[-1]['states'])
+    drift = {name: final[name] - collocated[name] for name in final}
+    print('Re-propagation drift: ' + ', '.join(f'{name} {value:.4g}' for name, value in drift.items()))
+
+    return {'drift': drift, 'collocated': collocated, 'replayed': final, 'phases': phases}
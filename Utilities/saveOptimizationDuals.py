@@ -0,0 +1,15 @@
+from pyomo.environ import *
+from pyomo.dae import *
+
+
+# Save bound and constraint multipliers to use in warm start
+def saveOptimizationDuals(mav):
+
+    myDuals = {}
+    for mySuffix in ['ipopt_zL_out', 'ipopt_zU_out', 'dual']:
+        suffix = mav.m.component(mySuffix)
+        if suffix is None:
+            continue
+        myDuals[mySuffix] = {component.name: value for component, value in suffix.items()}
+
+    return myDuals
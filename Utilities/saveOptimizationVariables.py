@@ -8,9 +8,7 @@ def saveOptimizationVariables(mav):
     
     myProfile = {}
     for myVar in mav.m.component_objects(Var, active= True):
-        print("Saving Variable: ",myVar) # doctest: +SKIP
-        for index in myVar:
-            myProfile[myVar.name] = [value(myVar[index]) for index in myVar]
+        myProfile[myVar.name] = [data.value for data in myVar.values()]
             
     myPyomoVars = {}
     for myVar in mav.m.component_objects(ctype=[Var, ContinuousSet], active= True):        
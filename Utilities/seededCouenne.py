@@ -0,0 +1,93 @@
+import os
+from pyomo.environ import SolverFactory, Var, Constraint, value
+from pyomo.opt import TerminationCondition
+
+from Utilities.guardedSolve import guardedSolve, LOADABLE
+
+# Terminations after which the values in the model are a usable solution
+SOLVED = (TerminationCondition.optimal, TerminationCondition.locallyOptimal,
+          TerminationCondition.feasible, TerminationCondition.maxTimeLimit)
+
+# Shrink the bounds of every free variable to a box of relative half width box around its
+# current value (the IPOPT trajectory and phase durations), inside the original bounds
+#
+# Returns the original bounds so they can be put back with restoreBounds
+def tightenBounds(mav, box=0.2):
+
+    original = []
+    for data in mav.m.component_data_objects(Var, active=True):
+        if data.fixed or data.value is None:
+            continue
+        original.append((data, data.lb, data.ub))
+
+        if data.lb is not None and data.ub is not None:
+            width = box * (data.ub - data.lb)
+        else:
+            width = box * max(abs(data.value), 1)
+        lower = data.value - width if data.lb is None else max(data.lb, data.value - width)
+        upper = data.value + width if data.ub is None else min(data.ub, data.value + width)
+        data.setlb(lower)
+        data.setub(upper)
+
+    return original
+
+def restoreBounds(original):
+
+    for data, lower, upper in original:
+        data.setlb(lower)
+        data.setub(upper)
+
+    return
+
+# Couenne seeded with a fast IPOPT solution
+#
+# IPOPT runs first, its solution is both the starting point written to Couenne and a cutoff
+# constraint objective >= incumbent - gap, so branch-and-bound prunes every node that cannot
+# beat it. The box around the IPOPT trajectory (see tightenBounds) narrows the relaxations
+# further, so Couenne searches a neighbourhood of the incumbent rather than the whole domain.
+# Couenne reads couenne.opt (time_limit etc.) from optdir, see runCouenne. Bounds and the
+# cutoff are removed again afterwards and the IPOPT point is put back unless Couenne loaded a
+# solution strictly better than it.
+# Returns the results of the solve whose point the model holds
+def seededCouenne(mav, solverFunction, box=0.2, gap=1e-6, optdir=None, tee=True):
+
+    results = guardedSolve(solverFunction(), mav.m, tee=tee)
+    if results.solver.termination_condition not in SOLVED:
+        print(f"IPOPT seed {results.solver.termination_condition}, Couenne runs without incumbent and box")
+        return runCouenne(mav, optdir, tee)
+
+    incumbent = value(mav.m.objective)
+    seed = [(data, data.value) for data in mav.m.component_data_objects(Var, active=True)]
+    print(f"IPOPT incumbent {incumbent:.6g}")
+
+    original = tightenBounds(mav, box)
+    mav.m.cutoff = Constraint(expr=mav.m.objective.expr >= incumbent - gap)
+    try:
+        couenne = runCouenne(mav, optdir, tee)
+    finally:
+        mav.m.del_component(mav.m.cutoff)
+        restoreBounds(original)
+
+    # without a loaded solution the model still holds the IPOPT point
+    loaded = couenne.solver.status in LOADABLE and len(couenne.solution) > 0
+    if loaded and couenne.solver.termination_condition in SOLVED and value(mav.m.objective) > incumbent:
+        print(f"Couenne {couenne.solver.termination_condition}: objective {value(mav.m.objective):.6g}")
+        return couenne
+
+    print(f"Couenne {couenne.solver.termination_condition} did not improve on IPOPT, keeping the incumbent")
+    for data, setting in seed:
+        data.set_value(setting, skip_validation=True)
+
+    return results
+
+# Run Couenne from optdir, by default the directory of couenne.opt next to mainMAV.py, its
+# solution is only loaded when it has one
+def runCouenne(mav, optdir=None, tee=True):
+
+    # Couenne only looks for its options file in the working directory
+    cwd = os.getcwd()
+    os.chdir(optdir if optdir is not None else os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    try:
+        return guardedSolve(SolverFactory('couenne'), mav.m, tee=tee)
+    finally:
+        os.chdir(cwd)
@@ -0,0 +1,165 @@
+import os
+import time
+import signal
+import queue
+import multiprocessing
+import numpy as np
+from pyomo.environ import Var
+from pyomo.opt import SolverResults, SolverStatus, TerminationCondition
+from pyomo.common.tempfiles import TempfileManager
+
+from Utilities.WarmStartStore import WarmStartStore
+from Utilities.guardedSolve import guardedSolve
+
+# Terminations accepted as a converged solve
+CONVERGED = (TerminationCondition.optimal, TerminationCondition.locallyOptimal)
+
+# Option profiles raced against each other, applied on top of the options of solverFunction(),
+# perturb is the relative size of a random kick to the starting point
+PROFILES = [
+    {'name': 'baseline', 'options': {}},
+    {'name': 'adaptive-mu', 'options': {'mu_strategy': 'adaptive'}},
+    {'name': 'mumps', 'options': {'linear_solver': 'mumps'}},
+    {'name': 'no-scaling', 'options': {'nlp_scaling_method': 'none', 'mu_strategy': 'adaptive'}},
+    {'name': 'perturbed', 'options': {'mu_strategy': 'adaptive'}, 'perturb': 0.05},
+]
+
+# Seconds between checks that the racers still running are alive
+POLL = 1.0
+
+# Sequential retries when every raced profile fails, each rung restarts from the original point
+LADDER = [
+    {'name': 'more-iterations', 'options': {'max_iter': 3000, 'mu_strategy': 'adaptive'}},
+    {'name': 'pushed-interior', 'options': {'max_iter': 3000, 'linear_solver': 'mumps', 'bound_push': 1e-2, 'bound_frac': 1e-2}},
+    {'name': 'monotone-large-mu', 'options': {'max_iter': 5000, 'nlp_scaling_method': 'none', 'mu_strategy': 'monotone', 'mu_init': 1e-1}},
+]
+
+# Move every free variable of the model by a random relative amount, kept inside its bounds
+def perturb(mav, size, seed=None):
+
+    rng = np.random.default_rng(seed)
+    for data in mav.m.component_data_objects(Var, active=True):
+        if data.fixed or data.value is None:
+            continue
+        x = data.value * (1 + size * rng.standard_normal())
+        lower = data.lb if data.lb is not None else -np.inf
+        upper = data.ub if data.ub is not None else np.inf
+        data.set_value(min(max(x, lower), upper))
+
+    return
+
+# Solve mav with one profile, returns the results of the solver, an error status rather than an
+# exception when IPOPT fails
+def solveProfile(mav, solverFunction, profile, seed=None, tee=False, logfile=None):
+
+    if profile.get('perturb'):
+        perturb(mav, profile['perturb'], seed)
+
+    solver = solverFunction()
+    for option, setting in profile.get('options', {}).items():
+        solver.options[option] = setting
+
+    return guardedSolve(solver, mav.m, tee=tee, logfile=logfile)
+
+# One racer, a forked copy of the parent process that solves its own copy of the model
+def raceWorker(results, index, mav, solverFunction, profile, workdir):
+
+    # own process group so cancelling it also stops the IPOPT it started
+    os.setpgrp()
+
+    try:
+        os.makedirs(workdir, exist_ok=True)
+        os.chdir(workdir)
+        TempfileManager.tempdir = workdir
+
+        solved = solveProfile(mav, solverFunction, profile, seed=index, logfile=os.path.join(workdir, 'ipopt.log'))
+        snapshot = WarmStartStore(workdir).save('solution', mav)
+        results.put((index, solved.solver.status, solved.solver.termination_condition, snapshot))
+    except Exception as error:
+        print(f"Profile {profile['name']} raised {error!r}")
+        results.put((index, SolverStatus.error, TerminationCondition.error, None))
+
+    return
+
+def cancel(process):
+
+    if process.is_alive():
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    process.join()
+
+    return
+
+# Solve mav by racing the option profiles in parallel and keeping the first to converge
+#
+# Every racer is a fork of this process, so it starts from the model already in memory and
+# nothing is rebuilt or pickled. The winner's solution is loaded back into mav and the other
+# racers are killed, so the latency of a point is that of the fastest profile. If none converges,
+# every racer dies without reporting or the race exceeds timeout seconds in all, the ladder
+# profiles are tried one after the other in this process, each from the original starting point.
+# Returns the results of the solve kept, with the name of its profile in results.solver.message
+def raceSolve(mav, solverFunction, profiles=PROFILES, ladder=LADDER, workdir='race_runs', timeout=1800):
+
+    workdir = os.path.abspath(workdir)
+    start = WarmStartStore(workdir)
+    start.save('start', mav)
+
+    outcome = SolverResults()
+    outcome.solver.status = SolverStatus.error
+    outcome.solver.termination_condition = TerminationCondition.error
+
+    # forking is what keeps the racers cheap, without it only the ladder runs
+    if 'fork' in multiprocessing.get_all_start_methods() and hasattr(os, 'setpgrp'):
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        racers = [context.Process(target=raceWorker, args=(results, index, mav, solverFunction, profile, os.path.join(workdir, profile['name'])))
+                  for index, profile in enumerate(profiles)]
+        for racer in racers:
+            racer.start()
+
+        deadline = time.monotonic() + timeout
+        pending = set(range(len(racers)))
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print(f"Solver race timed out after {timeout} s")
+                    break
+
+                # a racer already gone before a wait that brings nothing has died without reporting
+                exited = [index for index in pending if not racers[index].is_alive()]
+                try:
+                    index, status, termination, snapshot = results.get(timeout=min(remaining, POLL))
+                except queue.Empty:
+                    for index in exited:
+                        print(f"Profile {profiles[index]['name']} died with exit code {racers[index].exitcode}")
+                        pending.discard(index)
+                    continue
+
+                pending.discard(index)
+                print(f"Profile {profiles[index]['name']}: {termination}")
+                if termination in CONVERGED:
+                    WarmStartStore(os.path.dirname(snapshot)).load('solution', mav)
+                    outcome.solver.status = status
+                    outcome.solver.termination_condition = termination
+                    outcome.solver.message = profiles[index]['name']
+                    return outcome
+        finally:
+            for racer in racers:
+                cancel(racer)
+    else:
+        print("Processes cannot be forked here, using the retry ladder only")
+
+    for profile in ladder:
+        start.load('start', mav)
+        solved = solveProfile(mav, solverFunction, profile, logfile=os.path.join(workdir, f"{profile['name']}.log"))
+        print(f"Retry {profile['name']}: {solved.solver.termination_condition}")
+        outcome.solver.status = solved.solver.status
+        outcome.solver.termination_condition = solved.solver.termination_condition
+        outcome.solver.message = profile['name']
+        if solved.solver.termination_condition in CONVERGED:
+            break
+
+    return outcome
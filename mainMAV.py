@@ -20,6 +20,26 @@ from Utilities.VarContainer import VarContainer
 from Utilities.Plotter import plotResults
 from Utilities.saveOptimizationVariables import saveOptimizationVariables
 from Utilities.loadOptimizationVariables import loadOptimizationVariables
+from Utilities.WarmStartStore import WarmStartStore
+from Utilities.PersistentIpopt import PersistentIpopt
+from functools import partial
+from Utilities.saveOptimizationDuals import saveOptimizationDuals
+from Utilities.loadOptimizationDuals import loadOptimizationDuals
+from Utilities.ParetoFront import ParetoFront
+from Utilities.paretoSweep import paretoSweep
+from Utilities.modelCache import cachedBuild
+from Utilities.meshRefinement import refineMesh
+from Utilities.gridSequencing import gridSequence
+from Utilities.epsilonConstraint import epsilonConstraintFront
+from Utilities.solverPortfolio import raceSolve
+from Utilities.multiStart import multiStart, loadBest
+from Utilities.seededCouenne import seededCouenne
+from Utilities.anytimeSolve import anytimeSolve
+from Utilities.repropagate import repropagate
+from Utilities.monteCarlo import monteCarlo
+from Utilities.reoptimizationCampaign import reoptimizationCampaign
+from Utilities.initialGuess import initialGuess
+from Phases import defaultPhases
 from pyomo.environ import Suffix, ConcreteModel, Var, NonNegativeReals, \
     Constraint, Objective, SolverFactory
 from pyomo.util.infeasible import (
@@ -35,7 +55,90 @@ from pyomo.util.infeasible import (
 logging.basicConfig(level=logging.INFO)  # Ensure logging level is INFO or DEBUG
 logger = logging.getLogger('pyomo.core')
 
-def main():
+# Build the discretized multi-phase model, phases default to launch, coast and burn (see Phases.py)
+def buildMAV(simulate=True, **conditions):
+
+    # Create mav vehicle, one block per phase with its dynamics, boundary and linkage constraints
+    mav = MAV(**conditions)
+
+    # Start IPOPT from a forward simulation of the dynamics instead of bound midpoints
+    if simulate:
+        initialGuess(mav)
+    last = mav.m.phase[len(mav.phases)]
+
+    # Define Objective (weights are mutable so a sweep only needs a re-solve)
+    mav.m.range = last.x[1] + last.y[1]
+    mav.m.mass = last.mass[1]
+    mav.m.objective = Objective(expr=(((mav.m.mass**mav.m.W_Obj1) * (mav.m.range**mav.m.W_Obj2))), sense=maximize)
+
+    # Epsilon-constraint bound on range, inactive at 0 so the weighted sweep is unchanged
+    mav.m.range_min = Param(initialize=0, mutable=True)
+    mav.m.epsilon = Constraint(expr=mav.m.range >= mav.m.range_min)
+
+    # Dsicretized size description
+    from pyomo.util.model_size import build_model_size_report
+    report = build_model_size_report(mav.m)
+    print("Num constraints: ", report.activated.constraints)
+    print("Num variables: ", report.activated.variables)
+
+    return mav
+
+def createSolver(warm_start=False, persistent=False):
+
+    solver = SolverFactory('ipopt')
+
+    # Keep the model in memory between solves, falls back to the .nl file interface if APPSI is missing
+    if persistent:
+        if PersistentIpopt().available():
+            solver = PersistentIpopt()
+        else:
+            print("APPSI IPOPT is not available, using the .nl file interface")
+
+    solver.options["halt_on_ampl_error"] = "yes"
+    solver.options['tol'] = 1e-6 
+    solver.options['dual_inf_tol'] = 1e-6
+    solver.options['constr_viol_tol'] = 1e-6
+    solver.options["max_iter"] = 800
+    solver.options["linear_scaling_on_demand"] = "yes"
+    solver.options['nlp_scaling_method'] = 'gradient-based'
+    solver.options['linear_solver'] = "ma27"
+
+    # Start from the supplied primal and dual point instead of pushing it into the interior
+    if warm_start:
+        solver.options['warm_start_init_point'] = "yes"
+        solver.options['warm_start_bound_push'] = 1e-9
+        solver.options['warm_start_bound_frac'] = 1e-9
+        solver.options['warm_start_slack_bound_push'] = 1e-9
+        solver.options['warm_start_slack_bound_frac'] = 1e-9
+        solver.options['warm_start_mult_bound_push'] = 1e-9
+        solver.options['mu_init'] = 1e-6
+
+    return solver
+
+# Final values and trajectory history of a solved model
+def extractResults(mav):
+
+    results = []
+    offset = 0
+    for b in mav.m.phase.values():
+        for t in b.t:
+            results.append({
+                't': t * value(b.tf) + offset,
+                'x': value(b.x[t] * mav.m.x_scale),
+                'y': value(b.y[t] * mav.m.y_scale),
+                'downrange': sqrt(value(b.x[t] * mav.m.x_scale)**2 + value(b.y[t] * mav.m.y_scale)**2),
+                'altitude': value(b.z[t] * mav.m.z_scale),
+            })
+        offset += value(b.tf)
+
+    last = mav.m.phase[len(mav.phases)]
+
+    return {'final_mass': value(last.mass[1] * mav.m.mass_scale),
+            'final_downrange': np.sqrt(value(last.x[1] * mav.m.x_scale)**2 + value(last.y[1] * mav.m.y_scale)**2) / 1e3,
+            'trajectory': results,
+            'trajectory_vars': VarContainer(mav.m)}
+
+def main(persistent=True, parallel=False, max_workers=None, continuation=False, cache=True, cachedir='model_cache', refine=False, sequence=False, snapshots='warm_starts', appsi=False, epsilon=False, npoints=15, hv_tol=1e-3, race=False, multistart=0, couenne=False, budget=None, validate=False, dispersions=0, campaign=0):
     
     miu_mars = 4.282837e13
     mars_radius = 3.3895e3
@@ -73,234 +176,144 @@ def main():
     qf = None
     rf = None
 
-    # Initialize lists to store results
-    final_mass_values = []
-    final_downrange_values = []
-
     # Weightings 
     W_Obj1 = [0.4, 0.5, 0.8, 1.1, 1.2]
     W_Obj2 = [1.6, 1.5, 1.2, 0.9, 0.8] 
 
-    for weight in range(5):
-        for warm in range(1):
-
-            # Create mav vehicle
-            mav = MAV(x0=x0, y0=y0, z0=z0, u0=u0, v0=v0, w0=w0, phi0=phi0, the0=the0, psi0=psi0, p0=p0, q0=q0, r0=r0, \
-                    xf=xf, yf=yf, zf=zf, uf=uf, vf=vf, wf=wf, phif=phif, thef=thef, psif=psif, pf=pf, qf=qf, rf=rf)
-        
-            # Boundary Conditions
-            mav.m.BCs_con = ConstraintList(rule=mav.BCs)
-            
-            # Phase 1
-            n1 = [1] # flag for Phase 1
-
-            mav.m.Q_dmpdot_dtau_Con1         = Constraint(n1, mav.m.t1, rule=mav.Q_dmass_dtau)
-
-            mav.m.Q_dx_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dx_dtau)
-            mav.m.Q_dy_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dy_dtau)
-            mav.m.Q_dz_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dz_dtau)
-
-            mav.m.Q_du_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_du_dtau)
-            mav.m.Q_dv_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dv_dtau)
-            mav.m.Q_dw_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dw_dtau)
-
-            mav.m.Q_dp_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dp_dtau)
-            mav.m.Q_dq_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dq_dtau)
-            mav.m.Q_dr_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dr_dtau)
-
-            mav.m.Q_dphi_dtau_Con1           = Constraint(n1, mav.m.t1, rule=mav.Q_dphi_dtau)
-            mav.m.Q_dthe_dtau_Con1           = Constraint(n1, mav.m.t1, rule=mav.Q_dthe_dtau)
-            mav.m.Q_dpsi_dtau_Con1           = Constraint(n1, mav.m.t1, rule=mav.Q_dpsi_dtau)
-
-            mav.m.Q_massdot_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_massdot)
-
-            mav.m.Q_q0_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_q0)
-            mav.m.Q_q1_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_q1)
-            mav.m.Q_q2_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_q2)
-            mav.m.Q_q3_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_q3)
-
-            mav.m.Q_pdot_Con1                = Constraint(n1, mav.m.t1, rule=mav.Q_pdot)
-            mav.m.Q_qdot_Con1                = Constraint(n1, mav.m.t1, rule=mav.Q_qdot)   
-            mav.m.Q_rdot_Con1                = Constraint(n1, mav.m.t1, rule=mav.Q_rdot)
-
-            mav.m.Q_udot_Con1                = Constraint(n1, mav.m.t1, rule=mav.Q_udot)
-            mav.m.Q_vdot_Con1                = Constraint(n1, mav.m.t1, rule=mav.Q_vdot)   
-            mav.m.Q_wdot_Con1                = Constraint(n1, mav.m.t1, rule=mav.Q_wdot)
-
-            mav.m.Q_phidot_Con1              = Constraint(n1, mav.m.t1, rule=mav.Q_phidot)
-            mav.m.Q_thedot_Con1              = Constraint(n1, mav.m.t1, rule=mav.Q_thedot)
-            mav.m.Q_psidot_Con1              = Constraint(n1, mav.m.t1, rule=mav.Q_psidot)
-
-            mav.m.Q_u1_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_u)
-            mav.m.Q_v1_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_v)
-            mav.m.Q_w1_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_w)
-
-            # Phase 2
-            n2 = [2] # flag for Phase 2
-
-            mav.m.Q_dmpdot_dtau_Con2         = Constraint(n2, mav.m.t2, rule=mav.Q_dmass_dtau)
-
-            mav.m.Q_massdot2_Con2            = Constraint(n2, mav.m.t2, rule=mav.Q_mass_dot_2)
-
-            mav.m.Q_dx_dtau_Con2             = Constraint(n2, mav.m.t2, rule=mav.Q_dx_dtau)
-            mav.m.Q_dy_dtau_Con2             = Constraint(n2, mav.m.t2, rule=mav.Q_dy_dtau)
-            mav.m.Q_dz_dtau_Con2             = Constraint(n2, mav.m.t2, rule=mav.Q_dz_dtau)
-
-            mav.m.Q_du_dtau_Con2             = Constraint(n2, mav.m.t2, rule=mav.Q_du_dtau)
-            mav.m.Q_dv_dtau_Con2             = Constraint(n2, mav.m.t2, rule=mav.Q_dv_dtau)
-            mav.m.Q_dw_dtau_Con2             = Constraint(n2, mav.m.t2, rule=mav.Q_dw_dtau)
-
-            mav.m.Q_dp_dtau_Con2             = Constraint(n2, mav.m.t2, rule=mav.Q_dp_dtau)
-            mav.m.Q_dq_dtau_Con2             = Constraint(n2, mav.m.t2, rule=mav.Q_dq_dtau)
-            mav.m.Q_dr_dtau_Con2             = Constraint(n2, mav.m.t2, rule=mav.Q_dr_dtau)
-
-            mav.m.Q_dphi_dtau_Con2           = Constraint(n2, mav.m.t2, rule=mav.Q_dphi_dtau)
-            mav.m.Q_dthe_dtau_Con2           = Constraint(n2, mav.m.t2, rule=mav.Q_dthe_dtau)
-            mav.m.Q_dpsi_dtau_Con2           = Constraint(n2, mav.m.t2, rule=mav.Q_dpsi_dtau)
-
-            mav.m.Q_massdot_Con2             = Constraint(n2, mav.m.t2, rule=mav.Q_massdot)
-
-            mav.m.Q_q0_Con2                  = Constraint(n2, mav.m.t2, rule=mav.Q_q0)
-            mav.m.Q_q1_Con2                  = Constraint(n2, mav.m.t2, rule=mav.Q_q1)
-            mav.m.Q_q2_Con2                  = Constraint(n2, mav.m.t2, rule=mav.Q_q2)
-            mav.m.Q_q3_Con2                  = Constraint(n2, mav.m.t2, rule=mav.Q_q3)
-
-            mav.m.Q_pdot_Con2                = Constraint(n2, mav.m.t2, rule=mav.Q_pdot)
-            mav.m.Q_qdot_Con2                = Constraint(n2, mav.m.t2, rule=mav.Q_qdot_2)   
-            mav.m.Q_rdot_Con2                = Constraint(n2, mav.m.t2, rule=mav.Q_rdot_2)
-            
-            mav.m.Q_udot_Con2                = Constraint(n2, mav.m.t2, rule=mav.Q_udot_2)
-            mav.m.Q_vdot_Con2                = Constraint(n2, mav.m.t2, rule=mav.Q_vdot_2)   
-            mav.m.Q_wdot_Con2                = Constraint(n2, mav.m.t2, rule=mav.Q_wdot_2)
-
-            mav.m.Q_phidot_Con2              = Constraint(n2, mav.m.t2, rule=mav.Q_phidot)
-            mav.m.Q_thedot_Con2              = Constraint(n2, mav.m.t2, rule=mav.Q_thedot)
-            mav.m.Q_psidot_Con2              = Constraint(n2, mav.m.t2, rule=mav.Q_psidot)
-
-            mav.m.Q_u1_Con2                  = Constraint(n2, mav.m.t2, rule=mav.Q_u)
-            mav.m.Q_v1_Con2                  = Constraint(n2, mav.m.t2, rule=mav.Q_v)
-            mav.m.Q_w1_Con2                  = Constraint(n2, mav.m.t2, rule=mav.Q_w)
-
-            # Phase 3
-            n3 = [3] # flag for Phase 3
-
-            mav.m.Q_dmpdot_dtau_Con3         = Constraint(n3, mav.m.t3, rule=mav.Q_dmass_dtau)
-
-            mav.m.Q_dx_dtau_Con3             = Constraint(n3, mav.m.t3, rule=mav.Q_dx_dtau)
-            mav.m.Q_dy_dtau_Con3             = Constraint(n3, mav.m.t3, rule=mav.Q_dy_dtau)
-            mav.m.Q_dz_dtau_Con3             = Constraint(n3, mav.m.t3, rule=mav.Q_dz_dtau)
-
-            mav.m.Q_du_dtau_Con3             = Constraint(n3, mav.m.t3, rule=mav.Q_du_dtau)
-            mav.m.Q_dv_dtau_Con3             = Constraint(n3, mav.m.t3, rule=mav.Q_dv_dtau)
-            mav.m.Q_dw_dtau_Con3             = Constraint(n3, mav.m.t3, rule=mav.Q_dw_dtau)
-
-            mav.m.Q_dp_dtau_Con3             = Constraint(n3, mav.m.t3, rule=mav.Q_dp_dtau)
-            mav.m.Q_dq_dtau_Con3             = Constraint(n3, mav.m.t3, rule=mav.Q_dq_dtau)
-            mav.m.Q_dr_dtau_Con3             = Constraint(n3, mav.m.t3, rule=mav.Q_dr_dtau)
-
-            mav.m.Q_dphi_dtau_Con3           = Constraint(n3, mav.m.t3, rule=mav.Q_dphi_dtau)
-            mav.m.Q_dthe_dtau_Con3           = Constraint(n3, mav.m.t3, rule=mav.Q_dthe_dtau)
-            mav.m.Q_dpsi_dtau_Con3           = Constraint(n3, mav.m.t3, rule=mav.Q_dpsi_dtau)
-
-            mav.m.Q_massdot_Con3             = Constraint(n3, mav.m.t3, rule=mav.Q_massdot)
-
-            mav.m.Q_q0_Con3                  = Constraint(n3, mav.m.t3, rule=mav.Q_q0)
-            mav.m.Q_q1_Con3                  = Constraint(n3, mav.m.t3, rule=mav.Q_q1)
-            mav.m.Q_q2_Con3                  = Constraint(n3, mav.m.t3, rule=mav.Q_q2)
-            mav.m.Q_q3_Con3                  = Constraint(n3, mav.m.t3, rule=mav.Q_q3)
-
-            mav.m.Q_pdot_Con3                = Constraint(n3, mav.m.t3, rule=mav.Q_pdot)
-            mav.m.Q_qdot_Con3                = Constraint(n3, mav.m.t3, rule=mav.Q_qdot)   
-            mav.m.Q_rdot_Con3                = Constraint(n3, mav.m.t3, rule=mav.Q_rdot)
-            
-            mav.m.Q_udot_Con3                = Constraint(n3, mav.m.t3, rule=mav.Q_udot)
-            mav.m.Q_vdot_Con3                = Constraint(n3, mav.m.t3, rule=mav.Q_vdot)   
-            mav.m.Q_wdot_Con3                = Constraint(n3, mav.m.t3, rule=mav.Q_wdot)
-
-            mav.m.Q_phidot_Con3              = Constraint(n3, mav.m.t3, rule=mav.Q_phidot)
-            mav.m.Q_thedot_Con3              = Constraint(n3, mav.m.t3, rule=mav.Q_thedot)
-            mav.m.Q_psidot_Con3              = Constraint(n3, mav.m.t3, rule=mav.Q_psidot)
-
-            mav.m.Q_u1_Con3                  = Constraint(n3, mav.m.t3, rule=mav.Q_u)
-            mav.m.Q_v1_Con3                  = Constraint(n3, mav.m.t3, rule=mav.Q_v)
-            mav.m.Q_w1_Con3                  = Constraint(n3, mav.m.t3, rule=mav.Q_w)
-
-            # Define Objective
-            mav.m.range = mav.m.x_3[1] + mav.m.y_3[1]
-            mav.m.mass = mav.m.mass_3[1]
-            mav.m.objective = Objective(expr=(((mav.m.mass**W_Obj1[weight]) * (mav.m.range**W_Obj2[weight]))), sense=maximize)
-
-            # Warm start initial guess from previous solution
-            # if warm > 0:
-            #     loadOptimizationVariables(mav, myPyomoVars)
-
-            # Dsicretized size description
-            from pyomo.util.model_size import build_model_size_report
-            report = build_model_size_report(mav.m)
-            print("Num constraints: ", report.activated.constraints)
-            print("Num variables: ", report.activated.variables)
-
-            # Solve
-            solver = SolverFactory('ipopt')
-            solver.options["halt_on_ampl_error"] = "yes"
-            solver.options['tol'] = 1e-6 
-            solver.options['dual_inf_tol'] = 1e-6
-            solver.options['constr_viol_tol'] = 1e-6
-            solver.options["max_iter"] = 800
-            solver.options["linear_scaling_on_demand"] = "yes"
-            solver.options['nlp_scaling_method'] = 'gradient-based'
-            solver.options['linear_solver'] = "ma27"
-            results = solver.solve(mav.m, tee=True, keepfiles=True, logfile="log_check.log")
-
-            # Save all data for next warm start
-            # if warm == 0:
-            #     _,myPyomoVars = saveOptimizationVariables(mav)
+    conditions = dict(x0=x0, y0=y0, z0=z0, u0=u0, v0=v0, w0=w0, phi0=phi0, the0=the0, psi0=psi0, p0=p0, q0=q0, r0=r0, \
+                      xf=xf, yf=yf, zf=zf, uf=uf, vf=vf, wf=wf, phif=phif, thef=thef, psif=psif, pf=pf, qf=qf, rf=rf)
+
+    # Adapt the grid from a coarse start once, the sweep then reuses the refined phases
+    if refine:
+        _, conditions['phases'], _ = refineMesh(buildMAV, createSolver, defaultPhases(nfe=15), buildArgs=conditions)
+
+    if epsilon:
+        # Adaptive front: both anchors, then epsilon-constraint points evenly spaced along the front on one model
+        mav = cachedBuild(buildMAV, conditions, cachedir) if cache else buildMAV(**conditions)
+        front = epsilonConstraintFront(mav, createSolver(persistent=appsi), extractResults, npoints=npoints, hv_tol=hv_tol,
+                                       store=WarmStartStore(snapshots) if snapshots is not None else None)
+
+    elif parallel:
+        # Solve the independent weightings across a process pool
+        front = paretoSweep(buildMAV, partial(createSolver, persistent=appsi), extractResults, W_Obj1, W_Obj2, max_workers=max_workers, buildArgs=conditions,
+                            cachedir=cachedir if cache else None)
+
+    else:
+        front = ParetoFront()
+
+        # Sweep mode: build and discretize once, then only re-solve for each weighting
+        if persistent:
+            # Grid sequencing: reach the production grid through cheap coarse solves (a refined mesh already is the final grid)
+            if sequence and not refine:
+                mav, _ = gridSequence(buildMAV, createSolver, nfes=(15, 30, 75), buildArgs=conditions)
+            else:
+                mav = cachedBuild(buildMAV, conditions, cachedir) if cache else buildMAV(**conditions)
+            solver = createSolver(persistent=appsi)
+            if continuation:
+                mav.addWarmStartSuffixes()
+
+        # Continuation mode: visit neighbouring weightings in order and seed each solve from the last one
+        order = range(len(W_Obj1))
+        myDuals = None
+        previous = None
+        store = WarmStartStore(snapshots) if snapshots is not None else None
+        if continuation:
+            order = sorted(order, key=lambda weight: W_Obj1[weight] / W_Obj2[weight])
+
+        for weight in order:
+            for warm in range(1):
+
+                # Rebuild the whole model for every weighting
+                if not persistent:
+                    mav = cachedBuild(buildMAV, conditions, cachedir) if cache else buildMAV(**conditions)
+                    solver = createSolver(persistent=appsi)
+                    if continuation:
+                        mav.addWarmStartSuffixes()
+
+                mav.m.W_Obj1.set_value(W_Obj1[weight])
+                mav.m.W_Obj2.set_value(W_Obj2[weight])
+
+                # Warm start primal and dual initial guess from the neighbouring solution
+                if continuation and myDuals is not None:
+                    if not persistent:
+                        if store is not None:
+                            store.load(previous, mav)
+                        else:
+                            loadOptimizationVariables(mav, myPyomoVars)
+                    # the persistent interface keeps its instance and restarts from the current primal point only
+                    if not isinstance(solver, PersistentIpopt):
+                        loadOptimizationDuals(mav, myDuals)
+                        solver = createSolver(warm_start=True)
+
+                # Solve, racing several option profiles when one IPOPT setting is not reliable enough
+                if race:
+                    results = raceSolve(mav, partial(createSolver, persistent=appsi), workdir=os.path.join('race_runs', f'weight_{weight}'))
+                # or keeping the best of several Latin-hypercube starting points solved across a process pool
+                elif multistart:
+                    optima = multiStart(buildMAV, partial(createSolver, persistent=appsi), nstarts=multistart,
+                                        params={'W_Obj1': W_Obj1[weight], 'W_Obj2': W_Obj2[weight]}, max_workers=max_workers,
+                                        workdir=os.path.join('multistart_runs', f'weight_{weight}'), buildArgs=conditions,
+                                        cachedir=cachedir if cache else None)
+                    results = loadBest(optima, mav)
+                # or the global solver, started from an IPOPT incumbent inside a box around it
+                elif couenne:
+                    results = seededCouenne(mav, createSolver)
+                # or within a wall-clock budget, keeping the best iterate if IPOPT has not converged by then
+                elif budget is not None:
+                    results, _ = anytimeSolve(mav, createSolver, budget)
+                else:
+                    results = solver.solve(mav.m, tee=True, keepfiles=True, logfile="log_check.log")
+
+                # Save all data for next warm start, every solved weighting is also kept on disk
+                if store is not None:
+                    previous = f'weight_{weight}'
+                    store.save(previous, mav)
+                if continuation:
+                    if not persistent and store is None:
+                        _,myPyomoVars = saveOptimizationVariables(mav)
+                    myDuals = saveOptimizationDuals(mav)
 
 # %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
 
-            # Retrieve and store final values for Pareto plot
-            if warm == 0:
-                final_mass_values.append(value(mav.m.mass_3[1] * mav.m.mass_scale))
-                final_downrange_values.append(np.sqrt(value(mav.m.x_3[1] * mav.m.x_scale)**2 + value(mav.m.y_3[1] * mav.m.y_scale)**2) / 1e3)
+                # Retrieve and store final values for Pareto plot
+                if warm == 0:
+                    point = {'index': weight, 'W_Obj1': W_Obj1[weight], 'W_Obj2': W_Obj2[weight],
+                             'status': str(results.solver.status),
+                             'termination': str(results.solver.termination_condition)}
+                    if store is not None:
+                        point['snapshot'] = store.path(previous)
+                    point.update(extractResults(mav))
+                    # Replay the optimal controls through an adaptive integrator to expose transcription error
+                    if validate:
+                        point['drift'] = repropagate(mav)['drift']
+                    # Fly dispersed copies of the vehicle through the same open-loop controls
+                    if dispersions:
+                        point['dispersion'] = monteCarlo(mav, dispersions)['statistics']
+                    # Re-solve the NLP for sampled uncertain parameters, warm started from this solution
+                    if campaign:
+                        point['campaign'] = reoptimizationCampaign(buildMAV, partial(createSolver, persistent=appsi), extractResults, nsamples=campaign,
+                                                                   params={'W_Obj1': W_Obj1[weight], 'W_Obj2': W_Obj2[weight]}, nominal=point.get('snapshot'),
+                                                                   duals=myDuals if continuation else None, max_workers=max_workers,
+                                                                   workdir=os.path.join('campaign_runs', f'weight_{weight}'), buildArgs=conditions,
+                                                                   cachedir=cachedir if cache else None)['statistics']
+                    front.add(point)
+
+    final_mass_values = front.values('final_mass')
+    final_downrange_values = front.values('final_downrange')
+
+    # Non-dominated archive and the area it dominates above the worst converged mass and downrange,
+    # failed points are left out as in ParetoFront.archive
+    archive = front.archive()
+    converged = [point for point in front.points if point.get('termination', 'optimal') == 'optimal']
+    reference = (min(point['final_mass'] for point in converged), min(point['final_downrange'] for point in converged)) if converged else (0, 0)
+    print(f"Pareto archive: {len(archive)} of {len(front.points)} points non-dominated, hypervolume {front.hypervolume(reference):.6g} kg km")
+
+    for point in front.points:
+        weight = point['index']
 
         # Plot graphs for desired weight
-        trajectory_vars = VarContainer(mav.m)
         if weight == 2 :
-            plotResults(trajectory_vars, mav.m)
-
-        results_t1 = []
-        results_t2 = []
-        results_t3 = []
-        results_list = []
-
-        for t1 in mav.m.t1:
-            results_t1.append({
-                't': t1 * value(mav.m.tf1),
-                'x': value(mav.m.x_1[t1] * mav.m.x_scale),
-                'y': value(mav.m.y_1[t1] * mav.m.y_scale),
-                'downrange': sqrt(value(mav.m.x_1[t1] * mav.m.x_scale)**2 + value(mav.m.y_1[t1] * mav.m.y_scale)**2),
-                'altitude': value(mav.m.z_1[t1] * mav.m.z_scale),
-            })
-
-        for t2 in mav.m.t2:
-            results_t2.append({
-                't': t2 * value(mav.m.tf2) + mav.m.tf1(),
-                'x': value(mav.m.x_2[t2] * mav.m.x_scale),
-                'y': value(mav.m.y_2[t2] * mav.m.y_scale),
-                'downrange': sqrt(value(mav.m.x_2[t2] * mav.m.x_scale)**2 + value(mav.m.y_2[t2] * mav.m.y_scale)**2),
-                'altitude': value(mav.m.z_2[t2] * mav.m.z_scale),
-            })
-
-        for t3 in mav.m.t3:
-            results_t3.append({
-                't': t3 * value(mav.m.tf3) + mav.m.tf1() + mav.m.tf2(),
-                'x': value(mav.m.x_3[t3] * mav.m.x_scale),
-                'y': value(mav.m.y_3[t3] * mav.m.y_scale),
-                'downrange': sqrt(value(mav.m.x_3[t3] * mav.m.x_scale)**2 + value(mav.m.y_3[t3] * mav.m.y_scale)**2),
-                'altitude': value(mav.m.z_3[t3] * mav.m.z_scale),
-            })
-
-        results_list = results_t1 + results_t2 + results_t3
+            plotResults(point['trajectory_vars'], None)
 
         def export_to_csv(results_list, filename):
             keys = results_list[0].keys()  
@@ -308,17 +321,20 @@ def main():
                 dict_writer = csv.DictWriter(output_file, fieldnames=keys)
                 dict_writer.writeheader()
                 dict_writer.writerows(results_list)
-        export_to_csv(results_list, f'results_{weight}.csv')
+        export_to_csv(point['trajectory'], f'results_{weight}.csv')
 
     plt.show()  
 
-    labels = [f'$W_r={w2},W_m={w1}$' for w1, w2 in zip(W_Obj1, W_Obj2)]
+    labels = [f'$W_r={point["W_Obj2"]},W_m={point["W_Obj1"]}$' if not point.get('range_min') else f'$r \\geq {point["range_min"]:.3g}$'
+              for point in front.points]
 
     # Plot Pareto Front
     plt.figure()
     markers = ['o', 's', 'D', '^', 'v', '<', '>', 'p', '*', 'H']
     for i in range(len(final_mass_values)):
-        plt.scatter(final_downrange_values[i], final_mass_values[i], marker=markers[i % len(markers)], color='black', label=f'Point {i+1}')
+        dominated = not any(point is front.points[i] for point in archive)
+        failed = front.points[i]['termination'] != 'optimal'
+        plt.scatter(final_downrange_values[i], final_mass_values[i], marker=markers[i % len(markers)], color='red' if failed else 'grey' if dominated else 'black', label=f'Point {i+1}')
         if i == 0:
             plt.annotate(labels[i % len(labels)], (final_downrange_values[i], final_mass_values[i]), textcoords="offset points", xytext=(-40, 10), ha='center')
         elif i == 1:
@@ -336,13 +352,13 @@ def main():
     plt.show()        
     
     # Plot optimal trajectory histories
-    file_paths = [f'results_{i}.csv' for i in range(len(W_Obj1))]
+    file_paths = [f'results_{point["index"]}.csv' for point in front.points]
     dfs = [pd.read_csv(file) for file in file_paths]
     colors = ['magenta', 'blue', 'cyan', 'green', 'red']
 
     fig2d, ax2d = plt.subplots(figsize=(10, 6))
-    for df, label, color in zip(dfs, labels, colors):
-        ax2d.plot(df['t'], df['altitude'] / 1000, label=label, color=color)
+    for i, (df, label) in enumerate(zip(dfs, labels)):
+        ax2d.plot(df['t'], df['altitude'] / 1000, label=label, color=colors[i % len(colors)])
     ax2d.set_xlabel('Time [s]')
     ax2d.set_ylabel('Altitude [km]')
     ax2d.legend()
@@ -354,6 +370,9 @@ def main():
         if os.path.exists(file_path):
             os.remove(file_path)
 
+    if parallel:
+        return front
+
     return mav.m
 
 if __name__ == '__main__':
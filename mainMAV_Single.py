@@ -18,6 +18,9 @@ from Utilities.VarContainer_Single import VarContainer
 from Utilities.Plotter_Single import plotResults
 from Utilities.saveOptimizationVariables import saveOptimizationVariables
 from Utilities.loadOptimizationVariables import loadOptimizationVariables
+from Utilities.ParetoFront import ParetoFront
+from Utilities.paretoSweep import paretoSweep
+from Utilities.modelCache import cachedBuild
 from pyomo.environ import Suffix, ConcreteModel, Var, NonNegativeReals, \
     Constraint, Objective, SolverFactory
 # from idaes.core.util.scaling import (scale_constraints, ScalingBasis,
@@ -36,7 +39,108 @@ from pyomo.util.infeasible import (
 logging.basicConfig(level=logging.INFO)  # Ensure logging level is INFO or DEBUG
 logger = logging.getLogger('pyomo.core')
 
-def main():
+# Build the discretized single-phase model with all path and boundary constraints
+def buildMAV(**conditions):
+
+    # Create mav vehicle
+    mav = MAV(**conditions)
+
+    # Boundary Conditions
+    mav.m.BCs_con = ConstraintList(rule=mav.BCs)
+
+    # Phase 1
+    n1 = [1] # flag for Phase 1
+
+    mav.m.Q_dmpdot_dtau_Con1         = Constraint(n1, mav.m.t1, rule=mav.Q_dmass_dtau)
+
+    mav.m.Q_dx_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dx_dtau)
+    mav.m.Q_dy_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dy_dtau)
+    mav.m.Q_dz_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dz_dtau)
+
+    mav.m.Q_du_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_du_dtau)
+    mav.m.Q_dv_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dv_dtau)
+    mav.m.Q_dw_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dw_dtau)
+
+    mav.m.Q_dp_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dp_dtau)
+    mav.m.Q_dq_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dq_dtau)
+    mav.m.Q_dr_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dr_dtau)
+
+    mav.m.Q_dphi_dtau_Con1           = Constraint(n1, mav.m.t1, rule=mav.Q_dphi_dtau)
+    mav.m.Q_dthe_dtau_Con1           = Constraint(n1, mav.m.t1, rule=mav.Q_dthe_dtau)
+    mav.m.Q_dpsi_dtau_Con1           = Constraint(n1, mav.m.t1, rule=mav.Q_dpsi_dtau)
+    mav.m.Q_massdot_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_massdot)
+
+    mav.m.Q_pdot_Con1                = Constraint(n1, mav.m.t1, rule=mav.Q_pdot)
+    mav.m.Q_qdot_Con1                = Constraint(n1, mav.m.t1, rule=mav.Q_qdot)   
+    mav.m.Q_rdot_Con1                = Constraint(n1, mav.m.t1, rule=mav.Q_rdot)
+
+    mav.m.Q_udot_Con1                = Constraint(n1, mav.m.t1, rule=mav.Q_udot)
+    mav.m.Q_vdot_Con1                = Constraint(n1, mav.m.t1, rule=mav.Q_vdot)   
+    mav.m.Q_wdot_Con1                = Constraint(n1, mav.m.t1, rule=mav.Q_wdot)
+
+    mav.m.Q_q0_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_q0)
+    mav.m.Q_q1_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_q1)
+    mav.m.Q_q2_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_q2)
+    mav.m.Q_q3_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_q3)
+
+    mav.m.Q_phidot_Con1              = Constraint(n1, mav.m.t1, rule=mav.Q_phidot)
+    mav.m.Q_thedot_Con1              = Constraint(n1, mav.m.t1, rule=mav.Q_thedot)
+    mav.m.Q_psidot_Con1              = Constraint(n1, mav.m.t1, rule=mav.Q_psidot)
+
+    mav.m.Q_u1_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_u)
+    mav.m.Q_v1_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_v)
+    mav.m.Q_w1_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_w)
+
+    # Define Objective (weights are mutable so a sweep only needs a re-solve)
+    mav.m.x = mav.m.x_1[1] 
+    mav.m.y = mav.m.y_1[1] 
+    mav.m.range = mav.m.x + mav.m.y
+    mav.m.mass = mav.m.mass_1[1]
+    mav.m.objective = Objective(expr=(((mav.m.mass**mav.m.W_Obj1) * (mav.m.range**mav.m.W_Obj2))), sense=maximize)
+
+    # Dsicretized size description
+    from pyomo.util.model_size import build_model_size_report
+    report = build_model_size_report(mav.m)
+    print("Num constraints: ", report.activated.constraints)
+    print("Num variables: ", report.activated.variables)
+
+    return mav
+
+def createSolver():
+
+    solver = SolverFactory('ipopt')
+    solver.options["halt_on_ampl_error"] = "yes"
+    solver.options['tol'] = 1e-6 
+    solver.options['dual_inf_tol'] = 1e-6
+    solver.options['constr_viol_tol'] = 1e-6
+    solver.options["max_iter"] = 800
+    solver.options["linear_scaling_on_demand"] = "yes"
+    solver.options['nlp_scaling_method'] = 'gradient-based'
+    solver.options['linear_solver'] = "ma27"
+    solver.options["ma27_pivtol"] = 1e-6
+
+    return solver
+
+# Final values and trajectory history of a solved model
+def extractResults(mav):
+
+    results_list = []
+
+    for t1 in mav.m.t1:
+        results_list.append({
+            't': t1 * value(mav.m.tf1),
+            'x': value(mav.m.x_1[t1] * mav.m.x_scale),
+            'y': value(mav.m.y_1[t1] * mav.m.y_scale),
+            'downrange': sqrt(value(mav.m.x_1[t1] * mav.m.x_scale)**2 + value(mav.m.y_1[t1] * mav.m.y_scale)**2),
+            'altitude': value(mav.m.z_1[t1] * mav.m.z_scale),
+        })
+
+    return {'final_mass': value(mav.m.mass_1[1] * mav.m.mass_scale),
+            'final_downrange': np.sqrt(value(mav.m.x_1[1] * mav.m.x_scale)**2 + value(mav.m.y_1[1] * mav.m.y_scale)**2) / 1e6,
+            'trajectory': results_list,
+            'trajectory_vars': VarContainer(mav.m)}
+
+def main(persistent=True, parallel=False, max_workers=None, cache=True, cachedir='model_cache'):
     
     miu_mars = 4.282837e13
     mars_radius = 3.3895e3
@@ -74,124 +178,66 @@ def main():
     qf = None
     rf = None
 
-    # Initialize lists to store results
-    final_mass_values = []
-    final_downrange_values = []
-
     # Weightings 
     W_Obj1 = [0.3, 0.6, 0.9, 1.2, 1.5]
     W_Obj2 = [1.5, 1.2, 0.9, 0.6, 0.3]
 
-    for weight in range(5):
-        for warm in range(1):
-
-            # Create mav vehicle
-            mav = MAV(x0=x0, y0=y0, z0=z0, u0=u0, v0=v0, w0=w0, phi0=phi0, the0=the0, psi0=psi0, p0=p0, q0=q0, r0=r0, \
-                    xf=xf, yf=yf, zf=zf, uf=uf, vf=vf, wf=wf, phif=phif, thef=thef, psif=psif, pf=pf, qf=qf, rf=rf)
-        
-            # Boundary Conditions
-            mav.m.BCs_con = ConstraintList(rule=mav.BCs)
-            
-            # Phase 1
-            n1 = [1] # flag for Phase 1
-
-            mav.m.Q_dmpdot_dtau_Con1         = Constraint(n1, mav.m.t1, rule=mav.Q_dmass_dtau)
-
-            mav.m.Q_dx_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dx_dtau)
-            mav.m.Q_dy_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dy_dtau)
-            mav.m.Q_dz_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dz_dtau)
-
-            mav.m.Q_du_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_du_dtau)
-            mav.m.Q_dv_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dv_dtau)
-            mav.m.Q_dw_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dw_dtau)
-
-            mav.m.Q_dp_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dp_dtau)
-            mav.m.Q_dq_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dq_dtau)
-            mav.m.Q_dr_dtau_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_dr_dtau)
-
-            mav.m.Q_dphi_dtau_Con1           = Constraint(n1, mav.m.t1, rule=mav.Q_dphi_dtau)
-            mav.m.Q_dthe_dtau_Con1           = Constraint(n1, mav.m.t1, rule=mav.Q_dthe_dtau)
-            mav.m.Q_dpsi_dtau_Con1           = Constraint(n1, mav.m.t1, rule=mav.Q_dpsi_dtau)
-            mav.m.Q_massdot_Con1             = Constraint(n1, mav.m.t1, rule=mav.Q_massdot)
-
-            mav.m.Q_pdot_Con1                = Constraint(n1, mav.m.t1, rule=mav.Q_pdot)
-            mav.m.Q_qdot_Con1                = Constraint(n1, mav.m.t1, rule=mav.Q_qdot)   
-            mav.m.Q_rdot_Con1                = Constraint(n1, mav.m.t1, rule=mav.Q_rdot)
-
-            mav.m.Q_udot_Con1                = Constraint(n1, mav.m.t1, rule=mav.Q_udot)
-            mav.m.Q_vdot_Con1                = Constraint(n1, mav.m.t1, rule=mav.Q_vdot)   
-            mav.m.Q_wdot_Con1                = Constraint(n1, mav.m.t1, rule=mav.Q_wdot)
-
-            mav.m.Q_q0_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_q0)
-            mav.m.Q_q1_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_q1)
-            mav.m.Q_q2_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_q2)
-            mav.m.Q_q3_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_q3)
-
-            mav.m.Q_phidot_Con1              = Constraint(n1, mav.m.t1, rule=mav.Q_phidot)
-            mav.m.Q_thedot_Con1              = Constraint(n1, mav.m.t1, rule=mav.Q_thedot)
-            mav.m.Q_psidot_Con1              = Constraint(n1, mav.m.t1, rule=mav.Q_psidot)
-
-            mav.m.Q_u1_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_u)
-            mav.m.Q_v1_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_v)
-            mav.m.Q_w1_Con1                  = Constraint(n1, mav.m.t1, rule=mav.Q_w)
-
-            # Define Objective
-            mav.m.x = mav.m.x_1[1] 
-            mav.m.y = mav.m.y_1[1] 
-            mav.m.range = mav.m.x + mav.m.y
-            mav.m.mass = mav.m.mass_1[1]
-            mav.m.objective = Objective(expr=(((mav.m.mass**W_Obj1[weight]) * (mav.m.range**W_Obj2[weight]))), sense=maximize)
-
-            # Warm start initial guess from previous solution
-            # if warm > 0:
-            #     loadOptimizationVariables(mav, myPyomoVars)
-
-            # Dsicretized size description
-            from pyomo.util.model_size import build_model_size_report
-            report = build_model_size_report(mav.m)
-            print("Num constraints: ", report.activated.constraints)
-            print("Num variables: ", report.activated.variables)
-
-            # Solve
-            solver = SolverFactory('ipopt')
-            solver.options["halt_on_ampl_error"] = "yes"
-            solver.options['tol'] = 1e-6 
-            solver.options['dual_inf_tol'] = 1e-6
-            solver.options['constr_viol_tol'] = 1e-6
-            solver.options["max_iter"] = 800
-            solver.options["linear_scaling_on_demand"] = "yes"
-            solver.options['nlp_scaling_method'] = 'gradient-based'
-            solver.options['linear_solver'] = "ma27"
-            solver.options["ma27_pivtol"] = 1e-6
-
-            results = solver.solve(mav.m, tee=True, keepfiles=True, logfile="log_check.log")
-
-            # Save all data for next warm start
-            # if warm == 0:
-            #     _,myPyomoVars = saveOptimizationVariables(mav)
+    conditions = dict(x0=x0, y0=y0, z0=z0, u0=u0, v0=v0, w0=w0, phi0=phi0, the0=the0, psi0=psi0, p0=p0, q0=q0, r0=r0, \
+                      xf=xf, yf=yf, zf=zf, uf=uf, vf=vf, wf=wf, phif=phif, thef=thef, psif=psif, pf=pf, qf=qf, rf=rf)
+
+    if parallel:
+        # Solve the independent weightings across a process pool
+        front = paretoSweep(buildMAV, createSolver, extractResults, W_Obj1, W_Obj2, max_workers=max_workers, buildArgs=conditions,
+                            cachedir=cachedir if cache else None)
+
+    else:
+        front = ParetoFront()
+
+        # Sweep mode: build and discretize once, then only re-solve for each weighting
+        if persistent:
+            mav = cachedBuild(buildMAV, conditions, cachedir) if cache else buildMAV(**conditions)
+            solver = createSolver()
+
+        for weight in range(len(W_Obj1)):
+            for warm in range(1):
+
+                # Rebuild the whole model for every weighting
+                if not persistent:
+                    mav = cachedBuild(buildMAV, conditions, cachedir) if cache else buildMAV(**conditions)
+                    solver = createSolver()
+
+                mav.m.W_Obj1.set_value(W_Obj1[weight])
+                mav.m.W_Obj2.set_value(W_Obj2[weight])
+
+                # Warm start initial guess from previous solution
+                # if warm > 0:
+                #     loadOptimizationVariables(mav, myPyomoVars)
+
+                results = solver.solve(mav.m, tee=True, keepfiles=True, logfile="log_check.log")
+
+                # Save all data for next warm start
+                # if warm == 0:
+                #     _,myPyomoVars = saveOptimizationVariables(mav)
     
     # %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
 
-            # Retrieve and store final values for Pareto plot
-            if warm == 0:
-                final_mass_values.append(value(mav.m.mass_1[1] * mav.m.mass_scale))
-                final_downrange_values.append(np.sqrt(value(mav.m.x_1[1] * mav.m.x_scale)**2 + value(mav.m.y_1[1] * mav.m.y_scale)**2) / 1e6)
+                # Retrieve and store final values for Pareto plot
+                if warm == 0:
+                    point = {'index': weight, 'W_Obj1': W_Obj1[weight], 'W_Obj2': W_Obj2[weight],
+                             'status': str(results.solver.status),
+                             'termination': str(results.solver.termination_condition)}
+                    point.update(extractResults(mav))
+                    front.add(point)
 
-        # Plot graphs for desired weight
-        trajectory_vars = VarContainer(mav.m)
-        if weight == 0 :
-            plotResults(trajectory_vars, mav.m)
+    final_mass_values = front.values('final_mass')
+    final_downrange_values = front.values('final_downrange')
 
-        results_list = []
+    for point in front.points:
+        weight = point['index']
 
-        for t1 in mav.m.t1:
-            results_list.append({
-                't': t1 * value(mav.m.tf1),
-                'x': value(mav.m.x_1[t1] * mav.m.x_scale),
-                'y': value(mav.m.y_1[t1] * mav.m.y_scale),
-                'downrange': sqrt(value(mav.m.x_1[t1] * mav.m.x_scale)**2 + value(mav.m.y_1[t1] * mav.m.y_scale)**2),
-                'altitude': value(mav.m.z_1[t1] * mav.m.z_scale),
-            })
+        # Plot graphs for desired weight
+        if weight == 0 :
+            plotResults(point['trajectory_vars'], None)
 
         def export_to_csv(results_list, filename):
             keys = results_list[0].keys()
@@ -199,7 +245,7 @@ def main():
                 dict_writer = csv.DictWriter(output_file, fieldnames=keys)
                 dict_writer.writeheader()
                 dict_writer.writerows(results_list)
-        export_to_csv(results_list, f'results1_{weight}.csv')
+        export_to_csv(point['trajectory'], f'results1_{weight}.csv')
 
     plt.show()  
 
@@ -247,6 +293,9 @@ def main():
         if os.path.exists(file_path):
             os.remove(file_path)
 
+    if parallel:
+        return front
+
     return mav.m
 
 if __name__ == '__main__':